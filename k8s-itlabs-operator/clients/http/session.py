@@ -0,0 +1,126 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from timeit import default_timer
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from clients.http import settings
+from observability.metrics.metrics import (
+    app_http_client_connections_total,
+    app_http_request_operator_client_latency_seconds,
+)
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+def base_url(url: str) -> str:
+    parsed_url = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}/"
+
+
+class MeteredHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        app_http_client_connections_total.labels(host=self.host).inc()
+        return super()._new_conn()
+
+
+class MeteredHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        app_http_client_connections_total.labels(host=self.host).inc()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    Adapter that keeps bounded number of connections alive, retries
+    idempotent requests with backoff and measures requests and opened
+    connections by host.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = settings.HTTP_POOL_MAXSIZE,
+        max_retries: int = settings.HTTP_MAX_RETRIES,
+        backoff_factor: float = settings.HTTP_RETRY_BACKOFF,
+    ):
+        super().__init__(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                # Response of last attempt is handled by client.
+                raise_on_status=False,
+            ),
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": MeteredHTTPConnectionPool,
+            "https": MeteredHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        label_values = {
+            "uri": base_url(request.url),
+            "method": request.method,
+            "status_code": "unknown",
+            "exception_name": "unknown",
+        }
+        start_time = default_timer()
+        try:
+            response = super().send(request, *args, **kwargs)
+            label_values["status_code"] = response.status_code
+            return response
+        except Exception as e:
+            label_values["exception_name"] = type(e).__name__
+            raise
+        finally:
+            app_http_request_operator_client_latency_seconds.labels(
+                **label_values
+            ).observe(default_timer() - start_time)
+
+
+class HttpSessions:
+    """
+    Process-wide registry of HTTP sessions by base URL of service.
+
+    Session keeps connections alive between requests of all clients of
+    service, so clients that are created on every admission don't open
+    new connections. Sessions don't keep credentials, they are passed by
+    clients with every request, and cookies are not stored, so they are
+    not shared between clients.
+    """
+
+    _sessions: Dict[str, requests.Session] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, url: str) -> requests.Session:
+        key = base_url(url)
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.cookies.set_policy(
+                    DefaultCookiePolicy(allowed_domains=[])
+                )
+                adapter = PooledHTTPAdapter()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                cls._sessions[key] = session
+        return session
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
@@ -0,0 +1,9 @@
+from os import getenv
+
+# Keep-alive connections to each external service (Rabbit, Sentry,
+# Keycloak, Atlas) kept open by shared HTTP session
+HTTP_POOL_MAXSIZE = int(getenv("HTTP_POOL_MAXSIZE", "10"))
+# Retries of idempotent requests failed by connection errors or by
+# temporary unavailability of service, delays grow by backoff factor
+HTTP_MAX_RETRIES = int(getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_RETRY_BACKOFF = float(getenv("HTTP_RETRY_BACKOFF", "0.5"))
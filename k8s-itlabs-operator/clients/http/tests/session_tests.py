@@ -0,0 +1,85 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from clients.http.session import HttpSessions, PooledHTTPAdapter
+from observability.metrics.metrics import app_http_client_connections_total
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+
+    def _respond(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    Handler.statuses = []
+
+
+@pytest.fixture(autouse=True)
+def sessions(mocker):
+    mocker.patch.object(HttpSessions, "_sessions", {})
+    yield
+    HttpSessions.close_all()
+
+
+def opened_connections() -> float:
+    return app_http_client_connections_total.labels(
+        host="127.0.0.1"
+    )._value.get()
+
+
+@pytest.mark.unit
+class TestHttpSessions:
+    def test_session_shared_by_base_url(self):
+        session = HttpSessions.get_session("http://rabbit:15672/api")
+        assert HttpSessions.get_session("http://rabbit:15672/") is session
+        assert HttpSessions.get_session("http://sentry/") is not session
+        assert isinstance(
+            session.get_adapter("http://rabbit"), PooledHTTPAdapter
+        )
+
+    def test_connection_kept_alive(self, server_url):
+        connections = opened_connections()
+        session = HttpSessions.get_session(server_url)
+        for _ in range(3):
+            assert session.get(f"{server_url}/api/users").ok
+        session.post(f"{server_url}/api/users", json={})
+        assert opened_connections() - connections == 1
+
+    def test_cookies_not_stored(self, server_url):
+        session = HttpSessions.get_session(server_url)
+        assert session.get(f"{server_url}/api/users").ok
+        assert not session.cookies
+
+    def test_idempotent_request_retried(self, server_url, mocker):
+        mocker.patch("urllib3.util.retry.Retry.sleep")
+        Handler.statuses = [503, 200]
+        session = HttpSessions.get_session(server_url)
+        assert session.put(f"{server_url}/api/vhosts/test").status_code == 200
+
+    def test_post_not_retried(self, server_url, mocker):
+        mocker.patch("urllib3.util.retry.Retry.sleep")
+        Handler.statuses = [503, 200]
+        session = HttpSessions.get_session(server_url)
+        assert session.post(f"{server_url}/api/users").status_code == 503
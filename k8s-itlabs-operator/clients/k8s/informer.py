@@ -0,0 +1,145 @@
+import json
+import logging
+import threading
+from copy import deepcopy
+from typing import Callable, Dict, List, Optional
+
+from clients.k8s import settings
+from kubernetes import watch
+from kubernetes.client import ApiException
+
+logger = logging.getLogger("k8s_informer")
+
+HTTP_STATUS_GONE = 410
+
+# Handler is called with name of changed object and the object, or None
+# when object is deleted.
+ChangeHandler = Callable[[str, Optional[dict]], None]
+
+
+class KubernetesInformer:
+    """
+    Keeps in-memory copy of kubernetes objects returned by list function.
+
+    Objects are listed once and then updated by watch events in background
+    thread, list is repeated when watch could not be resumed. Change
+    handlers are called for every added, modified or deleted object.
+    """
+
+    def __init__(self, name: str, list_func: Callable, **list_kwargs):
+        self.name = name
+        self._list_func = list_func
+        self._list_kwargs = list_kwargs
+        self._objects: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: List[ChangeHandler] = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until initial list of objects is loaded.
+        """
+        return self._ready.wait(timeout)
+
+    def get(self, name: str) -> Optional[dict]:
+        with self._lock:
+            obj = self._objects.get(name)
+        return deepcopy(obj) if obj is not None else None
+
+    def add_handler(self, handler: ChangeHandler):
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def _run(self):
+        resource_version = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                resource_version = self._watch_events(resource_version)
+            except ApiException as e:
+                if e.status != HTTP_STATUS_GONE:
+                    logger.error("[%s] Watch failed: %s", self.name, e)
+                    self._stopped.wait(settings.K8S_WATCH_RETRY_DELAY)
+                resource_version = None
+            except Exception:
+                logger.exception("[%s] Watch failed", self.name)
+                self._stopped.wait(settings.K8S_WATCH_RETRY_DELAY)
+                resource_version = None
+
+    def _list(self) -> str:
+        response = self._list_func(**self._list_kwargs, _preload_content=False)
+        data = json.loads(response.data)
+        objects = {item["metadata"]["name"]: item for item in data["items"]}
+        with self._lock:
+            previous, self._objects = self._objects, objects
+        self._ready.set()
+        logger.info("[%s] Listed %d objects", self.name, len(objects))
+
+        for name, obj in objects.items():
+            previous_obj = previous.pop(name, None)
+            is_changed = previous_obj is None or (
+                self._version(previous_obj) != self._version(obj)
+            )
+            if is_changed:
+                self._notify(name, obj)
+        for name in previous:
+            self._notify(name, None)
+        return data["metadata"]["resourceVersion"]
+
+    def _watch_events(self, resource_version: str) -> str:
+        """
+        Applies watch events to stored objects until watch is timed out,
+        returns resource version to resume watching from.
+        """
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._list_func,
+            resource_version=resource_version,
+            timeout_seconds=settings.K8S_WATCH_TIMEOUT,
+            # Watch is closed by apiserver after timeout, client waits a
+            # bit longer instead of default timeout of requests.
+            _request_timeout=settings.K8S_WATCH_TIMEOUT + 30,
+            **self._list_kwargs,
+        ):
+            obj = event["raw_object"]
+            name = obj["metadata"]["name"]
+            with self._lock:
+                if event["type"] == "DELETED":
+                    self._objects.pop(name, None)
+                else:
+                    self._objects[name] = obj
+            self._notify(name, None if event["type"] == "DELETED" else obj)
+            resource_version = self._version(obj)
+        return resource_version
+
+    def _notify(self, name: str, obj: Optional[dict]):
+        for handler in self._handlers:
+            try:
+                handler(name, deepcopy(obj) if obj is not None else None)
+            except Exception:
+                logger.exception("[%s] Change handler failed", self.name)
+
+    @staticmethod
+    def _version(obj: dict) -> str:
+        return obj["metadata"]["resourceVersion"]
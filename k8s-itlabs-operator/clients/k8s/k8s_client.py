@@ -1,23 +1,194 @@
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple, Type, TypeVar
 
 import settings as operator_settings
-from kubernetes import client, config
+from clients.k8s import settings
+from clients.k8s.informer import ChangeHandler, KubernetesInformer
+from kubernetes import client, config, dynamic
 from kubernetes.client import ApiException, V1ConfigMap
 
+HTTP_STATUS_NOT_FOUND = 404
 
-class KubernetesClient:
-    @staticmethod
-    def get_configmap_data(name: str, namespace: str) -> dict:
-        config_map: V1ConfigMap = client.CoreV1Api().read_namespaced_config_map(
-            name=name, namespace=namespace
+Api = TypeVar("Api")
+
+
+class SharedApiClient(client.ApiClient):
+    """
+    API client with connection pool shared by all requests of operator,
+    requests without own timeout are limited by default timeout.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+
+    def request(self, *args, _request_timeout=None, **kwargs):
+        return super().request(
+            *args, _request_timeout=_request_timeout or self.timeout, **kwargs
         )
+
+
+class KubernetesClient:
+    _custom_object_informers: Dict[Tuple[str, str, str], KubernetesInformer] = (
+        {}
+    )
+    _configmap_informers: Dict[str, KubernetesInformer] = {}
+    _api_client: Optional[client.ApiClient] = None
+    _dynamic_client: Optional[dynamic.DynamicClient] = None
+    _apis: Dict[type, object] = {}
+    _clients_lock = threading.Lock()
+    _informers_lock = threading.Lock()
+
+    @classmethod
+    def api_client(cls) -> client.ApiClient:
+        """
+        Returns API client shared by all kubernetes requests of operator.
+        """
+        with cls._clients_lock:
+            if cls._api_client is None:
+                configuration = client.Configuration.get_default_copy()
+                configuration.connection_pool_maxsize = (
+                    settings.K8S_POOL_MAXSIZE
+                )
+                cls._api_client = SharedApiClient(
+                    timeout=settings.K8S_REQUEST_TIMEOUT or None,
+                    configuration=configuration,
+                )
+            return cls._api_client
+
+    @classmethod
+    def api(cls, api_class: Type[Api]) -> Api:
+        """
+        Returns API (e.g. CoreV1Api) using shared API client.
+        """
+        api_client = cls.api_client()
+        with cls._clients_lock:
+            api = cls._apis.get(api_class)
+            if api is None:
+                api = api_class(api_client)
+                cls._apis[api_class] = api
+            return api
+
+    @classmethod
+    def dynamic_client(cls) -> dynamic.DynamicClient:
+        """
+        Returns dynamic client, API discovery of which is done once and
+        cached in memory and in file.
+        """
+        api_client = cls.api_client()
+        with cls._clients_lock:
+            if cls._dynamic_client is None:
+                cls._dynamic_client = dynamic.DynamicClient(
+                    api_client, cache_file=settings.K8S_DISCOVERY_CACHE_FILE
+                )
+            return cls._dynamic_client
+
+    @classmethod
+    def watch_configmaps(cls, namespace: str):
+        """
+        Starts keeping configmaps of namespace in memory, so their data and
+        absence are got without requests to apiserver.
+        """
+        list_func = cls.api(client.CoreV1Api).list_namespaced_config_map
+        with cls._informers_lock:
+            if namespace in cls._configmap_informers:
+                return
+            informer = KubernetesInformer(
+                f"configmaps-{namespace}", list_func, namespace=namespace
+            )
+            cls._configmap_informers[namespace] = informer
+        informer.start()
+
+    @classmethod
+    def add_configmap_handler(cls, namespace: str, handler: ChangeHandler):
+        """
+        Calls handler with name and body of configmap (None when deleted)
+        on every change of configmaps of namespace.
+        """
+        cls.watch_configmaps(namespace)
+        with cls._informers_lock:
+            informer = cls._configmap_informers[namespace]
+        informer.add_handler(handler)
+
+    @classmethod
+    def get_configmap_data(cls, name: str, namespace: str) -> dict:
+        with cls._informers_lock:
+            informer = cls._configmap_informers.get(namespace)
+        if informer and informer.is_ready:
+            config_map = informer.get(name)
+            if config_map is None:
+                raise ApiException(
+                    status=HTTP_STATUS_NOT_FOUND, reason="Not Found"
+                )
+            return config_map.get("data")
+
+        config_map: V1ConfigMap = cls.api(
+            client.CoreV1Api
+        ).read_namespaced_config_map(name=name, namespace=namespace)
         return config_map.data
 
-    @staticmethod
+    @classmethod
+    def watch_cluster_custom_objects(
+        cls, group: str, version: str, plural: str
+    ):
+        """
+        Starts keeping cluster custom objects in memory, so they are
+        got without requests to apiserver.
+        """
+        key = (group, version, plural)
+        list_func = cls.api(client.CustomObjectsApi).list_cluster_custom_object
+        with cls._informers_lock:
+            if key in cls._custom_object_informers:
+                return
+            informer = KubernetesInformer(
+                plural, list_func, group=group, version=version, plural=plural
+            )
+            cls._custom_object_informers[key] = informer
+        informer.start()
+
+    @classmethod
+    def wait_informers_ready(cls, timeout: float) -> bool:
+        """
+        Waits for initial list of all watched objects once, e.g. on
+        startup. Lookups do not wait, they request apiserver while objects
+        are not listed.
+        """
+        with cls._informers_lock:
+            informers = [
+                *cls._custom_object_informers.values(),
+                *cls._configmap_informers.values(),
+            ]
+        deadline = time.monotonic() + timeout
+        return all(
+            informer.wait_ready(max(deadline - time.monotonic(), 0))
+            for informer in informers
+        )
+
+    @classmethod
+    def stop_watching(cls):
+        with cls._informers_lock:
+            informers = [
+                *cls._custom_object_informers.values(),
+                *cls._configmap_informers.values(),
+            ]
+            cls._custom_object_informers = {}
+            cls._configmap_informers = {}
+        for informer in informers:
+            informer.stop()
+
+    @classmethod
     def get_cluster_custom_object(
-        group: str, version: str, plural: str, name: str
+        cls, group: str, version: str, plural: str, name: str
     ) -> Optional[Dict]:
-        api = client.CustomObjectsApi()
+        with cls._informers_lock:
+            informer = cls._custom_object_informers.get(
+                (group, version, plural)
+            )
+        if informer and informer.is_ready:
+            return informer.get(name)
+
+        api = cls.api(client.CustomObjectsApi)
         try:
             return api.get_cluster_custom_object(
                 group=group, version=version, plural=plural, name=name
@@ -25,6 +196,35 @@ class KubernetesClient:
         except ApiException:
             return None
 
+    @classmethod
+    def apply_mutating_webhook_configuration(cls, body: dict):
+        """
+        Creates or replaces mutating webhook configuration. CA bundles of
+        existing webhooks are kept, because they are injected by
+        cert-manager.
+        """
+        api = cls.api(client.AdmissionregistrationV1Api)
+        name = body["metadata"]["name"]
+        try:
+            current = api.read_mutating_webhook_configuration(name=name)
+        except ApiException as e:
+            if e.status != HTTP_STATUS_NOT_FOUND:
+                raise
+            api.create_mutating_webhook_configuration(body=body)
+            return
+
+        ca_bundles = {
+            webhook.name: webhook.client_config.ca_bundle
+            for webhook in current.webhooks or []
+            if webhook.client_config.ca_bundle
+        }
+        for webhook in body["webhooks"]:
+            ca_bundle = ca_bundles.get(webhook["name"])
+            if ca_bundle:
+                webhook["clientConfig"]["caBundle"] = ca_bundle
+        body["metadata"]["resourceVersion"] = current.metadata.resource_version
+        api.replace_mutating_webhook_configuration(name=name, body=body)
+
     @staticmethod
     def configure_kubernetes():
         try:
@@ -0,0 +1,237 @@
+import logging
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import settings as operator_settings
+from clients.k8s import settings
+from clients.k8s.k8s_client import KubernetesClient
+from exceptions import InfrastructureServiceProblem
+from kubernetes import client
+from kubernetes.client import (
+    ApiException,
+    V1Lease,
+    V1LeaseSpec,
+    V1ObjectMeta,
+)
+from utils.concurrency import AbstractDistributedLock
+
+logger = logging.getLogger("k8s_lease")
+
+HTTP_STATUS_NOT_FOUND = 404
+HTTP_STATUS_CONFLICT = 409
+
+# Identity of operator replica, pods of deployment have unique hostnames.
+HOLDER_IDENTITY = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+def default_acquire_timeout() -> float:
+    if settings.K8S_LEASE_ACQUIRE_TIMEOUT:
+        return float(settings.K8S_LEASE_ACQUIRE_TIMEOUT)
+    return max(
+        operator_settings.POSTGRES_CONNECTOR_TIMEOUT,
+        operator_settings.RABBIT_CONNECTOR_TIMEOUT,
+        operator_settings.SENTRY_CONNECTOR_TIMEOUT,
+        operator_settings.KEYCLOAK_CONNECTOR_TIMEOUT,
+    )
+
+
+class KubernetesLeaseLock(AbstractDistributedLock):
+    """
+    Lock shared by operator replicas, based on coordination.k8s.io/v1
+    Lease object.
+
+    Lease is held while it is renewed by holder, lease that was not
+    renewed for its duration is expired and can be taken by other holder.
+    Lease that was taken by other holder, deleted or not renewed in time
+    is lost, holder must not rely on it anymore.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        namespace: str,
+        duration: int = settings.K8S_LEASE_DURATION,
+        retry_delay: float = settings.K8S_LEASE_RETRY_DELAY,
+        holder: str = HOLDER_IDENTITY,
+        api: Optional[client.CoordinationV1Api] = None,
+        acquire_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.namespace = namespace
+        self.duration = duration
+        self.retry_delay = retry_delay
+        self.holder = holder
+        self.acquire_timeout = (
+            acquire_timeout
+            if acquire_timeout is not None
+            else default_acquire_timeout()
+        )
+        self.api = api or KubernetesClient.api(client.CoordinationV1Api)
+        self._lease: Optional[V1Lease] = None
+        self._lease_lock = threading.Lock()
+        self._released = threading.Event()
+        self._renewal: Optional[threading.Thread] = None
+        self._renewed_at = 0.0
+        self._lost = False
+
+    @classmethod
+    def for_source(cls, source_hash: str) -> "KubernetesLeaseLock":
+        return cls(
+            name=f"connector-source-{source_hash}",
+            namespace=operator_settings.OPERATOR_NAMESPACE,
+        )
+
+    @property
+    def is_held(self) -> bool:
+        return self._lease is not None
+
+    @property
+    def is_lost(self) -> bool:
+        return self._lost
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        if timeout is None:
+            timeout = self.acquire_timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                lease = self._try_acquire()
+            except ApiException as e:
+                raise InfrastructureServiceProblem("Kubernetes", e)
+            if lease is not None:
+                self._lease = lease
+                self._renewed_at = time.monotonic()
+                self._lost = False
+                self._released.clear()
+                self._renewal = threading.Thread(
+                    target=self._renew,
+                    name=f"lease-{self.name}",
+                    daemon=True,
+                )
+                self._renewal.start()
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.retry_delay)
+
+    def release(self):
+        self._released.set()
+        if self._renewal:
+            self._renewal.join()
+            self._renewal = None
+        with self._lease_lock:
+            lease, self._lease = self._lease, None
+        if lease is None:
+            return
+        try:
+            self.api.delete_namespaced_lease(
+                name=self.name,
+                namespace=self.namespace,
+                body=client.V1DeleteOptions(
+                    preconditions=client.V1Preconditions(
+                        resource_version=lease.metadata.resource_version
+                    )
+                ),
+            )
+        except ApiException as e:
+            # Lease has been taken by other holder after expiration or
+            # it will expire by itself.
+            logger.warning("[%s] Lease is not released: %s", self.name, e)
+
+    def _try_acquire(self) -> Optional[V1Lease]:
+        now = datetime.now(timezone.utc)
+        try:
+            return self.api.create_namespaced_lease(
+                namespace=self.namespace,
+                body=V1Lease(
+                    metadata=V1ObjectMeta(
+                        name=self.name, namespace=self.namespace
+                    ),
+                    spec=self._spec(now),
+                ),
+            )
+        except ApiException as e:
+            if e.status != HTTP_STATUS_CONFLICT:
+                raise
+
+        try:
+            lease = self.api.read_namespaced_lease(
+                name=self.name, namespace=self.namespace
+            )
+        except ApiException as e:
+            if e.status == HTTP_STATUS_NOT_FOUND:
+                # Released just now, try to create it on next attempt.
+                return None
+            raise
+        if not self._is_expired(lease, now):
+            return None
+
+        # Replacing with resource version of read lease fails when other
+        # holder has taken the lease meanwhile.
+        lease.spec = self._spec(now)
+        try:
+            return self.api.replace_namespaced_lease(
+                name=self.name, namespace=self.namespace, body=lease
+            )
+        except ApiException as e:
+            if e.status in (HTTP_STATUS_CONFLICT, HTTP_STATUS_NOT_FOUND):
+                return None
+            raise
+
+    def _renew(self):
+        interval = self.duration / 3
+        while not self._released.wait(interval):
+            with self._lease_lock:
+                lease = self._lease
+                if lease is None:
+                    return
+                lease.spec.renew_time = datetime.now(timezone.utc)
+                try:
+                    self._lease = self.api.replace_namespaced_lease(
+                        name=self.name, namespace=self.namespace, body=lease
+                    )
+                    self._renewed_at = time.monotonic()
+                except Exception as e:
+                    logger.error("[%s] Lease is not renewed: %s", self.name, e)
+                    # Lease is taken by other holder or deleted, or it has
+                    # expired while apiserver was unavailable.
+                    if (
+                        isinstance(e, ApiException)
+                        and e.status
+                        in (
+                            HTTP_STATUS_CONFLICT,
+                            HTTP_STATUS_NOT_FOUND,
+                        )
+                    ) or self._is_renewal_expired():
+                        self._lose()
+                        return
+
+    def _is_renewal_expired(self) -> bool:
+        return time.monotonic() - self._renewed_at >= self.duration
+
+    def _lose(self):
+        logger.error("[%s] Lease is lost", self.name)
+        self._lease = None
+        self._lost = True
+
+    def _spec(self, now: datetime) -> V1LeaseSpec:
+        return V1LeaseSpec(
+            holder_identity=self.holder,
+            lease_duration_seconds=self.duration,
+            acquire_time=now,
+            renew_time=now,
+        )
+
+    @staticmethod
+    def _is_expired(lease: V1Lease, now: datetime) -> bool:
+        spec = lease.spec
+        if not spec or not spec.holder_identity or not spec.renew_time:
+            return True
+        expires_at = spec.renew_time + timedelta(
+            seconds=spec.lease_duration_seconds or 0
+        )
+        return expires_at <= now
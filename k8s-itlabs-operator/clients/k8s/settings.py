@@ -0,0 +1,23 @@
+from os import getenv
+
+# Seconds to wait on startup for initial list of watched objects, objects
+# are requested from apiserver directly while they are not listed
+K8S_CACHE_READY_TIMEOUT = int(getenv("K8S_CACHE_READY_TIMEOUT", "10"))
+K8S_WATCH_TIMEOUT = int(getenv("K8S_WATCH_TIMEOUT", "300"))
+K8S_WATCH_RETRY_DELAY = int(getenv("K8S_WATCH_RETRY_DELAY", "5"))
+
+# Connector sources are locked with Lease objects, so several replicas of
+# operator do not provision the same source at once
+K8S_LEASE_LOCKS = getenv("K8S_LEASE_LOCKS", "false").lower() == "true"
+K8S_LEASE_DURATION = int(getenv("K8S_LEASE_DURATION", "15"))
+K8S_LEASE_RETRY_DELAY = float(getenv("K8S_LEASE_RETRY_DELAY", "0.5"))
+# Seconds to wait for lease when caller sets no timeout, by default the
+# longest time of processing connector
+K8S_LEASE_ACQUIRE_TIMEOUT = getenv("K8S_LEASE_ACQUIRE_TIMEOUT")
+
+# Shared client of kubernetes API: size of connection pool (number of
+# concurrent requests kept alive), default timeout of requests in seconds
+# and file of API discovery cache (temporary directory by default)
+K8S_POOL_MAXSIZE = int(getenv("K8S_POOL_MAXSIZE", "20"))
+K8S_REQUEST_TIMEOUT = int(getenv("K8S_REQUEST_TIMEOUT", "30"))
+K8S_DISCOVERY_CACHE_FILE = getenv("K8S_DISCOVERY_CACHE_FILE")
@@ -0,0 +1,205 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from clients.k8s.informer import KubernetesInformer
+from clients.k8s.k8s_client import KubernetesClient
+from kubernetes.client import ApiException
+
+
+def k8s_object(name: str, resource_version: str) -> dict:
+    return {"metadata": {"name": name, "resourceVersion": resource_version}}
+
+
+def list_func(*objects: dict, resource_version: str = "1"):
+    def list_objects(**_):
+        return SimpleNamespace(
+            data=json.dumps(
+                {
+                    "metadata": {"resourceVersion": resource_version},
+                    "items": list(objects),
+                }
+            )
+        )
+
+    return list_objects
+
+
+def mock_watch(mocker, *events: dict):
+    watch = mocker.patch("clients.k8s.informer.watch.Watch").return_value
+    watch.stream.return_value = iter(events)
+    return watch
+
+
+@pytest.mark.unit
+class TestKubernetesInformer:
+    def test_list(self):
+        informer = KubernetesInformer(
+            "test", list_func(k8s_object("a", "1"), k8s_object("b", "1"))
+        )
+        assert not informer.is_ready
+        assert informer._list() == "1"
+        assert informer.is_ready
+        assert informer.get("a") == k8s_object("a", "1")
+        assert informer.get("c") is None
+
+    def test_watch_events(self, mocker):
+        informer = KubernetesInformer(
+            "test", list_func(k8s_object("a", "1"), k8s_object("b", "1"))
+        )
+        watch = mock_watch(
+            mocker,
+            {"type": "MODIFIED", "raw_object": k8s_object("a", "2")},
+            {"type": "DELETED", "raw_object": k8s_object("b", "3")},
+            {"type": "ADDED", "raw_object": k8s_object("c", "4")},
+        )
+        resource_version = informer._watch_events(informer._list())
+        assert resource_version == "4"
+        assert watch.stream.call_args.kwargs["resource_version"] == "1"
+        assert informer.get("a") == k8s_object("a", "2")
+        assert informer.get("b") is None
+        assert informer.get("c") == k8s_object("c", "4")
+
+    def test_change_handlers(self, mocker):
+        handler = mocker.Mock()
+        informer = KubernetesInformer(
+            "test", list_func(k8s_object("a", "1"), k8s_object("b", "1"))
+        )
+        informer.add_handler(handler)
+        informer.add_handler(handler)
+        mock_watch(
+            mocker,
+            {"type": "MODIFIED", "raw_object": k8s_object("a", "2")},
+            {"type": "DELETED", "raw_object": k8s_object("b", "3")},
+        )
+        informer._watch_events(informer._list())
+        assert handler.call_args_list == [
+            mocker.call("a", k8s_object("a", "1")),
+            mocker.call("b", k8s_object("b", "1")),
+            mocker.call("a", k8s_object("a", "2")),
+            mocker.call("b", None),
+        ]
+
+    def test_change_handlers_on_relist(self, mocker):
+        handler = mocker.Mock()
+        informer = KubernetesInformer(
+            "test", list_func(k8s_object("a", "1"), k8s_object("b", "1"))
+        )
+        informer._list()
+        informer.add_handler(handler)
+        informer._list_func = list_func(
+            k8s_object("a", "1"), k8s_object("c", "2")
+        )
+        informer._list()
+        assert handler.call_args_list == [
+            mocker.call("c", k8s_object("c", "2")),
+            mocker.call("b", None),
+        ]
+
+    def test_get_returns_copy(self):
+        informer = KubernetesInformer("test", list_func(k8s_object("a", "1")))
+        informer._list()
+        informer.get("a")["metadata"]["name"] = "changed"
+        assert informer.get("a") == k8s_object("a", "1")
+
+    def test_relist_after_expired_watch(self, mocker):
+        informer = KubernetesInformer("test", list_func(k8s_object("a", "1")))
+        list_mock = mocker.spy(informer, "_list")
+
+        def watch_events(resource_version):
+            if list_mock.call_count == 2:
+                informer.stop()
+            raise ApiException(status=410)
+
+        mocker.patch.object(informer, "_watch_events", watch_events)
+        informer._run()
+        assert list_mock.call_count == 2
+
+
+@pytest.mark.unit
+class TestKubernetesClientCustomObjects:
+    @pytest.fixture
+    def api(self, mocker):
+        yield mocker.patch(
+            "clients.k8s.k8s_client.client.CustomObjectsApi"
+        ).return_value
+        KubernetesClient.stop_watching()
+
+    def test_get_from_informer(self, mocker, api):
+        mocker.patch("clients.k8s.informer.KubernetesInformer.start")
+        api.list_cluster_custom_object = list_func(k8s_object("a", "1"))
+        KubernetesClient.watch_cluster_custom_objects("itlabs.io", "v1", "cr")
+        KubernetesClient._custom_object_informers[
+            ("itlabs.io", "v1", "cr")
+        ]._list()
+
+        obj = KubernetesClient.get_cluster_custom_object(
+            "itlabs.io", "v1", "cr", "a"
+        )
+        absent = KubernetesClient.get_cluster_custom_object(
+            "itlabs.io", "v1", "cr", "b"
+        )
+        assert obj == k8s_object("a", "1")
+        assert absent is None
+        assert api.get_cluster_custom_object.call_count == 0
+
+    def test_get_from_apiserver_if_not_ready(self, mocker, api):
+        mocker.patch("clients.k8s.informer.KubernetesInformer.start")
+        wait_ready = mocker.spy(KubernetesInformer, "wait_ready")
+        api.get_cluster_custom_object.return_value = k8s_object("a", "1")
+        KubernetesClient.watch_cluster_custom_objects("itlabs.io", "v1", "cr")
+
+        obj = KubernetesClient.get_cluster_custom_object(
+            "itlabs.io", "v1", "cr", "a"
+        )
+        assert obj == k8s_object("a", "1")
+        assert api.get_cluster_custom_object.call_count == 1
+        assert wait_ready.call_count == 0
+
+    def test_wait_informers_ready(self, mocker, api):
+        mocker.patch("clients.k8s.informer.KubernetesInformer.start")
+        api.list_cluster_custom_object = list_func(k8s_object("a", "1"))
+        KubernetesClient.watch_cluster_custom_objects("itlabs.io", "v1", "cr")
+        KubernetesClient.watch_cluster_custom_objects("itlabs.io", "v1", "cr2")
+        KubernetesClient._custom_object_informers[
+            ("itlabs.io", "v1", "cr")
+        ]._list()
+
+        assert not KubernetesClient.wait_informers_ready(0.01)
+        KubernetesClient._custom_object_informers[
+            ("itlabs.io", "v1", "cr2")
+        ]._list()
+        assert KubernetesClient.wait_informers_ready(0.01)
+
+
+@pytest.mark.unit
+class TestKubernetesClientConfigMaps:
+    @pytest.fixture
+    def api(self, mocker):
+        mocker.patch("clients.k8s.informer.KubernetesInformer.start")
+        yield mocker.patch(
+            "clients.k8s.k8s_client.client.CoreV1Api"
+        ).return_value
+        KubernetesClient.stop_watching()
+
+    def test_get_from_informer(self, api):
+        configmap = {
+            **k8s_object("config", "1"),
+            "data": {"key": "value"},
+        }
+        api.list_namespaced_config_map = list_func(configmap)
+        KubernetesClient.watch_configmaps("operator")
+        KubernetesClient._configmap_informers["operator"]._list()
+
+        data = KubernetesClient.get_configmap_data("config", "operator")
+        assert data == {"key": "value"}
+        with pytest.raises(ApiException) as e:
+            KubernetesClient.get_configmap_data("absent", "operator")
+        assert e.value.status == 404
+        assert api.read_namespaced_config_map.call_count == 0
+
+    def test_get_from_apiserver_if_not_watched(self, api):
+        api.read_namespaced_config_map.return_value.data = {"key": "value"}
+        data = KubernetesClient.get_configmap_data("config", "operator")
+        assert data == {"key": "value"}
+        assert api.read_namespaced_config_map.call_count == 1
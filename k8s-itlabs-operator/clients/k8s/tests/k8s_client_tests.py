@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from clients.k8s.k8s_client import KubernetesClient, SharedApiClient
+from kubernetes import client
+from kubernetes.client import ApiException
+
+
+def webhook_configuration() -> dict:
+    return {
+        "metadata": {"name": "connectors"},
+        "webhooks": [{"name": "create-pods", "clientConfig": {}}],
+    }
+
+
+@pytest.fixture
+def api(mocker):
+    return mocker.patch(
+        "clients.k8s.k8s_client.client.AdmissionregistrationV1Api"
+    ).return_value
+
+
+@pytest.mark.unit
+class TestApplyMutatingWebhookConfiguration:
+    def test_created(self, api):
+        api.read_mutating_webhook_configuration.side_effect = ApiException(
+            status=404
+        )
+        KubernetesClient.apply_mutating_webhook_configuration(
+            webhook_configuration()
+        )
+        api.create_mutating_webhook_configuration.assert_called_once_with(
+            body=webhook_configuration()
+        )
+
+    def test_replaced_with_ca_bundle(self, api):
+        api.read_mutating_webhook_configuration.return_value = SimpleNamespace(
+            metadata=SimpleNamespace(resource_version="7"),
+            webhooks=[
+                SimpleNamespace(
+                    name="create-pods",
+                    client_config=SimpleNamespace(ca_bundle="Y2E="),
+                )
+            ],
+        )
+        KubernetesClient.apply_mutating_webhook_configuration(
+            webhook_configuration()
+        )
+        body = api.replace_mutating_webhook_configuration.call_args.kwargs[
+            "body"
+        ]
+        assert body["metadata"]["resourceVersion"] == "7"
+        assert body["webhooks"][0]["clientConfig"] == {"caBundle": "Y2E="}
+
+    def test_read_error_raised(self, api):
+        api.read_mutating_webhook_configuration.side_effect = ApiException(
+            status=403
+        )
+        with pytest.raises(ApiException):
+            KubernetesClient.apply_mutating_webhook_configuration(
+                webhook_configuration()
+            )
+        assert api.create_mutating_webhook_configuration.call_count == 0
+
+
+@pytest.mark.unit
+class TestSharedClients:
+    @pytest.fixture(autouse=True)
+    def reset_clients(self, mocker):
+        mocker.patch.object(KubernetesClient, "_api_client", None)
+        mocker.patch.object(KubernetesClient, "_dynamic_client", None)
+        mocker.patch.object(KubernetesClient, "_apis", {})
+
+    def test_api_client_shared(self, mocker):
+        mocker.patch("clients.k8s.settings.K8S_POOL_MAXSIZE", 7)
+        api_client = KubernetesClient.api_client()
+        assert KubernetesClient.api_client() is api_client
+        assert api_client.configuration.connection_pool_maxsize == 7
+        assert (
+            api_client.rest_client.pool_manager.connection_pool_kw["maxsize"]
+            == 7
+        )
+
+    def test_apis_use_shared_client(self):
+        core_api = KubernetesClient.api(client.CoreV1Api)
+        assert KubernetesClient.api(client.CoreV1Api) is core_api
+        assert core_api.api_client is KubernetesClient.api_client()
+        custom_api = KubernetesClient.api(client.CustomObjectsApi)
+        assert custom_api.api_client is KubernetesClient.api_client()
+
+    def test_dynamic_client_memoized(self, mocker):
+        dynamic_client = mocker.patch(
+            "clients.k8s.k8s_client.dynamic.DynamicClient"
+        )
+        assert (
+            KubernetesClient.dynamic_client()
+            is KubernetesClient.dynamic_client()
+        )
+        dynamic_client.assert_called_once()
+
+    def test_default_request_timeout(self, mocker):
+        request = mocker.patch("kubernetes.client.ApiClient.request")
+        api_client = SharedApiClient(timeout=5)
+        api_client.request("GET", "/api")
+        api_client.request("GET", "/api", _request_timeout=60)
+        assert [
+            call.kwargs["_request_timeout"] for call in request.call_args_list
+        ] == [5, 60]
@@ -0,0 +1,165 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from clients.k8s.lease import KubernetesLeaseLock
+from clients.k8s.tests.mocks import FakeCoordinationApi
+from urllib3.exceptions import MaxRetryError
+from utils.concurrency import (
+    ConnectorSourceLock,
+    ConnectorSourceLockLost,
+    ConnectorSourceLockTimeout,
+)
+
+
+def create_lock(api: FakeCoordinationApi, holder: str, **kwargs):
+    kwargs = {"duration": 15, "retry_delay": 0.01, **kwargs}
+    return KubernetesLeaseLock(
+        name="lease", namespace="operator", holder=holder, api=api, **kwargs
+    )
+
+
+@pytest.mark.unit
+class TestKubernetesLeaseLock:
+    def test_acquire_and_release(self):
+        api = FakeCoordinationApi()
+        lock = create_lock(api, "first")
+        assert lock.acquire(timeout=0)
+        lease = api.leases[("operator", "lease")]
+        assert lease.spec.holder_identity == "first"
+        lock.release()
+        assert not api.leases
+
+    def test_held_lease_not_acquired(self):
+        api = FakeCoordinationApi()
+        first = create_lock(api, "first")
+        second = create_lock(api, "second")
+        assert first.acquire(timeout=0)
+        assert not second.acquire(timeout=0.05)
+        first.release()
+        assert second.acquire(timeout=0)
+        second.release()
+
+    def test_waiting_for_released_lease(self):
+        api = FakeCoordinationApi()
+        first = create_lock(api, "first")
+        second = create_lock(api, "second")
+        first.acquire()
+        timer = threading.Timer(0.05, first.release)
+        timer.start()
+        assert second.acquire(timeout=5)
+        timer.join()
+        assert api.leases[("operator", "lease")].spec.holder_identity == (
+            "second"
+        )
+        second.release()
+
+    def test_expired_lease_taken_over(self):
+        api = FakeCoordinationApi()
+        first = create_lock(api, "first")
+        first.acquire()
+        # Holder has gone without releasing the lease.
+        first._released.set()
+        lease = api.leases[("operator", "lease")]
+        lease.spec.renew_time = datetime.now(timezone.utc) - timedelta(
+            seconds=16
+        )
+
+        second = create_lock(api, "second")
+        assert second.acquire(timeout=0)
+        assert api.leases[("operator", "lease")].spec.holder_identity == (
+            "second"
+        )
+        # Release of lost lease keeps lease of new holder.
+        first.release()
+        assert ("operator", "lease") in api.leases
+        second.release()
+
+    def test_lease_renewed(self):
+        api = FakeCoordinationApi()
+        lock = create_lock(api, "first", duration=0.15)
+        lock.acquire()
+        acquired_at = api.leases[("operator", "lease")].spec.renew_time
+        threading.Event().wait(0.2)
+        renewed_at = api.leases[("operator", "lease")].spec.renew_time
+        assert renewed_at > acquired_at
+        lock.release()
+
+    def test_acquire_bounded_by_default(self):
+        api = FakeCoordinationApi()
+        first = create_lock(api, "first")
+        second = create_lock(api, "second", acquire_timeout=0.05)
+        first.acquire()
+        assert not second.acquire()
+        first.release()
+
+    def test_default_acquire_timeout_from_connector_timeouts(self, mocker):
+        mocker.patch("settings.SENTRY_CONNECTOR_TIMEOUT", 45)
+        lock = create_lock(FakeCoordinationApi(), "first")
+        assert lock.acquire_timeout == 45
+
+    def test_lease_lost_when_taken_by_other_holder(self):
+        api = FakeCoordinationApi()
+        lock = create_lock(api, "first", duration=0.15)
+        lock.acquire()
+        api.leases[("operator", "lease")].metadata.resource_version = "other"
+        threading.Event().wait(0.2)
+        assert lock.is_lost
+        assert not lock.is_held
+        lock.release()
+        # Lease of other holder is not deleted.
+        assert ("operator", "lease") in api.leases
+
+    def test_lease_lost_when_apiserver_unreachable(self, mocker):
+        api = FakeCoordinationApi()
+        lock = create_lock(api, "first", duration=0.15)
+        lock.acquire()
+        replace = mocker.patch.object(
+            api,
+            "replace_namespaced_lease",
+            side_effect=MaxRetryError(None, "/leases"),
+        )
+        threading.Event().wait(0.3)
+        assert lock.is_lost
+        # Renewal is retried until lease duration is over.
+        assert replace.call_count > 1
+        lock.release()
+
+
+@pytest.mark.unit
+class TestConnectorSourceLockWithLeases:
+    @pytest.fixture
+    def api(self):
+        api = FakeCoordinationApi()
+        ConnectorSourceLock.use_distributed_locks(
+            lambda source_hash: KubernetesLeaseLock(
+                name=source_hash, namespace="operator", api=api
+            )
+        )
+        yield api
+        ConnectorSourceLock.use_distributed_locks(None)
+
+    def test_source_locked_by_lease(self, api):
+        with ConnectorSourceLock("source"):
+            assert ("operator", "source") in api.leases
+        assert not api.leases
+
+    def test_lease_held_by_other_replica(self, api):
+        other_replica = create_lock(api, "other")
+        other_replica.name = "source"
+        other_replica.acquire()
+        with pytest.raises(ConnectorSourceLockTimeout):
+            with ConnectorSourceLock("source", timeout=0.05):
+                pass
+        other_replica.release()
+        assert ConnectorSourceLock.locked_sources_count() == 0
+
+    def test_lost_lease_fails_critical_section(self, api):
+        with pytest.raises(ConnectorSourceLockLost):
+            with ConnectorSourceLock("source") as source_lock:
+                source_lock.ensure_held()
+                del api.leases[("operator", "source")]
+                source_lock._distributed_lock._lose()
+                with pytest.raises(ConnectorSourceLockLost):
+                    source_lock.ensure_held()
+        assert ConnectorSourceLock.locked_sources_count() == 0
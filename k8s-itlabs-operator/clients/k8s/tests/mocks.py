@@ -1,4 +1,8 @@
-from typing import Optional
+import threading
+from copy import deepcopy
+from typing import Dict, Optional, Tuple
+
+from kubernetes.client import ApiException, V1Lease
 
 
 class KubernetesClientMocker:
@@ -10,3 +14,65 @@ class KubernetesClientMocker:
             "clients.k8s.k8s_client.KubernetesClient.get_configmap_data",
             return_value=data,
         )
+
+
+class FakeCoordinationApi:
+    """
+    In-memory apiserver for Lease objects with optimistic concurrency
+    by resource version.
+    """
+
+    def __init__(self):
+        self.leases: Dict[Tuple[str, str], V1Lease] = {}
+        self.resource_version = 0
+        self._lock = threading.Lock()
+
+    def _next_resource_version(self) -> str:
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def create_namespaced_lease(self, namespace: str, body: V1Lease):
+        with self._lock:
+            key = (namespace, body.metadata.name)
+            if key in self.leases:
+                raise ApiException(status=409, reason="AlreadyExists")
+            lease = deepcopy(body)
+            lease.metadata.resource_version = self._next_resource_version()
+            self.leases[key] = lease
+            return deepcopy(lease)
+
+    def read_namespaced_lease(self, name: str, namespace: str):
+        with self._lock:
+            lease = self.leases.get((namespace, name))
+            if lease is None:
+                raise ApiException(status=404, reason="NotFound")
+            return deepcopy(lease)
+
+    def replace_namespaced_lease(self, name: str, namespace: str, body):
+        with self._lock:
+            lease = self.leases.get((namespace, name))
+            if lease is None:
+                raise ApiException(status=404, reason="NotFound")
+            if (
+                lease.metadata.resource_version
+                != body.metadata.resource_version
+            ):
+                raise ApiException(status=409, reason="Conflict")
+            lease = deepcopy(body)
+            lease.metadata.resource_version = self._next_resource_version()
+            self.leases[(namespace, name)] = lease
+            return deepcopy(lease)
+
+    def delete_namespaced_lease(self, name: str, namespace: str, body=None):
+        with self._lock:
+            lease = self.leases.get((namespace, name))
+            if lease is None:
+                raise ApiException(status=404, reason="NotFound")
+            preconditions = body.preconditions if body else None
+            if (
+                preconditions
+                and preconditions.resource_version
+                != lease.metadata.resource_version
+            ):
+                raise ApiException(status=409, reason="Conflict")
+            del self.leases[(namespace, name)]
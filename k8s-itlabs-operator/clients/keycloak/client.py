@@ -1,9 +1,11 @@
 import http.client
 from abc import ABCMeta, abstractmethod
+from dataclasses import replace
 from typing import Optional
 from urllib.parse import urljoin
 
 import requests
+from clients.http.session import HttpSessions
 from clients.keycloak.auth import BearerAuth
 from clients.keycloak.dto import ClientDto, Token
 from clients.keycloak.dto_factories import (
@@ -13,6 +15,7 @@ from clients.keycloak.dto_factories import (
 )
 from clients.keycloak.exceptions import KeycloakError
 from clients.keycloak.settings import KEYCLOAK_TIMEOUT
+from clients.keycloak.token_cache import KeycloakTokenCache
 from clients.keycloak.url_patterns import (
     URL_ADMIN_CLIENT,
     URL_ADMIN_CLIENT_SECRET,
@@ -30,7 +33,7 @@ class AbstractKeycloakClient:
         raise NotImplementedError
 
     @abstractmethod
-    def create_client(self, client: ClientDto):
+    def create_client(self, client: ClientDto) -> ClientDto:
         raise NotImplementedError
 
     @abstractmethod
@@ -44,21 +47,17 @@ class KeycloakClient(AbstractKeycloakClient):
         self._realm = realm
         self._username = username
         self._password = password
+        self._session = HttpSessions.get_session(url)
 
     def _build_path(self, path: str) -> str:
         return urljoin(self._url, path)
 
-    def _get_token(self) -> Token:
+    def _request_token(self, data: dict) -> Token:
         path = self._build_path(URL_TOKEN.format(realm_id=self._realm))
         try:
-            response = requests.post(
+            response = self._session.post(
                 path,
-                data={
-                    "client_id": "admin-cli",
-                    "grant_type": "password",
-                    "username": self._username,
-                    "password": self._password,
-                },
+                data={"client_id": "admin-cli", **data},
                 timeout=KEYCLOAK_TIMEOUT,
             )
             if response.status_code != http.client.OK:
@@ -70,20 +69,64 @@ class KeycloakClient(AbstractKeycloakClient):
             raise InfrastructureServiceProblem("Keycloak", e)
         return TokenDtoFactory.dto_from_dict(response.json())
 
+    def _login(self) -> Token:
+        return self._request_token(
+            {
+                "grant_type": "password",
+                "username": self._username,
+                "password": self._password,
+            }
+        )
+
+    def _refresh(self, refresh_token: str) -> Token:
+        return self._request_token(
+            {"grant_type": "refresh_token", "refresh_token": refresh_token}
+        )
+
+    def _get_token(self, rejected_token: Optional[str] = None) -> Token:
+        return KeycloakTokenCache.get_token(
+            key=(self._url, self._realm, self._username),
+            login=self._login,
+            refresh=self._refresh,
+            rejected_token=rejected_token,
+        )
+
     def _get_auth(self) -> BearerAuth:
         token = self._get_token()
         return BearerAuth(token.access_token)
 
+    def _send_request(
+        self, method: str, path: str, **kwargs
+    ) -> requests.Response:
+        """
+        Sends request with cached admin token, request rejected because of
+        token is sent once again with new token.
+        """
+        token = self._get_token()
+        response = self._session.request(
+            method,
+            path,
+            auth=BearerAuth(token.access_token),
+            timeout=KEYCLOAK_TIMEOUT,
+            **kwargs,
+        )
+        if response.status_code == http.client.UNAUTHORIZED:
+            token = self._get_token(rejected_token=token.access_token)
+            response = self._session.request(
+                method,
+                path,
+                auth=BearerAuth(token.access_token),
+                timeout=KEYCLOAK_TIMEOUT,
+                **kwargs,
+            )
+        return response
+
     def get_client(self, client_id: str) -> Optional[ClientDto]:
         path = self._build_path(
             URL_ADMIN_CLIENT.format(realm_id=self._realm, client_id=client_id)
         )
         try:
-            response = requests.get(
-                path,
-                auth=self._get_auth(),
-                timeout=KEYCLOAK_TIMEOUT,
-            )
+            response = self._send_request("GET", path)
             if response.status_code != http.client.OK:
                 error = ErrorDtoFactory.dto_from_dict(response.json())
                 raise InfrastructureServiceProblem(
@@ -98,16 +141,15 @@ class KeycloakClient(AbstractKeycloakClient):
         except Exception as e:
             raise InfrastructureServiceProblem("Keycloak", e)
 
-    def create_client(self, client: ClientDto):
+    def create_client(self, client: ClientDto) -> ClientDto:
+        """
+        Returns created client with its id, that Keycloak sends in Location
+        header of response (id is None if header is absent).
+        """
         path = self._build_path(URL_ADMIN_CLIENTS.format(realm_id=self._realm))
         data = ClientDtoFactory.dict_from_dto(client)
         try:
-            response = requests.post(
-                path,
-                auth=self._get_auth(),
-                json=data,
-                timeout=KEYCLOAK_TIMEOUT,
-            )
+            response = self._send_request("POST", path, json=data)
             if response.status_code != http.client.CREATED:
                 error = ErrorDtoFactory.dto_from_dict(response.json())
                 raise InfrastructureServiceProblem(
@@ -115,6 +157,11 @@ class KeycloakClient(AbstractKeycloakClient):
                 )
         except Exception as e:
             raise InfrastructureServiceProblem("Keycloak", e)
+        location = response.headers.get("Location")
+        client_id = (
+            location.rstrip("/").rsplit("/", 1)[-1] if location else None
+        )
+        return replace(client, id=client_id or None)
 
     def generate_secret(self, client_id: str) -> str:
         path = self._build_path(
@@ -123,11 +170,7 @@ class KeycloakClient(AbstractKeycloakClient):
             )
         )
         try:
-            response = requests.post(
-                path,
-                auth=self._get_auth(),
-                timeout=KEYCLOAK_TIMEOUT,
-            )
+            response = self._send_request("POST", path)
             if response.status_code != http.client.OK:
                 error = ErrorDtoFactory.dto_from_dict(response.json())
                 raise InfrastructureServiceProblem(
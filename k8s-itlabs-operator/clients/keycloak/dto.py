@@ -5,6 +5,9 @@ from typing import Optional
 @dataclass
 class Token:
     access_token: str
+    expires_in: Optional[int] = None
+    refresh_token: Optional[str] = None
+    refresh_expires_in: Optional[int] = None
 
 
 @dataclass
@@ -14,6 +17,9 @@ class ClientDto:
     protocol: str = "openid-connect"
     client_authenticator_type: str = "client-secret"
     id: Optional[str] = None
+    # Secret of confidential client set on creation instead of generated
+    # by Keycloak.
+    secret: Optional[str] = None
 
 
 @dataclass
@@ -4,7 +4,12 @@ from clients.keycloak.dto import ClientDto, Error, Token
 class TokenDtoFactory:
     @staticmethod
     def dto_from_dict(data: dict) -> Token:
-        return Token(access_token=data["access_token"])
+        return Token(
+            access_token=data["access_token"],
+            expires_in=data.get("expires_in"),
+            refresh_token=data.get("refresh_token"),
+            refresh_expires_in=data.get("refresh_expires_in"),
+        )
 
 
 class ClientDtoFactory:
@@ -16,16 +21,20 @@ class ClientDtoFactory:
             name=data.get("name"),
             protocol=data.get("protocol"),
             client_authenticator_type=data.get("clientAuthenticatorType"),
+            secret=data.get("secret"),
         )
 
     @staticmethod
     def dict_from_dto(data: ClientDto) -> dict:
-        return {
+        client = {
             "clientId": data.client_id,
             "name": data.name,
             "protocol": data.protocol,
             "clientAuthenticatorType": data.client_authenticator_type,
         }
+        if data.secret:
+            client["secret"] = data.secret
+        return client
 
 
 class ErrorDtoFactory:
@@ -1 +1,7 @@
+from os import getenv
+
 KEYCLOAK_TIMEOUT = 10
+# Seconds before expiry when cached admin token is refreshed
+KEYCLOAK_TOKEN_REFRESH_BEFORE = int(
+    getenv("KEYCLOAK_TOKEN_REFRESH_BEFORE", "30")
+)
@@ -0,0 +1,157 @@
+from itertools import count
+from unittest import mock
+
+import pytest
+from clients.keycloak import token_cache
+from clients.keycloak.client import KeycloakClient
+from clients.keycloak.dto import ClientDto
+from clients.keycloak.tests.mocks import FakeKeycloakServer
+from clients.keycloak.token_cache import KeycloakTokenCache
+from exceptions import InfrastructureServiceProblem
+
+KEYCLOAK_URL = "http://keycloak:8080/"
+TOKEN_URL = f"{KEYCLOAK_URL}realms/test/protocol/openid-connect/token"
+
+
+def response(status_code: int, data) -> mock.Mock:
+    return mock.Mock(status_code=status_code, json=mock.Mock(return_value=data))
+
+
+class KeycloakSession:
+    """
+    Session that issues numbered tokens and accepts only the latest one.
+    """
+
+    def __init__(self):
+        self.grants = []
+        self._numbers = count(1)
+        self.valid_token = None
+
+    def post(self, path, data, timeout):
+        assert path == TOKEN_URL
+        self.grants.append(data["grant_type"])
+        if data.get("refresh_token") == "rejected":
+            return response(400, {"error": "invalid_grant"})
+        self.valid_token = f"token-{next(self._numbers)}"
+        return response(
+            200,
+            {
+                "access_token": self.valid_token,
+                "expires_in": 60,
+                "refresh_token": f"refresh-{self.valid_token}",
+                "refresh_expires_in": 1800,
+            },
+        )
+
+    def request(self, method, path, auth, timeout, **kwargs):
+        request = mock.Mock(headers={})
+        auth(request)
+        if request.headers["Authorization"] != f"Bearer {self.valid_token}":
+            return response(401, {"error": "HTTP 401 Unauthorized"})
+        if path.endswith("/client-secret"):
+            return response(200, {"value": "secret"})
+        return response(200, [])
+
+
+@pytest.fixture
+def session(mocker):
+    mocker.patch.object(KeycloakTokenCache, "_tokens", {})
+    session = KeycloakSession()
+    mocker.patch(
+        "clients.keycloak.client.HttpSessions.get_session",
+        return_value=session,
+    )
+    return session
+
+
+@pytest.fixture
+def now(mocker):
+    monotonic = mocker.patch.object(token_cache.time, "monotonic")
+    monotonic.return_value = 1000.0
+    return monotonic
+
+
+def keycloak_client() -> KeycloakClient:
+    return KeycloakClient(KEYCLOAK_URL, "test", "admin", "password")
+
+
+@pytest.mark.unit
+class TestKeycloakClientToken:
+    def test_token_shared_by_clients(self, session, now):
+        keycloak_client().get_client("app")
+        keycloak_client().get_client("app")
+        keycloak_client().generate_secret("app-id")
+        assert session.grants == ["password"]
+
+    def test_token_refreshed_before_expiry(self, session, now):
+        client = keycloak_client()
+        client.get_client("app")
+        now.return_value += 29
+        client.get_client("app")
+        assert session.grants == ["password"]
+
+        now.return_value += 2
+        client.get_client("app")
+        assert session.grants == ["password", "refresh_token"]
+        assert session.valid_token == "token-2"
+
+    def test_login_when_refresh_token_expired(self, session, now):
+        client = keycloak_client()
+        client.get_client("app")
+        now.return_value += 1800
+        client.get_client("app")
+        assert session.grants == ["password", "password"]
+
+    def test_login_when_refresh_rejected(self, session, now):
+        client = keycloak_client()
+        client.get_client("app")
+        KeycloakTokenCache._tokens[
+            (KEYCLOAK_URL, "test", "admin")
+        ].token.refresh_token = "rejected"
+        now.return_value += 60
+        client.get_client("app")
+        assert session.grants == ["password", "refresh_token", "password"]
+
+    def test_request_retried_once_with_new_token(self, session, now):
+        client = keycloak_client()
+        client.get_client("app")
+        # Token is revoked by Keycloak before its expiry.
+        session.valid_token = "revoked"
+
+        assert client.get_client("app") is None
+        assert session.grants == ["password", "refresh_token"]
+
+
+@pytest.fixture
+def keycloak(mocker):
+    mocker.patch.object(KeycloakTokenCache, "_tokens", {})
+    server = FakeKeycloakServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.unit
+class TestKeycloakClientCreateClient:
+    def test_id_from_location(self, keycloak):
+        client = KeycloakClient(keycloak.url, "test", "admin", "password")
+        created = client.create_client(
+            ClientDto(client_id="app", name="app", secret="secret")
+        )
+
+        assert created.id in keycloak.clients
+        assert created.secret == keycloak.clients[created.id]["secret"]
+        assert client.get_client("app").id == created.id
+
+    def test_id_unknown_without_location(self, keycloak):
+        keycloak.send_location = False
+        client = KeycloakClient(keycloak.url, "test", "admin", "password")
+        created = client.create_client(ClientDto(client_id="app", name="app"))
+        assert created.id is None
+        assert created.secret is None
+
+    def test_existing_client_not_created(self, keycloak):
+        client = KeycloakClient(keycloak.url, "test", "admin", "password")
+        client.create_client(ClientDto(client_id="app", name="app"))
+        with pytest.raises(InfrastructureServiceProblem):
+            client.create_client(ClientDto(client_id="app", name="app"))
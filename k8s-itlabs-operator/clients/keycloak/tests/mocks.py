@@ -0,0 +1,137 @@
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from utils.passgen import generate_password
+
+URL_CLIENTS = re.compile(r"^/admin/realms/(?P<realm>[^/]+)/clients$")
+URL_CLIENT_SECRET = re.compile(
+    r"^/admin/realms/(?P<realm>[^/]+)/clients/(?P<id>[^/]+)/client-secret$"
+)
+URL_TOKEN = re.compile(
+    r"^/realms/(?P<realm>[^/]+)/protocol/openid-connect/token$"
+)
+
+
+class FakeKeycloakHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeKeycloakServer"
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path))
+        url = urlparse(self.path)
+        if not URL_CLIENTS.match(url.path):
+            return self._send(404, {"error": "Not found"})
+        if not self._is_authorized():
+            return self._send(401, {"error": "HTTP 401 Unauthorized"})
+        client_id = parse_qs(url.query).get("clientId", [None])[0]
+        self._send(
+            200,
+            [
+                client
+                for client in self.server.clients.values()
+                if client_id is None or client["clientId"] == client_id
+            ],
+        )
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path))
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if URL_TOKEN.match(self.path):
+            return self._send(
+                200,
+                {
+                    "access_token": self.server.access_token,
+                    "expires_in": 60,
+                    "refresh_token": "refresh",
+                    "refresh_expires_in": 1800,
+                },
+            )
+        if not self._is_authorized():
+            return self._send(401, {"error": "HTTP 401 Unauthorized"})
+
+        if URL_CLIENTS.match(self.path):
+            client = json.loads(body)
+            if any(
+                c["clientId"] == client["clientId"]
+                for c in self.server.clients.values()
+            ):
+                return self._send(
+                    409,
+                    {
+                        "errorMessage": (
+                            f"Client {client['clientId']} already exists"
+                        )
+                    },
+                )
+            client["id"] = str(uuid.uuid4())
+            client.setdefault("secret", generate_password())
+            self.server.clients[client["id"]] = client
+            headers = {}
+            if self.server.send_location:
+                headers["Location"] = (
+                    f"{self.server.url}{self.path}/{client['id']}"
+                )
+            return self._send(201, None, headers)
+
+        match = URL_CLIENT_SECRET.match(self.path)
+        if match and match["id"] in self.server.clients:
+            client = self.server.clients[match["id"]]
+            client["secret"] = generate_password()
+            return self._send(
+                200, {"type": "secret", "value": client["secret"]}
+            )
+        self._send(404, {"error": "Not found"})
+
+    def log_message(self, *args):
+        pass
+
+    def _is_authorized(self) -> bool:
+        return self.headers.get("Authorization") == (
+            f"Bearer {self.server.access_token}"
+        )
+
+    def _send(self, status: int, data, headers: Dict[str, str] = None):
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeKeycloakServer(ThreadingHTTPServer):
+    """
+    Local Keycloak admin API for clients of realm, that keeps clients in
+    memory and records received requests.
+    """
+
+    def __init__(self, send_location: bool = True):
+        super().__init__(("127.0.0.1", 0), FakeKeycloakHandler)
+        self.send_location = send_location
+        self.access_token = "token"
+        self.clients: Dict[str, dict] = {}
+        self.requests: List[tuple] = []
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-keycloak",
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
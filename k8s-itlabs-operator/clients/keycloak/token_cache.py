@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from clients.keycloak import settings
+from clients.keycloak.dto import Token
+
+logger = logging.getLogger("keycloak_token_cache")
+
+TokenKey = Tuple[str, str, str]
+
+
+class CachedToken:
+    def __init__(self, token: Token, obtained_at: float):
+        self.token = token
+        expires_in = token.expires_in or 0
+        self.refresh_at = obtained_at + max(
+            expires_in - settings.KEYCLOAK_TOKEN_REFRESH_BEFORE,
+            expires_in / 2,
+        )
+        # Refresh token without expiration (offline token) is valid until
+        # it is revoked.
+        self.refresh_expires_at = (
+            obtained_at + token.refresh_expires_in
+            if token.refresh_expires_in
+            else None
+        )
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.refresh_at
+
+    def can_refresh(self) -> bool:
+        return bool(self.token.refresh_token) and (
+            self.refresh_expires_at is None
+            or time.monotonic() < self.refresh_expires_at
+        )
+
+
+class KeycloakTokenCache:
+    """
+    Process-wide cache of Keycloak admin tokens by (url, realm, username).
+
+    Cached token is used until shortly before its expiry, then it is
+    refreshed by refresh token, or obtained again by password when refresh
+    token is expired or rejected. Concurrent requests for token of the same
+    user wait for one of them to obtain it.
+    """
+
+    _tokens: Dict[TokenKey, CachedToken] = {}
+    _locks: Dict[TokenKey, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_token(
+        cls,
+        key: TokenKey,
+        login: Callable[[], Token],
+        refresh: Callable[[str], Token],
+        rejected_token: Optional[str] = None,
+    ) -> Token:
+        """
+        Returns cached token of user. Token rejected by Keycloak is
+        replaced, unless it has been replaced by other request already.
+        """
+        with cls._key_lock(key):
+            cached = cls._tokens.get(key)
+            if cached is not None:
+                if rejected_token is None:
+                    if cached.is_fresh():
+                        return cached.token
+                elif cached.token.access_token != rejected_token:
+                    return cached.token
+
+            obtained_at = time.monotonic()
+            token = None
+            if cached is not None and cached.can_refresh():
+                try:
+                    token = refresh(cached.token.refresh_token)
+                except Exception as e:
+                    logger.warning(
+                        "Keycloak token of user '%s' is not refreshed: %s",
+                        key[2],
+                        e,
+                    )
+            if token is None:
+                token = login()
+            cls._tokens[key] = CachedToken(token, obtained_at)
+            return token
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._tokens = {}
+
+    @classmethod
+    def _key_lock(cls, key: TokenKey) -> threading.Lock:
+        with cls._lock:
+            return cls._locks.setdefault(key, threading.Lock())
@@ -8,3 +8,11 @@ class PgConnectorDbSecretDto:
     password: str
     host: str
     port: int
+
+
+@dataclass
+class PgDatabaseState:
+    user_exists: bool
+    database_exists: bool
+    user_granted_to_admin: bool
+    readonly_user_exists: bool = False
@@ -1 +1,4 @@
 class PgQueryValidationError(Exception): ...
+
+
+class PgPoolTimeoutError(Exception): ...
@@ -0,0 +1,333 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+import psycopg2
+from clients.postgres import settings
+from clients.postgres.dto import PgConnectorDbSecretDto
+from clients.postgres.exceptions import PgPoolTimeoutError
+from observability.metrics.metrics import (
+    app_postgres_pool_checkout_latency_seconds,
+    app_postgres_pool_connections,
+    app_postgres_pool_wait_seconds,
+)
+from psycopg2.extensions import POLL_OK, connection
+
+logger = logging.getLogger("postgrespool")
+
+PoolKey = Tuple[str, int, str, str]
+
+
+class PooledConnection:
+    def __init__(self, conn: connection):
+        self.connection = conn
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+
+    def is_expired(self, max_lifetime: int) -> bool:
+        return time.monotonic() - self.created_at >= max_lifetime
+
+    def is_idle_expired(self, idle_timeout: int) -> bool:
+        return time.monotonic() - self.released_at >= idle_timeout
+
+    def is_healthy(self) -> bool:
+        """
+        Checks connection without round trip to server, poll reads pending
+        messages and fails if server has closed the connection.
+        """
+        if self.connection.closed:
+            return False
+        try:
+            return self.connection.poll() == POLL_OK
+        except psycopg2.Error:
+            return False
+
+    def close(self):
+        try:
+            self.connection.close()
+        except psycopg2.Error:
+            pass
+
+
+class PostgresConnectionPool:
+    """
+    Thread-safe pool of autocommit connections to one Postgres database.
+    """
+
+    def __init__(
+        self,
+        connection_data: PgConnectorDbSecretDto,
+        min_size: int = settings.POSTGRES_POOL_MIN_SIZE,
+        max_size: int = settings.POSTGRES_POOL_MAX_SIZE,
+        idle_timeout: int = settings.POSTGRES_POOL_IDLE_TIMEOUT,
+        max_lifetime: int = settings.POSTGRES_POOL_MAX_LIFETIME,
+        checkout_timeout: int = settings.POSTGRES_POOL_CHECKOUT_TIMEOUT,
+    ):
+        self.connection_data = connection_data
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self._idle: Deque[PooledConnection] = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self.last_used_at = time.monotonic()
+        self._labels = {
+            "host": connection_data.host,
+            "port": str(connection_data.port),
+            "user": connection_data.user,
+            "database": connection_data.db_name,
+        }
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_size(self) -> int:
+        return len(self._idle)
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        pooled = self._checkout()
+        try:
+            yield pooled.connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self._discard(pooled)
+            raise
+        except BaseException:
+            self._release(pooled)
+            raise
+        else:
+            self._release(pooled)
+
+    def _connect(self) -> PooledConnection:
+        logger.info(
+            "Connecting to the PostgreSQL database %s on %s...",
+            self.connection_data.db_name,
+            self.connection_data.host,
+        )
+        conn = psycopg2.connect(
+            database=self.connection_data.db_name,
+            user=self.connection_data.user,
+            password=self.connection_data.password,
+            host=self.connection_data.host,
+            port=self.connection_data.port,
+        )
+        conn.autocommit = True
+        return PooledConnection(conn)
+
+    def _checkout(self) -> PooledConnection:
+        started_at = time.monotonic()
+        deadline = started_at + self.checkout_timeout
+        pooled: Optional[PooledConnection] = None
+        with self._condition:
+            while True:
+                self._close_idle_expired()
+                self.last_used_at = time.monotonic()
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PgPoolTimeoutError(
+                        f"Could not get connection to database "
+                        f"'{self.connection_data.db_name}' in "
+                        f"{self.checkout_timeout} seconds"
+                    )
+                self._condition.wait(remaining)
+        app_postgres_pool_wait_seconds.labels(**self._labels).observe(
+            time.monotonic() - started_at
+        )
+
+        if pooled and not (
+            pooled.is_healthy() and not pooled.is_expired(self.max_lifetime)
+        ):
+            pooled.close()
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = self._connect()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                self._update_metrics()
+                raise
+
+        app_postgres_pool_checkout_latency_seconds.labels(
+            **self._labels
+        ).observe(time.monotonic() - started_at)
+        self._update_metrics()
+        return pooled
+
+    def _release(self, pooled: PooledConnection):
+        if pooled.connection.closed or pooled.is_expired(self.max_lifetime):
+            self._discard(pooled)
+            return
+        pooled.released_at = time.monotonic()
+        with self._condition:
+            self.last_used_at = pooled.released_at
+            self._idle.append(pooled)
+            self._condition.notify()
+        self._update_metrics()
+
+    def _discard(self, pooled: PooledConnection):
+        pooled.close()
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        self._update_metrics()
+
+    def _close_idle_expired(self):
+        """
+        Closes connections idle for too long, keeps at least min size of
+        pool. Oldest released connections are at the left side of queue.
+        """
+        while (
+            self._idle
+            and self._size > self.min_size
+            and self._idle[0].is_idle_expired(self.idle_timeout)
+        ):
+            self._idle.popleft().close()
+            self._size -= 1
+
+    def close_idle_expired(self):
+        with self._condition:
+            self._close_idle_expired()
+        self._update_metrics()
+
+    def is_unused(self) -> bool:
+        """
+        Checks that pool has no connections and was not used for idle
+        timeout, so it can be removed.
+        """
+        with self._condition:
+            return (
+                self._size == 0
+                and time.monotonic() - self.last_used_at >= self.idle_timeout
+            )
+
+    def _update_metrics(self):
+        idle_size = self.idle_size
+        app_postgres_pool_connections.labels(state="idle", **self._labels).set(
+            idle_size
+        )
+        app_postgres_pool_connections.labels(state="used", **self._labels).set(
+            self._size - idle_size
+        )
+
+    def _remove_metrics(self):
+        label_values = tuple(self._labels.values())
+        series = [
+            (app_postgres_pool_connections, (*label_values, "idle")),
+            (app_postgres_pool_connections, (*label_values, "used")),
+            (app_postgres_pool_wait_seconds, label_values),
+            (app_postgres_pool_checkout_latency_seconds, label_values),
+        ]
+        for metric, values in series:
+            try:
+                metric.remove(*values)
+            except KeyError:
+                pass
+
+    def close(self):
+        """
+        Closes idle connections and removes metrics of pool.
+        """
+        with self._condition:
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+        self._remove_metrics()
+
+
+class PostgresConnectionPools:
+    """
+    Process-wide registry of connection pools by (host, port, db_name, user).
+
+    Most pools are used once, when database of microservice is provisioned,
+    so idle connections of all pools are closed by reaper in background.
+    """
+
+    _pools: Dict[PoolKey, PostgresConnectionPool] = {}
+    _lock = threading.Lock()
+    _reaper: Optional[threading.Thread] = None
+    _stopped = threading.Event()
+
+    @classmethod
+    def get_pool(
+        cls, connection_data: PgConnectorDbSecretDto
+    ) -> PostgresConnectionPool:
+        key = (
+            connection_data.host,
+            int(connection_data.port),
+            connection_data.db_name,
+            connection_data.user,
+        )
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = PostgresConnectionPool(connection_data)
+                cls._pools[key] = pool
+            elif pool.connection_data.password != connection_data.password:
+                # New connections are opened with actual password,
+                # opened ones stay valid after password change.
+                pool.connection_data = connection_data
+            # Pool is not removed by reaper before it is used by caller.
+            pool.last_used_at = time.monotonic()
+            cls._start_reaper()
+        return pool
+
+    @classmethod
+    def close_idle_expired(cls):
+        """
+        Closes idle connections of all pools and removes pools that were
+        not used for idle timeout.
+        """
+        with cls._lock:
+            pools = list(cls._pools.items())
+        for _, pool in pools:
+            pool.close_idle_expired()
+        with cls._lock:
+            for key, pool in pools:
+                if cls._pools.get(key) is pool and pool.is_unused():
+                    del cls._pools[key]
+                    pool.close()
+
+    @classmethod
+    def _start_reaper(cls):
+        if cls._reaper is not None or not settings.POSTGRES_POOL_REAP_INTERVAL:
+            return
+        cls._stopped = threading.Event()
+        cls._reaper = threading.Thread(
+            target=cls._reap,
+            args=(cls._stopped,),
+            name="postgres-pool-reaper",
+            daemon=True,
+        )
+        cls._reaper.start()
+
+    @classmethod
+    def _reap(cls, stopped: threading.Event):
+        while not stopped.wait(settings.POSTGRES_POOL_REAP_INTERVAL):
+            try:
+                cls.close_idle_expired()
+            except Exception:
+                logger.exception("Idle Postgres connections are not closed")
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools = {}
+            cls._stopped.set()
+            cls._reaper = None
@@ -1,19 +1,41 @@
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Iterable
+from contextlib import contextmanager
+from typing import ContextManager, Iterable, Iterator, Optional
 
 import psycopg2
-from clients.postgres.dto import PgConnectorDbSecretDto
-from clients.postgres.exceptions import PgQueryValidationError
+from clients.postgres.dto import PgConnectorDbSecretDto, PgDatabaseState
+from clients.postgres.exceptions import (
+    PgPoolTimeoutError,
+    PgQueryValidationError,
+)
+from clients.postgres.pool import (
+    PostgresConnectionPool,
+    PostgresConnectionPools,
+)
 from exceptions import InfrastructureServiceProblem
 from psycopg2 import sql
+from psycopg2.extensions import connection
 
 logger = logging.getLogger("postgresclient")
 
 
+ADMIN_USER = "postgres"
+
+
 class AbstractPostgresClient:
     __metaclass__ = ABCMeta
 
+    @abstractmethod
+    def session(self) -> ContextManager:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_database_state(
+        self, db_name: str, user: str, readonly_user: Optional[str] = None
+    ) -> PgDatabaseState:
+        raise NotImplementedError
+
     @abstractmethod
     def is_user_exist(self, user: str) -> bool:
         raise NotImplementedError
@@ -53,8 +75,42 @@ class AbstractPostgresClient:
 
 class PostgresClient(AbstractPostgresClient):
 
-    def __init__(self, pg_connector_secret_dto: PgConnectorDbSecretDto):
+    def __init__(
+        self,
+        pg_connector_secret_dto: PgConnectorDbSecretDto,
+        pool: PostgresConnectionPool = None,
+    ):
         self.connection_data = pg_connector_secret_dto
+        self.pool = pool or PostgresConnectionPools.get_pool(
+            pg_connector_secret_dto
+        )
+        self._session_connection: Optional[connection] = None
+
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Executes all queries inside the block over one connection.
+        """
+        if self._session_connection is not None:
+            yield
+            return
+        try:
+            with self.pool.connection() as conn:
+                self._session_connection = conn
+                try:
+                    yield
+                finally:
+                    self._session_connection = None
+        except (psycopg2.Error, PgPoolTimeoutError) as e:
+            raise InfrastructureServiceProblem("Postgres", e)
+
+    @contextmanager
+    def _connection(self) -> Iterator[connection]:
+        if self._session_connection is not None:
+            yield self._session_connection
+        else:
+            with self.pool.connection() as conn:
+                yield conn
 
     def _execute_query_v2(
         self,
@@ -77,7 +133,6 @@ class PostgresClient(AbstractPostgresClient):
 
         :return: Returns list of values.
         """
-        conn = None
         if values is None:
             values = []
         if identifiers is None:
@@ -91,55 +146,78 @@ class PostgresClient(AbstractPostgresClient):
             query_identifiers = [sql.Identifier(i) for i in identifiers]
             query = sql.SQL(query).format(*query_identifiers)
         try:
-            logger.info("Connecting to the PostgreSQL database...")
-            conn = psycopg2.connect(
-                database=self.connection_data.db_name,
-                user=self.connection_data.user,
-                password=self.connection_data.password,
-                host=self.connection_data.host,
-                port=self.connection_data.port,
-            )
-            conn.autocommit = True
-            cursor = conn.cursor()
-
-            cursor.execute(query, values)
-
-            try:
-                results = cursor.fetchall()
-            except psycopg2.ProgrammingError:
-                results = []
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, values)
+                try:
+                    results = cursor.fetchall()
+                except psycopg2.ProgrammingError:
+                    results = []
         except (Exception, psycopg2.DatabaseError) as e:
             raise InfrastructureServiceProblem("Postgres", e)
-        else:
-            return results
-        finally:
-            if conn is not None:
-                conn.close()
-                logger.info("Database connection closed.")
+        return results
+
+    def get_database_state(
+        self, db_name: str, user: str, readonly_user: Optional[str] = None
+    ) -> PgDatabaseState:
+        """
+        Returns provisioning state of database and its users in one query
+        to shared catalogs, so it can be executed in any database.
+        """
+        query = """
+            SELECT
+                EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_roles r WHERE r.rolname = %s
+                ),
+                EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_database db
+                    WHERE db.datname = %s
+                ),
+                EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_auth_members m
+                    JOIN pg_catalog.pg_roles r ON r.oid = m.roleid
+                    JOIN pg_catalog.pg_roles a ON a.oid = m.member
+                    WHERE r.rolname = %s AND a.rolname = %s
+                ),
+                EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_roles r WHERE r.rolname = %s
+                );
+        """
+        result = self._execute_query_v2(
+            query, values=[user, db_name, user, ADMIN_USER, readonly_user]
+        )
+        return PgDatabaseState(*result[0])
 
     def is_user_exist(self, user: str) -> bool:
         query = """SELECT * FROM pg_catalog.pg_user u WHERE u.usename = %s;"""
         return bool(self._execute_query_v2(query, values=[user]))
 
     def is_user_grantee(self, database: str, user: str) -> bool:
+        """
+        Checks that user can read tables created in public schema of
+        database, which must be the current one.
+
+        Only schema privilege and default privileges are checked, so
+        query time does not depend on number of tables in database.
+        """
         query = """
-            SELECT 1 FROM information_schema.table_privileges WHERE
-                grantee = %s
-                AND table_catalog = %s
-                AND privilege_type = 'SELECT'
-            UNION
             SELECT 1
-            FROM pg_default_acl acl
-            JOIN pg_namespace namespace on namespace.oid = acl.defaclnamespace
-            WHERE acl.defaclacl::text ILIKE %s
-              AND acl.defaclacl::text ILIKE %s;
+            FROM pg_catalog.pg_roles grantee
+            JOIN pg_catalog.pg_namespace ns ON ns.nspname = 'public'
+            WHERE grantee.rolname = %s
+              AND current_database() = %s
+              AND has_schema_privilege(grantee.oid, ns.oid, 'USAGE')
+              AND EXISTS (
+                SELECT 1
+                FROM pg_catalog.pg_default_acl acl,
+                     aclexplode(acl.defaclacl) privilege
+                WHERE acl.defaclobjtype = 'r'
+                  AND (acl.defaclnamespace = 0
+                       OR acl.defaclnamespace = ns.oid)
+                  AND privilege.grantee = grantee.oid
+                  AND privilege.privilege_type = 'SELECT'
+              );
         """
-        return bool(
-            self._execute_query_v2(
-                query,
-                values=[user, database, f"%{user}%", f"%{database}%"],
-            )
-        )
+        return bool(self._execute_query_v2(query, values=[user, database]))
 
     def is_database_exist(self, db_name: str) -> bool:
         query = (
@@ -174,7 +252,7 @@ class PostgresClient(AbstractPostgresClient):
         self._execute_query_v2(query, identifiers=[db_name, user])
 
     def grant_user_to_admin(self, user: str):
-        self._grant_user_to_another(user=user, another_user="postgres")
+        self._grant_user_to_another(user=user, another_user=ADMIN_USER)
 
     def _grant_user_to_another(self, user: str, another_user: str):
         query = """GRANT {} TO {};"""
@@ -0,0 +1,12 @@
+from os import getenv
+
+# Connection pools to Postgres instances, timeouts are in seconds
+POSTGRES_POOL_MIN_SIZE = int(getenv("POSTGRES_POOL_MIN_SIZE", "0"))
+POSTGRES_POOL_MAX_SIZE = int(getenv("POSTGRES_POOL_MAX_SIZE", "5"))
+POSTGRES_POOL_IDLE_TIMEOUT = int(getenv("POSTGRES_POOL_IDLE_TIMEOUT", "300"))
+POSTGRES_POOL_MAX_LIFETIME = int(getenv("POSTGRES_POOL_MAX_LIFETIME", "3600"))
+POSTGRES_POOL_CHECKOUT_TIMEOUT = int(
+    getenv("POSTGRES_POOL_CHECKOUT_TIMEOUT", "30")
+)
+# Interval of closing idle connections of all pools, 0 disables it
+POSTGRES_POOL_REAP_INTERVAL = int(getenv("POSTGRES_POOL_REAP_INTERVAL", "60"))
@@ -1,16 +1,44 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from clients.postgres.dto import PgDatabaseState
 from clients.postgres.postgresclient import AbstractPostgresClient
 
 
 class MockedPostgresClient(AbstractPostgresClient):
-    def __init__(self, db_exist: bool, user_exist: bool):
+    def __init__(
+        self,
+        db_exist: bool,
+        user_exist: bool,
+        user_granted_to_admin: bool = False,
+    ):
         self.db_exist = db_exist
         self.user_exist = user_exist
+        self.user_granted_to_admin = user_granted_to_admin
+        self.session_count = 0
+        self.get_database_state_call_count = 0
         self.db_create_call_count = 0
         self.user_create_call_count = 0
         self.user_alter_password_call_count = 0
         self.grant_call_count = 0
         self.grant_user_to_admin_call_count = 0
 
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        self.session_count += 1
+        yield
+
+    def get_database_state(
+        self, db_name: str, user: str, readonly_user: Optional[str] = None
+    ) -> PgDatabaseState:
+        self.get_database_state_call_count += 1
+        return PgDatabaseState(
+            user_exists=self.user_exist,
+            database_exists=self.db_exist,
+            user_granted_to_admin=self.user_granted_to_admin,
+            readonly_user_exists=bool(readonly_user),
+        )
+
     def is_user_exist(self, user: str) -> bool:
         return self.user_exist
 
@@ -0,0 +1,203 @@
+import threading
+from dataclasses import replace
+from typing import Optional
+
+import psycopg2
+import pytest
+from clients.postgres.exceptions import PgPoolTimeoutError
+from clients.postgres.pool import (
+    PostgresConnectionPool,
+    PostgresConnectionPools,
+)
+from clients.postgres.postgresclient import PostgresClient
+from clients.postgres.tests.factories import PgConnectorDbSecretDtoTestFactory
+from prometheus_client import REGISTRY
+from psycopg2.extensions import POLL_OK
+
+
+@pytest.fixture
+def connect(mocker):
+    def new_connection(**_):
+        conn = mocker.MagicMock()
+        conn.closed = 0
+        conn.poll.return_value = POLL_OK
+        return conn
+
+    return mocker.patch(
+        "clients.postgres.pool.psycopg2.connect", side_effect=new_connection
+    )
+
+
+def used_connections(pool: PostgresConnectionPool) -> Optional[float]:
+    return REGISTRY.get_sample_value(
+        "app_postgres_pool_connections",
+        {**pool._labels, "state": "used"},
+    )
+
+
+def create_pool(**kwargs) -> PostgresConnectionPool:
+    kwargs = {
+        "min_size": 1,
+        "max_size": 2,
+        "idle_timeout": 300,
+        "max_lifetime": 3600,
+        "checkout_timeout": 1,
+        **kwargs,
+    }
+    return PostgresConnectionPool(PgConnectorDbSecretDtoTestFactory(), **kwargs)
+
+
+@pytest.mark.unit
+class TestPostgresConnectionPool:
+    def test_connection_reused(self, connect):
+        pool = create_pool()
+        for _ in range(3):
+            with pool.connection() as conn:
+                assert conn.autocommit
+        assert connect.call_count == 1
+        assert pool.size == 1
+
+    def test_unhealthy_connection_replaced(self, connect):
+        pool = create_pool()
+        with pool.connection() as conn:
+            conn.poll.side_effect = psycopg2.OperationalError
+        with pool.connection() as new_conn:
+            assert new_conn is not conn
+        assert connect.call_count == 2
+        assert pool.size == 1
+
+    def test_expired_connection_replaced(self, connect):
+        pool = create_pool(max_lifetime=0)
+        with pool.connection():
+            pass
+        assert pool.size == 0
+        with pool.connection():
+            pass
+        assert connect.call_count == 2
+
+    def test_idle_connections_closed_above_min_size(self, connect):
+        pool = create_pool(idle_timeout=0)
+        with pool.connection(), pool.connection():
+            pass
+        assert pool.size == 2
+        with pool.connection():
+            pass
+        assert pool.size == 1
+
+    def test_broken_connection_discarded(self, connect):
+        pool = create_pool()
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection():
+                raise psycopg2.OperationalError
+        assert pool.size == 0
+
+    def test_checkout_timeout(self, connect):
+        pool = create_pool(max_size=1, checkout_timeout=0)
+        with pool.connection():
+            with pytest.raises(PgPoolTimeoutError):
+                with pool.connection():
+                    pass
+
+    def test_waiting_for_released_connection(self, connect):
+        pool = create_pool(max_size=1)
+        checked_out = threading.Event()
+
+        def hold_connection():
+            with pool.connection():
+                checked_out.set()
+                threading.Event().wait(0.1)
+
+        thread = threading.Thread(target=hold_connection)
+        thread.start()
+        checked_out.wait()
+        with pool.connection():
+            pass
+        thread.join()
+        assert connect.call_count == 1
+
+    def test_failed_connect_frees_place(self, connect):
+        pool = create_pool(max_size=1)
+        connect.side_effect = psycopg2.OperationalError
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection():
+                pass
+        assert pool.size == 0
+
+
+@pytest.mark.unit
+class TestPostgresConnectionPools:
+    def test_pool_per_database_user(self, connect):
+        connection_data = PgConnectorDbSecretDtoTestFactory()
+        first = PostgresClient(connection_data)
+        second = PostgresClient(connection_data)
+        other = PostgresClient(PgConnectorDbSecretDtoTestFactory())
+        assert first.pool is second.pool
+        assert first.pool is not other.pool
+        PostgresConnectionPools.close_all()
+
+    def test_queries_share_connection(self, connect):
+        client = PostgresClient(PgConnectorDbSecretDtoTestFactory())
+        client.is_user_exist("user")
+        client.is_database_exist("database")
+        assert connect.call_count == 1
+        PostgresConnectionPools.close_all()
+
+    def test_idle_connections_of_unused_pool_closed(self, connect, mocker):
+        mocker.patch("clients.postgres.settings.POSTGRES_POOL_REAP_INTERVAL", 0)
+        connection_data = PgConnectorDbSecretDtoTestFactory()
+        pool = PostgresConnectionPools.get_pool(connection_data)
+        pool.min_size = 0
+        with pool.connection():
+            pass
+        assert pool.size == 1
+
+        pool.idle_timeout = 0
+        PostgresConnectionPools.close_idle_expired()
+        assert pool.size == 0
+        PostgresConnectionPools.close_all()
+
+    def test_metrics_per_pool(self, connect):
+        connection_data = PgConnectorDbSecretDtoTestFactory()
+        pools = [
+            PostgresConnectionPools.get_pool(connection_data),
+            PostgresConnectionPools.get_pool(
+                replace(connection_data, user="other")
+            ),
+        ]
+        with pools[0].connection():
+            with pools[1].connection():
+                assert used_connections(pools[0]) == 1
+                assert used_connections(pools[1]) == 1
+            assert used_connections(pools[0]) == 1
+            assert used_connections(pools[1]) == 0
+        PostgresConnectionPools.close_all()
+
+    def test_unused_pool_removed(self, connect, mocker):
+        mocker.patch("clients.postgres.settings.POSTGRES_POOL_REAP_INTERVAL", 0)
+        pool = PostgresConnectionPools.get_pool(
+            PgConnectorDbSecretDtoTestFactory()
+        )
+        pool.min_size = 0
+        with pool.connection():
+            pass
+        PostgresConnectionPools.close_idle_expired()
+        assert PostgresConnectionPools._pools
+
+        pool.idle_timeout = 0
+        PostgresConnectionPools.close_idle_expired()
+        assert not PostgresConnectionPools._pools
+        assert used_connections(pool) is None
+
+    def test_reaper_started_once(self, connect, mocker):
+        mocker.patch(
+            "clients.postgres.settings.POSTGRES_POOL_REAP_INTERVAL", 60
+        )
+        PostgresConnectionPools.get_pool(PgConnectorDbSecretDtoTestFactory())
+        reaper = PostgresConnectionPools._reaper
+        PostgresConnectionPools.get_pool(PgConnectorDbSecretDtoTestFactory())
+        assert reaper.is_alive()
+        assert PostgresConnectionPools._reaper is reaper
+
+        PostgresConnectionPools.close_all()
+        reaper.join(1)
+        assert not reaper.is_alive()
@@ -0,0 +1,197 @@
+from dataclasses import replace
+from os import getenv
+from time import perf_counter
+
+import pytest
+from clients.postgres.dto import PgConnectorDbSecretDto, PgDatabaseState
+from clients.postgres.pool import PostgresConnectionPools
+from clients.postgres.postgresclient import PostgresClient
+from clients.postgres.tests.factories import PgConnectorDbSecretDtoTestFactory
+
+
+@pytest.fixture
+def pool(mocker):
+    return mocker.MagicMock()
+
+
+def get_cursor(pool):
+    conn = pool.connection.return_value.__enter__.return_value
+    return conn.cursor.return_value.__enter__.return_value
+
+
+@pytest.mark.unit
+class TestPostgresClient:
+    def test_get_database_state(self, pool):
+        get_cursor(pool).fetchall.return_value = [(True, False, False, True)]
+        client = PostgresClient(PgConnectorDbSecretDtoTestFactory(), pool=pool)
+        state = client.get_database_state("db", "user", "readonly")
+        assert state == PgDatabaseState(
+            user_exists=True,
+            database_exists=False,
+            user_granted_to_admin=False,
+            readonly_user_exists=True,
+        )
+
+    def test_session_uses_one_connection(self, pool):
+        client = PostgresClient(PgConnectorDbSecretDtoTestFactory(), pool=pool)
+        with client.session():
+            client.create_user("user", "password")
+            client.create_database("db", "user")
+        assert pool.connection.call_count == 1
+        assert get_cursor(pool).execute.call_count == 5
+
+
+LEGACY_IS_USER_GRANTEE_QUERY = """
+    SELECT 1 FROM information_schema.table_privileges WHERE
+        grantee = %s
+        AND table_catalog = %s
+        AND privilege_type = 'SELECT'
+    UNION
+    SELECT 1
+    FROM pg_default_acl acl
+    JOIN pg_namespace namespace on namespace.oid = acl.defaclnamespace
+    WHERE acl.defaclacl::text ILIKE %s
+      AND acl.defaclacl::text ILIKE %s;
+"""
+
+
+requires_local_postgres = pytest.mark.skipif(
+    not getenv("POSTGRES_LOCAL_HOST"),
+    reason="This test contains real Postgres calls. It must run manually "
+    "with POSTGRES_LOCAL_HOST (and optionally POSTGRES_LOCAL_PORT, "
+    "POSTGRES_LOCAL_USER, POSTGRES_LOCAL_PASSWORD) of superuser.",
+)
+
+
+class GranteeOnLocal:
+    """
+    Database with tables of owner and readonly user on local Postgres.
+    """
+
+    TABLES_COUNT: int
+    DATABASE: str
+    OWNER: str
+    READONLY: str
+
+    @pytest.fixture(scope="class")
+    def clients(self):
+        admin_cred = PgConnectorDbSecretDto(
+            db_name="postgres",
+            user=getenv("POSTGRES_LOCAL_USER", "postgres"),
+            password=getenv("POSTGRES_LOCAL_PASSWORD", ""),
+            host=getenv("POSTGRES_LOCAL_HOST"),
+            port=int(getenv("POSTGRES_LOCAL_PORT", "5432")),
+        )
+        admin = PostgresClient(admin_cred)
+        admin.create_user(self.OWNER, "password")
+        admin.create_user(self.READONLY, "password")
+        admin.create_database(self.DATABASE, self.OWNER)
+
+        database = PostgresClient(replace(admin_cred, db_name=self.DATABASE))
+        with database.session():
+            database._execute_query_v2("SET ROLE {};", identifiers=[self.OWNER])
+            database._execute_query_v2(
+                """
+                DO $$
+                BEGIN
+                    FOR i IN 1..%s LOOP
+                        EXECUTE format('CREATE TABLE t_%%s (id int)', i);
+                    END LOOP;
+                END $$;
+                """,
+                values=[self.TABLES_COUNT],
+            )
+            database._execute_query_v2("RESET ROLE;")
+        yield admin, database
+
+        PostgresConnectionPools.close_all()
+        admin._execute_query_v2(
+            "DROP DATABASE {};", identifiers=[self.DATABASE]
+        )
+        admin._execute_query_v2(
+            "DROP USER {}, {};", identifiers=[self.OWNER, self.READONLY]
+        )
+
+    def legacy(self, database: PostgresClient) -> bool:
+        return bool(
+            database._execute_query_v2(
+                LEGACY_IS_USER_GRANTEE_QUERY,
+                values=[
+                    self.READONLY,
+                    self.DATABASE,
+                    f"%{self.READONLY}%",
+                    f"%{self.DATABASE}%",
+                ],
+            )
+        )
+
+    def catalog(self, database: PostgresClient) -> bool:
+        return database.is_user_grantee(self.DATABASE, self.READONLY)
+
+
+@pytest.mark.e2e
+@requires_local_postgres
+class TestPostgresClientGranteeOnLocal(GranteeOnLocal):
+    """
+    Checks that catalog query of grants agrees with information_schema
+    query it replaced.
+    """
+
+    TABLES_COUNT = 10
+    DATABASE = "grantee_check"
+    OWNER = "grantee_check_owner"
+    READONLY = "grantee_check_readonly"
+
+    def test_is_user_grantee(self, clients):
+        _, database = clients
+
+        assert not self.legacy(database)
+        assert not self.catalog(database)
+
+        database.grant_access_on_select(self.OWNER, self.READONLY)
+        assert self.legacy(database)
+        assert self.catalog(database)
+
+
+@pytest.mark.benchmark
+@requires_local_postgres
+class TestPostgresClientGranteeBenchmarkOnLocal(GranteeOnLocal):
+    """
+    Reports timings of information_schema and catalog queries of grants
+    on schema with many tables, run it with `-m benchmark -s`. Timings
+    depend on Postgres instance, so they are not asserted.
+    """
+
+    TABLES_COUNT = 10_000
+    DATABASE = "grantee_benchmark"
+    OWNER = "grantee_benchmark_owner"
+    READONLY = "grantee_benchmark_readonly"
+
+    @staticmethod
+    def measure(func, repeat: int = 5) -> float:
+        timings = []
+        for _ in range(repeat):
+            started_at = perf_counter()
+            func()
+            timings.append(perf_counter() - started_at)
+        return min(timings)
+
+    def test_is_user_grantee(self, clients):
+        _, database = clients
+
+        not_granted = (
+            self.measure(lambda: self.legacy(database)),
+            self.measure(lambda: self.catalog(database)),
+        )
+        database.grant_access_on_select(self.OWNER, self.READONLY)
+        granted = (
+            self.measure(lambda: self.legacy(database)),
+            self.measure(lambda: self.catalog(database)),
+        )
+
+        print(
+            f"\nis_user_grantee on {self.TABLES_COUNT} tables, seconds "
+            f"(information_schema / catalog): "
+            f"not granted {not_granted[0]:.4f} / {not_granted[1]:.4f}, "
+            f"granted {granted[0]:.4f} / {granted[1]:.4f}"
+        )
@@ -2,8 +2,8 @@ import base64
 import logging
 from abc import ABCMeta, abstractmethod
 
-import requests
 import ujson
+from clients.http.session import HttpSessions
 from clients.rabbit.exceptions import RabbitClientError
 from clients.rabbit.settings import RABBIT_TIMEOUT
 from exceptions import InfrastructureServiceProblem
@@ -114,7 +114,7 @@ class RabbitClient(AbstractRabbitClient):
             "content-type": "application/json",
         }
         try:
-            response = requests.request(
+            response = HttpSessions.get_session(self.url).request(
                 method=method,
                 url=endpoint,
                 data=ujson.dumps(data),
@@ -2,8 +2,8 @@ from abc import ABCMeta, abstractmethod
 from http import HTTPStatus
 from typing import List, Optional
 
-import requests
 import ujson
+from clients.http.session import HttpSessions
 from clients.sentry.dto import SentryProject, SentryProjectKey, SentryTeam
 from clients.sentry.dto_factories import (
     SentryProjectDtoFactory,
@@ -78,7 +78,7 @@ class SentryClient(AbstractSentryClient):
             "content-type": "application/json",
         }
         try:
-            response = requests.request(
+            response = HttpSessions.get_session(self.url).request(
                 method=method,
                 url=endpoint,
                 headers=headers,
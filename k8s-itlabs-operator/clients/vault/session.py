@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+import hvac
+from clients.vault import settings
+from observability.metrics.metrics import (
+    app_vault_logins_total,
+    app_vault_token_renewals_total,
+)
+
+logger = logging.getLogger("vault_session")
+
+SERVICE_ACCOUNT_TOKEN_PATH = (
+    "/var/run/secrets/kubernetes.io/serviceaccount/token"
+)
+
+
+class VaultSession:
+    """
+    Process-wide authenticated Vault session.
+
+    Logs in with Kubernetes auth once, keeps the token alive by renewing
+    it in background before expiry and logs in again when the token is
+    rejected or cannot be renewed anymore.
+    """
+
+    _RETRY_DELAY = 10
+
+    _instance: Optional["VaultSession"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        url: str = settings.VAULT_URL,
+        role: str = settings.VAULT_K8S_ROLE,
+        mount_point: str = settings.VAULT_K8S_AUTH_METHOD,
+        jwt_path: str = SERVICE_ACCOUNT_TOKEN_PATH,
+    ):
+        self.role = role
+        self.mount_point = mount_point
+        self.jwt_path = jwt_path
+        self._client = hvac.Client(url=url)
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._renewal_thread: Optional[threading.Thread] = None
+        self._logged_in = False
+        self._lease_duration = 0
+        self._expires_at: Optional[float] = None
+        self._renew_at: Optional[float] = None
+
+    @classmethod
+    def get_instance(cls) -> "VaultSession":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @property
+    def client(self) -> hvac.Client:
+        """
+        Returns shared hvac client with valid token, logs in if required.
+        """
+        with self._lock:
+            if not self._logged_in or self._is_expired():
+                self._login()
+            return self._client
+
+    def relogin(self, rejected_token: Optional[str] = None):
+        """
+        Logs in again after Vault rejected the token. When several threads
+        get rejected with the same token only the first one logs in.
+        """
+        with self._lock:
+            if rejected_token is None or rejected_token == self._client.token:
+                self._login()
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+
+    def _is_expired(self) -> bool:
+        return self._expires_at is not None and time.monotonic() >= (
+            self._expires_at
+        )
+
+    def _read_jwt(self) -> str:
+        with open(self.jwt_path) as f:
+            return f.read()
+
+    def _login(self):
+        logger.info("Login to Vault with role '%s'", self.role)
+        try:
+            response = self._client.auth.kubernetes.login(
+                self.role,
+                self._read_jwt(),
+                use_token=True,
+                mount_point=self.mount_point,
+            )
+        except Exception:
+            app_vault_logins_total.labels(status="failure").inc()
+            logger.exception("Vault auth failed")
+            raise
+        app_vault_logins_total.labels(status="success").inc()
+        self._logged_in = True
+        self._schedule_renewal(response["auth"])
+
+    def _renew(self):
+        with self._lock:
+            try:
+                response = self._client.auth.token.renew_self()
+                auth = response["auth"]
+            except Exception as e:
+                app_vault_token_renewals_total.labels(status="failure").inc()
+                logger.warning("Vault token renewal failed: %s", e)
+                self._login()
+                return
+            if auth["lease_duration"] < self._lease_duration:
+                # Token max TTL is reached, so renewal could not prolong
+                # it on full lease duration anymore.
+                app_vault_token_renewals_total.labels(status="exhausted").inc()
+                self._login()
+                return
+            app_vault_token_renewals_total.labels(status="success").inc()
+            self._schedule_renewal(auth)
+
+    def _schedule_renewal(self, auth: dict):
+        lease_duration = auth.get("lease_duration") or 0
+        if not lease_duration or not auth.get("renewable", True):
+            self._lease_duration = lease_duration
+            self._expires_at = (
+                time.monotonic() + lease_duration if lease_duration else None
+            )
+            self._renew_at = None
+            return
+        now = time.monotonic()
+        self._lease_duration = lease_duration
+        self._expires_at = now + lease_duration
+        self._renew_at = now + max(
+            lease_duration - settings.VAULT_TOKEN_RENEW_BEFORE,
+            lease_duration / 2,
+        )
+        self._wakeup.set()
+        if self._renewal_thread is None:
+            self._renewal_thread = threading.Thread(
+                target=self._renewal_loop,
+                name="vault-token-renewal",
+                daemon=True,
+            )
+            self._renewal_thread.start()
+
+    def _renewal_loop(self):
+        while not self._closed:
+            with self._lock:
+                renew_at = self._renew_at
+            timeout = (
+                None
+                if renew_at is None
+                else max(renew_at - time.monotonic(), 0)
+            )
+            if self._wakeup.wait(timeout):
+                self._wakeup.clear()
+                continue
+            try:
+                self._renew()
+            except Exception:
+                logger.exception("Vault token could not be refreshed")
+                with self._lock:
+                    self._renew_at = time.monotonic() + self._RETRY_DELAY
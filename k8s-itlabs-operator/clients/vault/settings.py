@@ -3,3 +3,9 @@ from os import getenv
 VAULT_URL = getenv("VAULT_URL", "http://localhost:8200")
 VAULT_K8S_AUTH_METHOD = getenv("VAULT_K8S_AUTH_METHOD", "kube-dev")
 VAULT_K8S_ROLE = getenv("VAULT_K8S_ROLE", "k8s-itlabs-operator")
+# Seconds before token expiry when the shared Vault session renews it
+VAULT_TOKEN_RENEW_BEFORE = int(getenv("VAULT_TOKEN_RENEW_BEFORE", "60"))
+# Time to live (seconds) and size of in-memory cache of read Vault secrets,
+# cache is disabled when any of them is 0
+VAULT_CACHE_TTL = int(getenv("VAULT_CACHE_TTL", "60"))
+VAULT_CACHE_MAX_SIZE = int(getenv("VAULT_CACHE_MAX_SIZE", "1024"))
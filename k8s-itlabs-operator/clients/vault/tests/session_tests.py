@@ -0,0 +1,92 @@
+import hvac
+import pytest
+from clients.vault.session import VaultSession
+from clients.vault.vaultclient import VaultClient, VaultSecretCache
+
+
+def login_response(token: str, lease_duration: int = 3600) -> dict:
+    return {
+        "auth": {
+            "client_token": token,
+            "lease_duration": lease_duration,
+            "renewable": True,
+        }
+    }
+
+
+@pytest.fixture
+def session(mocker, tmp_path):
+    jwt_path = tmp_path / "token"
+    jwt_path.write_text("jwt")
+    hvac_client = mocker.patch("clients.vault.session.hvac.Client").return_value
+    hvac_client.token = None
+    hvac_client.auth.kubernetes.login.side_effect = [
+        login_response("token-1"),
+        login_response("token-2"),
+    ]
+    session = VaultSession(jwt_path=str(jwt_path))
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+class TestVaultSession:
+    def test_login_once(self, session):
+        for _ in range(5):
+            client = session.client
+        assert client.auth.kubernetes.login.call_count == 1
+        client.auth.kubernetes.login.assert_called_with(
+            session.role, "jwt", use_token=True, mount_point=session.mount_point
+        )
+
+    def test_relogin_once_for_same_rejected_token(self, session):
+        client = session.client
+        client.token = "token-1"
+        session.relogin(rejected_token="token-1")
+        client.token = "token-2"
+        session.relogin(rejected_token="token-1")
+        assert client.auth.kubernetes.login.call_count == 2
+
+    def test_renew_prolongs_token(self, session):
+        client = session.client
+        client.auth.token.renew_self.return_value = login_response("token-1")
+        session._renew()
+        assert client.auth.token.renew_self.call_count == 1
+        assert client.auth.kubernetes.login.call_count == 1
+
+    def test_renew_failure_leads_to_login(self, session):
+        client = session.client
+        client.auth.token.renew_self.side_effect = hvac.exceptions.Forbidden
+        session._renew()
+        assert client.auth.kubernetes.login.call_count == 2
+
+    def test_renew_with_exhausted_ttl_leads_to_login(self, session):
+        client = session.client
+        client.auth.token.renew_self.return_value = login_response(
+            "token-1", lease_duration=10
+        )
+        session._renew()
+        assert client.auth.kubernetes.login.call_count == 2
+
+    def test_expired_token_leads_to_login(self, session):
+        client = session.client
+        session._expires_at = 0
+        assert session.client is client
+        assert client.auth.kubernetes.login.call_count == 2
+
+
+@pytest.mark.unit
+class TestVaultClientRelogin:
+    def test_retry_after_forbidden(self, session):
+        hvac_client = session.client
+        read = hvac_client.secrets.kv.v2.read_secret_version
+        read.side_effect = [
+            hvac.exceptions.Forbidden,
+            {"data": {"data": {"key": "value"}}},
+        ]
+        client = VaultClient(
+            hvac_client, session=session, cache=VaultSecretCache()
+        )
+        assert client.read_secret("vault:mount/data/path") == {"key": "value"}
+        assert read.call_count == 2
+        assert hvac_client.auth.kubernetes.login.call_count == 2
@@ -1,6 +1,8 @@
+from dataclasses import dataclass
+
 import pytest
 from clients.vault.tests.mocks import VaultClientMocker
-from clients.vault.vaultclient import VaultClient
+from clients.vault.vaultclient import VaultClient, VaultSecretCache
 
 
 @pytest.mark.unit
@@ -25,3 +27,102 @@ class TestVaultClient:
             assert attr_dict.get("c") == new_obj.c
             assert attr_dict.get("d") != new_obj.d
             assert value["data"]["data"]["ASD"] == new_obj.d
+
+    def test_unvault_dataclass_reads_secret_once(self, mocker):
+        @dataclass
+        class Connector:
+            host: str
+            port: str
+            password: str
+            user: str = "vault:mount/data/other#USER"
+            database: str = "db"
+
+        value = {"data": {"data": {"HOST": "localhost", "PORT": "5432"}}}
+        read_mock = VaultClientMocker.mock_hvac_vault_client(mocker, value)
+        client = VaultClient(mocker.MagicMock(), cache=VaultSecretCache())
+        connector = client.unvault_object(
+            Connector(
+                host="vault:mount/data/path#HOST",
+                port="vault:mount/data/path#PORT",
+                password="vault:mount/data/path#PASSWORD",
+            )
+        )
+        assert connector == Connector(
+            host="localhost",
+            port="5432",
+            password=None,
+            user=None,
+            database="db",
+        )
+        assert read_mock.call_count == 2
+
+
+@pytest.mark.unit
+class TestVaultSecretCache:
+    def test_get_expired(self):
+        cache = VaultSecretCache(ttl=60, max_size=10)
+        cache.set(("mount", "path", None), {"key": "value"})
+        assert cache.get(("mount", "path", None)) == {"key": "value"}
+        cache._entries[("mount", "path", None)] = (0, {"key": "value"})
+        assert cache.get(("mount", "path", None)) is None
+
+    def test_least_recently_used_evicted(self):
+        cache = VaultSecretCache(ttl=60, max_size=2)
+        cache.set(("mount", "a", None), {"key": "a"})
+        cache.set(("mount", "b", None), {"key": "b"})
+        cache.get(("mount", "a", None))
+        cache.set(("mount", "c", None), {"key": "c"})
+        assert cache.get(("mount", "a", None)) == {"key": "a"}
+        assert cache.get(("mount", "b", None)) is None
+        assert cache.get(("mount", "c", None)) == {"key": "c"}
+
+    def test_evict_all_versions(self):
+        cache = VaultSecretCache(ttl=60, max_size=10)
+        cache.set(("mount", "path", None), {"key": "value"})
+        cache.set(("mount", "path", 1), {"key": "value"})
+        cache.set(("mount", "other", None), {"key": "value"})
+        cache.evict("mount", "path")
+        assert cache.get(("mount", "path", None)) is None
+        assert cache.get(("mount", "path", 1)) is None
+        assert cache.get(("mount", "other", None)) == {"key": "value"}
+
+    def test_disabled(self):
+        cache = VaultSecretCache(ttl=0, max_size=10)
+        cache.set(("mount", "path", None), {"key": "value"})
+        assert cache.get(("mount", "path", None)) is None
+
+
+@pytest.mark.unit
+class TestVaultClientCache:
+    def test_read_secret_once(self, mocker):
+        value = {"data": {"data": {"key": "value"}}}
+        read_mock = VaultClientMocker.mock_hvac_vault_client(mocker, value)
+        client = VaultClient(mocker.MagicMock(), cache=VaultSecretCache())
+        for _ in range(3):
+            assert client.read_secret("vault:mount/data/path") == {
+                "key": "value"
+            }
+        assert read_mock.call_count == 1
+
+    def test_absent_secret_is_not_cached(self, mocker):
+        read_mock = VaultClientMocker.mock_hvac_vault_client(mocker, None)
+        client = VaultClient(mocker.MagicMock(), cache=VaultSecretCache())
+        client.read_secret("vault:mount/data/path")
+        client.read_secret("vault:mount/data/path")
+        assert read_mock.call_count == 2
+
+    def test_create_secret_updates_cache(self, mocker):
+        read_mock = VaultClientMocker.mock_hvac_vault_client(mocker, None)
+        client = VaultClient(mocker.MagicMock(), cache=VaultSecretCache())
+        client.create_secret("vault:mount/data/path", {"key": "value"})
+        assert client.read_secret("vault:mount/data/path") == {"key": "value"}
+        assert read_mock.call_count == 0
+
+    def test_delete_secret_evicts_cache(self, mocker):
+        value = {"data": {"data": {"key": "value"}}}
+        read_mock = VaultClientMocker.mock_hvac_vault_client(mocker, value)
+        client = VaultClient(mocker.MagicMock(), cache=VaultSecretCache())
+        client.read_secret("vault:mount/data/path")
+        client.delete_secret("vault:mount/data/path")
+        client.read_secret("vault:mount/data/path")
+        assert read_mock.call_count == 2
@@ -1,15 +1,27 @@
+import dataclasses
 import logging
+import threading
+import time
 from abc import ABCMeta, abstractmethod
-from typing import Optional, TypeVar, Union
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import hvac
+from clients.vault import settings
 from clients.vault.exceptions import IncorrectPath
 from clients.vault.factories.vault_path import (
     CandidateVaultPathFactory,
     VaultPathFactory,
 )
+from clients.vault.session import VaultSession
 from clients.vault.vault_path import VaultPath
 from exceptions import InfrastructureServiceProblem
+from observability.metrics.metrics import (
+    app_vault_cache_evictions_total,
+    app_vault_cache_hits_total,
+    app_vault_cache_misses_total,
+)
 
 AnyObject = TypeVar("AnyObject")
 VaultValue = Union[
@@ -21,9 +33,82 @@ VaultValue = Union[
     dict,
     list,
 ]
+SecretCacheKey = Tuple[str, str, Optional[int]]
 logger = logging.getLogger("vault_logger")
 
 
+class VaultSecretCache:
+    """
+    Bounded LRU cache of Vault KV secrets with limited time to live.
+
+    Key is (mount_point, path, version), where version None means the
+    latest secret version.
+    """
+
+    def __init__(
+        self,
+        ttl: int = settings.VAULT_CACHE_TTL,
+        max_size: int = settings.VAULT_CACHE_MAX_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[SecretCacheKey, Tuple[float, dict]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, key: SecretCacheKey) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] <= time.monotonic():
+                del self._entries[key]
+                app_vault_cache_evictions_total.labels(reason="expired").inc()
+                entry = None
+            if not entry:
+                app_vault_cache_misses_total.inc()
+                return None
+            self._entries.move_to_end(key)
+        app_vault_cache_hits_total.inc()
+        return dict(entry[1])
+
+    def set(self, key: SecretCacheKey, secret: dict):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(secret))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                app_vault_cache_evictions_total.labels(reason="size").inc()
+
+    def evict(self, mount_point: str, path: str):
+        """
+        Removes all cached versions of secret.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if key[0] == mount_point and key[1] == path
+            ]
+            for key in keys:
+                del self._entries[key]
+                app_vault_cache_evictions_total.labels(reason="deleted").inc()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+vault_secret_cache = VaultSecretCache()
+
+
 class AbstractVaultClient:
     __metaclass__ = ABCMeta
 
@@ -48,8 +133,30 @@ class VaultClient(AbstractVaultClient):
     _SECURED_VALUE = "******"
     _SECURED_KEYS = ["pass", "token", "dsn"]
 
-    def __init__(self, hvac_vault_client: hvac.Client):
+    def __init__(
+        self,
+        hvac_vault_client: hvac.Client,
+        session: Optional[VaultSession] = None,
+        cache: Optional[VaultSecretCache] = None,
+    ):
         self.client = hvac_vault_client
+        self.session = session
+        self.cache = vault_secret_cache if cache is None else cache
+
+    def _call(self, method: Callable, **kwargs):
+        """
+        Calls hvac method, logs in again and retries once if token was
+        rejected by Vault.
+        """
+        token = self.client.token
+        try:
+            return method(**kwargs)
+        except hvac.exceptions.Forbidden:
+            if not self.session:
+                raise
+            logger.info("Vault rejected token, login again")
+            self.session.relogin(rejected_token=token)
+            return method(**kwargs)
 
     def _get_secured_value(self, key: str, value: str) -> str:
         """
@@ -74,15 +181,17 @@ class VaultClient(AbstractVaultClient):
         logger.info("Write secret '%s' to Vault: %s", vault_path, secured_data)
         try:
             cas = None if update_allowed else 0
-            result = self.client.secrets.kv.v2.create_or_update_secret(
+            result = self._call(
+                self.client.secrets.kv.v2.create_or_update_secret,
                 path=vault_path.path,
                 secret=data,
                 cas=cas,
                 mount_point=vault_path.mount_point,
             )
-            return result
         except Exception as e:
             raise InfrastructureServiceProblem("Vault", e)
+        self.cache.set((vault_path.mount_point, vault_path.path, None), data)
+        return result
 
     def _read_secret_version(self, vault_path: VaultPath) -> dict:
         """
@@ -91,8 +200,10 @@ class VaultClient(AbstractVaultClient):
         logger.info("Started reading Vault secret version: %s", vault_path)
         result = None
         try:
-            result = self.client.secrets.kv.v2.read_secret_version(
-                path=vault_path.path, mount_point=vault_path.mount_point
+            result = self._call(
+                self.client.secrets.kv.v2.read_secret_version,
+                path=vault_path.path,
+                mount_point=vault_path.mount_point,
             )
         except hvac.v1.exceptions.InvalidPath:
             logger.info(
@@ -105,9 +216,15 @@ class VaultClient(AbstractVaultClient):
         return result
 
     def _read_secret(self, vault_path: VaultPath) -> Optional[dict]:
+        cache_key = (vault_path.mount_point, vault_path.path, None)
+        secret = self.cache.get(cache_key)
+        if secret is not None:
+            return secret
         raw_response = self._read_secret_version(vault_path=vault_path)
         if raw_response:
-            return raw_response["data"]["data"]
+            secret = raw_response["data"]["data"]
+            self.cache.set(cache_key, secret)
+            return secret
         return None
 
     def _read_secret_key(self, vault_path: VaultPath) -> Optional[VaultValue]:
@@ -132,24 +249,50 @@ class VaultClient(AbstractVaultClient):
         try:
             logger.info("Delete secret '%s' from Vault", path)
             vault_path = VaultPathFactory.path_from_str(vault_path=path)
-            self.client.secrets.kv.v2.delete_metadata_and_all_versions(
-                path=vault_path.path, mount_point=vault_path.mount_point
+            self._call(
+                self.client.secrets.kv.v2.delete_metadata_and_all_versions,
+                path=vault_path.path,
+                mount_point=vault_path.mount_point,
             )
+            self.cache.evict(vault_path.mount_point, vault_path.path)
         except Exception as e:
             raise InfrastructureServiceProblem("Vault", e)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_dataclass_fields(cls: type) -> Tuple[str, ...]:
+        return tuple(field.name for field in dataclasses.fields(cls))
+
+    def _get_object_attrs(self, obj: AnyObject) -> Tuple[str, ...]:
+        if dataclasses.is_dataclass(obj):
+            return self._get_dataclass_fields(type(obj))
+        return tuple(attr for attr in dir(obj) if not attr.startswith("__"))
+
     def unvault_object(self, obj: AnyObject) -> AnyObject:
-        attrs = dir(obj)
-        for attr in attrs:
-            if isinstance(getattr(obj, attr), str):
-                candidate_vault_path = (
-                    CandidateVaultPathFactory.candidate_from_str(
-                        vault_path=getattr(obj, attr)
-                    )
+        """
+        Replaces vaulted attribute values with values of secret keys,
+        every secret is read once even if several attributes refer to it.
+        """
+        secret_attrs: Dict[Tuple[str, str], List[Tuple[str, str]]] = (
+            defaultdict(list)
+        )
+        for attr in self._get_object_attrs(obj):
+            value = getattr(obj, attr)
+            if not isinstance(value, str):
+                continue
+            candidate_vault_path = CandidateVaultPathFactory.candidate_from_str(
+                vault_path=value
+            )
+            if candidate_vault_path.is_vaulted_value:
+                vault_path = candidate_vault_path.vault_path
+                secret_attrs[(vault_path.mount_point, vault_path.path)].append(
+                    (attr, vault_path.key)
                 )
-                if candidate_vault_path.is_vaulted_value:
-                    value = self._read_secret_key(
-                        candidate_vault_path.vault_path
-                    )
-                    setattr(obj, attr, value)
+
+        for (mount_point, path), attrs in secret_attrs.items():
+            secret = self._read_secret(
+                VaultPath(mount_point=mount_point, path=path, key=None)
+            )
+            for attr, key in attrs:
+                setattr(obj, attr, secret.get(key, None) if secret else None)
         return obj
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
 from connectors.atlas_connector import specifications
 from connectors.atlas_connector.exceptions import (
@@ -24,6 +25,19 @@ class AtlasMicroserviceDto:
     business_name: Optional[str] = None
 
 
+@dataclass
+class AtlasUpdate:
+    atlas_config_dto: AtlasConfigDto
+    atlas_ms_dto: AtlasMicroserviceDto
+    ms_hash: str
+    attempts: int = 0
+    ready_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.atlas_ms_dto.namespace, self.atlas_ms_dto.ms_name
+
+
 @dataclass
 class AtlasConnectorAnnotations:
     _annotations: dict
@@ -1,7 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from typing import Dict
 
-import requests
+from clients.http.session import HttpSessions
 from connectors.atlas_connector.dto import AtlasMicroserviceDto
 from connectors.atlas_connector.presenters import AtlasMicroserviceDtoPresenter
 from connectors.atlas_connector.specifications import ATLAS_TIMEOUT
@@ -20,6 +20,7 @@ class AtlasService(AbstractAtlasService):
     def __init__(self, atlas_url: str, atlas_token: str):
         self._atlas_url = atlas_url
         self._atlas_token = atlas_token
+        self._session = HttpSessions.get_session(atlas_url)
 
     def _get_headers(self) -> Dict[str, str]:
         return {"Authorization": f"Bearer {self._atlas_token}"}
@@ -30,11 +31,12 @@ class AtlasService(AbstractAtlasService):
             atlas_ms_dto=atlas_microservice_dto
         )
         try:
-            requests.post(
+            response = self._session.post(
                 url=url,
                 json=data,
                 headers=self._get_headers(),
                 timeout=ATLAS_TIMEOUT,
             )
+            response.raise_for_status()
         except Exception as ex:
             raise InfrastructureServiceProblem("Atlas", ex)
@@ -1,11 +1,18 @@
 import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 
+import settings as operator_settings
+from clients.k8s.k8s_client import HTTP_STATUS_NOT_FOUND
 from connectors.atlas_connector import specifications
 from connectors.atlas_connector.dto import (
     AtlasConfigDto,
     AtlasConnectorAnnotations,
     AtlasMicroserviceDto,
+    AtlasUpdate,
 )
+from connectors.atlas_connector.exceptions import AtlasConfigMapException
 from connectors.atlas_connector.factories.dto_factory import (
     AtlasMicroserviceDtoFactory,
 )
@@ -16,19 +23,21 @@ from connectors.atlas_connector.factories.service_factories.vault import (
     VaultServiceFactory,
 )
 from connectors.atlas_connector.services.kubernetes import KubernetesService
-from exceptions import InfrastructureServiceProblem
+from connectors.atlas_connector.services.update_buffer import (
+    AtlasUpdateBuffer,
+)
+from kubernetes.client import ApiException
 from operators.dto import ConnectorStatus
+from utils.hashing import generate_hash
 
 
 class AtlasConnectorService:
-    @staticmethod
-    def is_atlas_connector_enabled() -> bool:
-        enabled = False
-        try:
-            KubernetesService.get_atlas_config()
-            enabled = True
-        finally:
-            return enabled
+    # Hashes of microservices sent to Atlas by namespace and name, so
+    # unchanged microservices are not sent again on every pod event.
+    # Least recently used hashes are dropped, dropped microservice is
+    # just sent again.
+    _sent_hashes: OrderedDict[Tuple[str, str], str] = OrderedDict()
+    _sent_hashes_lock = threading.Lock()
 
     @classmethod
     def on_upsert_pod(
@@ -41,30 +50,73 @@ class AtlasConnectorService:
                 "Atlas connector is not used, because no expected annotations"
             )
             return status
-        status.is_enabled = cls.is_atlas_connector_enabled()
-        if not status.is_enabled:
+        try:
+            atlas_config_dto = KubernetesService.get_atlas_config()
+        except ApiException as e:
+            if e.status != HTTP_STATUS_NOT_FOUND:
+                raise
             logging.info(
                 "Atlas connector is not enabled, because no expected "
                 "configmap: %s",
                 specifications.CONFIGMAP_NAME,
             )
             return status
-        atlas_config_dto = KubernetesService.get_atlas_config()
+        except AtlasConfigMapException as e:
+            logging.warning("Atlas connector is not enabled: %s", e)
+            return status
+        status.is_enabled = True
         atlas_ms_dto = AtlasMicroserviceDtoFactory.dto_from_annotations(
             cluster_dns=atlas_config_dto.cluster_dns,
             namespace=namespace,
             annotations=annotations,
         )
-        try:
-            cls.update_microservice(atlas_config_dto, atlas_ms_dto)
-        except InfrastructureServiceProblem as e:
-            logging.error(
-                "Problem with infrastructure, some changes may not be applied",
-                exc_info=e,
-            )
-            status.exception = e
+        update = AtlasUpdate(
+            atlas_config_dto=atlas_config_dto,
+            atlas_ms_dto=atlas_ms_dto,
+            ms_hash=generate_hash(
+                atlas_config_dto.atlas_url, str(atlas_ms_dto)
+            ),
+        )
+        with cls._sent_hashes_lock:
+            if cls._sent_hashes.get(update.key) == update.ms_hash:
+                cls._sent_hashes.move_to_end(update.key)
+                logging.debug(
+                    "Microservice %s is not changed since it was sent to "
+                    "Atlas",
+                    atlas_ms_dto.ms_name,
+                )
+                return status
+        # Atlas is updated in background, so pod handler does not wait
+        # for Atlas.
+        atlas_update_buffer.put(update)
         return status
 
+    @classmethod
+    def send_update(cls, update: AtlasUpdate):
+        cls.update_microservice(update.atlas_config_dto, update.atlas_ms_dto)
+
+    @classmethod
+    def on_update_sent(cls, update: AtlasUpdate):
+        with cls._sent_hashes_lock:
+            cls._sent_hashes[update.key] = update.ms_hash
+            cls._sent_hashes.move_to_end(update.key)
+            while (
+                len(cls._sent_hashes)
+                > operator_settings.ATLAS_SENT_HASHES_MAX_SIZE
+            ):
+                cls._sent_hashes.popitem(last=False)
+
+    @classmethod
+    def on_configmap_change(cls, name: str, configmap: Optional[dict]):
+        """
+        Microservices are sent to Atlas again on next pod events after
+        Atlas connector configmap is changed.
+        """
+        if name != specifications.CONFIGMAP_NAME:
+            return
+        with cls._sent_hashes_lock:
+            cls._sent_hashes.clear()
+
     @classmethod
     def update_microservice(
         cls,
@@ -80,3 +132,15 @@ class AtlasConnectorService:
             atlas_url=atlas_config_dto.atlas_url, atlas_token=atlas_token
         )
         atlas_service.update_microservice(atlas_microservice_dto=atlas_ms_dto)
+
+
+atlas_update_buffer = AtlasUpdateBuffer(
+    send=AtlasConnectorService.send_update,
+    on_sent=AtlasConnectorService.on_update_sent,
+    batch_size=operator_settings.ATLAS_BATCH_SIZE,
+    flush_interval=operator_settings.ATLAS_FLUSH_INTERVAL,
+    workers=operator_settings.ATLAS_WORKERS,
+    max_retries=operator_settings.ATLAS_MAX_RETRIES,
+    retry_delay=operator_settings.ATLAS_RETRY_DELAY,
+    max_retry_delay=operator_settings.ATLAS_MAX_RETRY_DELAY,
+)
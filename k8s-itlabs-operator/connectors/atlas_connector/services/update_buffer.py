@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from connectors.atlas_connector.dto import AtlasUpdate
+from observability.metrics.metrics import (
+    app_atlas_buffer_size,
+    app_atlas_updates_total,
+)
+
+logger = logging.getLogger("atlas_connector")
+
+
+class AtlasUpdateBuffer:
+    """
+    Buffer of microservices updates sent to Atlas in background.
+
+    Only the latest update of every microservice is kept, superseded
+    updates are dropped. Updates are flushed by batches when batch is full
+    or flush interval is passed, updates of batch are sent concurrently by
+    limited number of workers. Failed update is retried with exponential
+    backoff until max retries, unless it is superseded meanwhile.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[AtlasUpdate], None],
+        on_sent: Optional[Callable[[AtlasUpdate], None]] = None,
+        batch_size: int = 20,
+        flush_interval: float = 1,
+        workers: int = 4,
+        max_retries: int = 5,
+        retry_delay: float = 2,
+        max_retry_delay: float = 60,
+    ):
+        self.send = send
+        self.on_sent = on_sent
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._pending: Dict[Tuple[str, str], AtlasUpdate] = {}
+        self._flush_at = 0.0
+        self._condition = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def size(self) -> int:
+        return len(self._pending)
+
+    def put(self, update: AtlasUpdate) -> bool:
+        """
+        Returns whether update is buffered, update that equals to pending
+        update of microservice is skipped.
+        """
+        with self._condition:
+            if self._stopped:
+                logger.warning(
+                    "[%s] Atlas update is not buffered, buffer is stopped",
+                    update.atlas_ms_dto.ms_name,
+                )
+                return False
+            pending = self._pending.get(update.key)
+            if pending is not None:
+                if pending.ms_hash == update.ms_hash:
+                    return False
+                app_atlas_updates_total.labels(status="superseded").inc()
+            elif not self._pending:
+                self._flush_at = time.monotonic() + self.flush_interval
+            self._pending[update.key] = update
+            app_atlas_buffer_size.set(len(self._pending))
+            self._start()
+            self._condition.notify()
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops buffer after updates ready to send are flushed, updates
+        waiting for retry are dropped. Returns whether buffer is flushed
+        in timeout.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+        is_flushed = not (self._thread and self._thread.is_alive())
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=not is_flushed)
+        with self._condition:
+            if is_flushed and self._pending:
+                logger.warning(
+                    "Atlas update buffer is stopped, %d updates waiting for "
+                    "retry are dropped",
+                    len(self._pending),
+                )
+        return is_flushed
+
+    def _start(self):
+        if self._thread:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="atlas-sender"
+        )
+        self._thread = threading.Thread(
+            target=self._flush, name="atlas-buffer", daemon=True
+        )
+        self._thread.start()
+
+    def _next_batch(self) -> Optional[List[AtlasUpdate]]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                ready = [
+                    update
+                    for update in self._pending.values()
+                    if update.ready_at <= now
+                ]
+                if len(ready) >= self.batch_size or (
+                    ready and (self._flush_at <= now or self._stopped)
+                ):
+                    batch = ready[: self.batch_size]
+                    for update in batch:
+                        del self._pending[update.key]
+                    app_atlas_buffer_size.set(len(self._pending))
+                    self._flush_at = now + self.flush_interval
+                    return batch
+                if self._stopped:
+                    return None
+
+                wake_times = [
+                    update.ready_at
+                    for update in self._pending.values()
+                    if update.ready_at > now
+                ]
+                if ready:
+                    wake_times.append(self._flush_at)
+                timeout = max(min(wake_times) - now, 0) if wake_times else None
+                self._condition.wait(timeout)
+
+    def _flush(self):
+        while (batch := self._next_batch()) is not None:
+            errors = list(self._executor.map(self._send, batch))
+            for update, error in zip(batch, errors):
+                self._done(update, error)
+
+    def _send(self, update: AtlasUpdate) -> Optional[Exception]:
+        update.attempts += 1
+        try:
+            self.send(update)
+        except Exception as e:
+            return e
+        return None
+
+    def _done(self, update: AtlasUpdate, error: Optional[Exception]):
+        if error is None:
+            app_atlas_updates_total.labels(status="success").inc()
+            if self.on_sent:
+                try:
+                    self.on_sent(update)
+                except Exception:
+                    logger.exception("Atlas update callback failed")
+            return
+
+        with self._condition:
+            if update.key in self._pending:
+                logger.info(
+                    "[%s] Failed Atlas update is superseded: %s",
+                    update.atlas_ms_dto.ms_name,
+                    error,
+                )
+                app_atlas_updates_total.labels(status="superseded").inc()
+                return
+            if update.attempts > self.max_retries or self._stopped:
+                logger.error(
+                    "[%s] Atlas update failed",
+                    update.atlas_ms_dto.ms_name,
+                    exc_info=error,
+                )
+                app_atlas_updates_total.labels(status="failure").inc()
+                return
+            delay = min(
+                self.retry_delay * 2 ** (update.attempts - 1),
+                self.max_retry_delay,
+            )
+            logger.warning(
+                "[%s] Atlas update attempt %d failed, retry in %s seconds: %s",
+                update.atlas_ms_dto.ms_name,
+                update.attempts,
+                delay,
+                error,
+            )
+            app_atlas_updates_total.labels(status="retry").inc()
+            update.ready_at = time.monotonic() + delay
+            if not self._pending:
+                self._flush_at = update.ready_at
+            self._pending[update.key] = update
+            app_atlas_buffer_size.set(len(self._pending))
+            self._condition.notify()
@@ -7,6 +7,9 @@ ATLAS_MICROSERVICE_NAME_ANNOTATION = (
 )
 ATLAS_BUSINESS_NAME_ANNOTATION = "atlas.connector.itlabs.io/business-name"
 
+# Annotations of pod, that are sent to Atlas
+ATLAS_ANNOTATION_PREFIXES = ("ci.itlabs.io/", "atlas.connector.itlabs.io/")
+
 ATLAS_CON_REQUIRED_ANNOTATION_NAMES = (
     ATLAS_MICROSERVICE_NAME_ANNOTATION,
     ANNOTATION_CI_PROJECT_ID,
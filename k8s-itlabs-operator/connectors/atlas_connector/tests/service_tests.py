@@ -1,25 +1,132 @@
+from collections import OrderedDict
+
 import pytest
 from clients.k8s.tests.mocks import KubernetesClientMocker
 from connectors.atlas_connector import specifications
-from connectors.atlas_connector.dto import AtlasConfigDto
+from connectors.atlas_connector.dto import (
+    AtlasConfigDto,
+    AtlasConnectorAnnotations,
+    AtlasUpdate,
+)
+from connectors.atlas_connector.exceptions import AtlasConfigMapException
 from connectors.atlas_connector.services.atlas_connector import (
     AtlasConnectorService,
+    atlas_update_buffer,
 )
 from connectors.atlas_connector.services.kubernetes import KubernetesService
 from connectors.atlas_connector.tests.mocks import KubernetesServiceMocker
+from exceptions import InfrastructureServiceProblem
+from kubernetes.client import ApiException
+
+
+@pytest.fixture
+def update_microservice(mocker):
+    KubernetesServiceMocker.mock_get_atlas_config(
+        mocker,
+        AtlasConfigDto(
+            atlas_url="https://atlas.local",
+            vault_path="vault:secret/data/atlas",
+            cluster_dns="cluster.local",
+        ),
+    )
+    mocker.patch.object(AtlasConnectorService, "_sent_hashes", OrderedDict())
+
+    def send_immediately(update: AtlasUpdate):
+        try:
+            AtlasConnectorService.send_update(update)
+        except InfrastructureServiceProblem:
+            return
+        AtlasConnectorService.on_update_sent(update)
+
+    mocker.patch.object(
+        atlas_update_buffer, "put", side_effect=send_immediately
+    )
+    return mocker.patch.object(AtlasConnectorService, "update_microservice")
+
+
+def atlas_annotations(**annotations) -> AtlasConnectorAnnotations:
+    return AtlasConnectorAnnotations(
+        {
+            specifications.ATLAS_MICROSERVICE_NAME_ANNOTATION: "app",
+            specifications.ANNOTATION_CI_PROJECT_ID: "1",
+            **annotations,
+        }
+    )
 
 
 @pytest.mark.unit
 class TestAtlasConnectorService:
-    def test_is_atlas_connector_enabled_success(self, mocker):
-        KubernetesServiceMocker.mock_get_atlas_config(mocker)
-        is_enabled = AtlasConnectorService.is_atlas_connector_enabled()
-        assert is_enabled
-
-    def test_is_atlas_connector_enabled_not(self, mocker):
-        KubernetesServiceMocker.mock_get_atlas_config(mocker, err=Exception())
-        is_enabled = AtlasConnectorService.is_atlas_connector_enabled()
-        assert not is_enabled
+    def test_on_upsert_pod_unchanged_not_sent(self, update_microservice):
+        for _ in range(2):
+            status = AtlasConnectorService.on_upsert_pod(
+                "default", atlas_annotations()
+            )
+            assert status.is_enabled
+        AtlasConnectorService.on_upsert_pod("other", atlas_annotations())
+        assert update_microservice.call_count == 2
+
+    def test_on_upsert_pod_changed_sent(self, update_microservice):
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        AtlasConnectorService.on_upsert_pod(
+            "default",
+            atlas_annotations(
+                **{specifications.ATLAS_BUSINESS_NAME_ANNOTATION: "Billing"}
+            ),
+        )
+        assert update_microservice.call_count == 2
+
+    def test_on_upsert_pod_failed_sent_again(self, update_microservice):
+        update_microservice.side_effect = [
+            InfrastructureServiceProblem("Atlas", Exception()),
+            None,
+        ]
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        assert update_microservice.call_count == 2
+
+    def test_sent_again_after_configmap_change(self, update_microservice):
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        AtlasConnectorService.on_configmap_change("other", None)
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        AtlasConnectorService.on_configmap_change(
+            specifications.CONFIGMAP_NAME, None
+        )
+        AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
+        assert update_microservice.call_count == 2
+
+    def test_least_recently_sent_dropped(self, mocker, update_microservice):
+        mocker.patch("settings.ATLAS_SENT_HASHES_MAX_SIZE", 2)
+        for namespace in ("first", "second", "first", "third", "first"):
+            AtlasConnectorService.on_upsert_pod(namespace, atlas_annotations())
+        assert list(AtlasConnectorService._sent_hashes) == [
+            ("third", "app"),
+            ("first", "app"),
+        ]
+        assert update_microservice.call_count == 3
+
+    @pytest.mark.parametrize(
+        "err",
+        [ApiException(status=404), AtlasConfigMapException()],
+    )
+    def test_on_upsert_pod_without_config_not_enabled(
+        self, mocker, update_microservice, err
+    ):
+        KubernetesServiceMocker.mock_get_atlas_config(mocker, err=err)
+        status = AtlasConnectorService.on_upsert_pod(
+            "default", atlas_annotations()
+        )
+        assert status.is_used
+        assert not status.is_enabled
+        update_microservice.assert_not_called()
+
+    def test_on_upsert_pod_config_error_raised(
+        self, mocker, update_microservice
+    ):
+        KubernetesServiceMocker.mock_get_atlas_config(
+            mocker, err=ApiException(status=403)
+        )
+        with pytest.raises(ApiException):
+            AtlasConnectorService.on_upsert_pod("default", atlas_annotations())
 
 
 @pytest.mark.unit
@@ -0,0 +1,148 @@
+import threading
+from typing import Optional
+
+import pytest
+from connectors.atlas_connector.dto import (
+    AtlasConfigDto,
+    AtlasMicroserviceDto,
+    AtlasUpdate,
+)
+from connectors.atlas_connector.services.update_buffer import (
+    AtlasUpdateBuffer,
+)
+
+WAIT_TIMEOUT = 5
+
+
+def atlas_update(ms_name: str, ms_hash: str = "1") -> AtlasUpdate:
+    return AtlasUpdate(
+        atlas_config_dto=AtlasConfigDto(
+            atlas_url="https://atlas.local",
+            vault_path="vault:secret/data/atlas",
+            cluster_dns="cluster.local",
+        ),
+        atlas_ms_dto=AtlasMicroserviceDto(
+            cluster_dns="cluster.local",
+            namespace="default",
+            ms_name=ms_name,
+            gitlab_project_id=1,
+        ),
+        ms_hash=ms_hash,
+    )
+
+
+class Recorder:
+    def __init__(self, expected: int, errors: Optional[dict] = None):
+        self.sent = []
+        # Number of failed attempts by microservice name.
+        self.errors = errors or {}
+        self.done = threading.Semaphore(0)
+        self.expected = expected
+        self._lock = threading.Lock()
+
+    def send(self, update: AtlasUpdate):
+        with self._lock:
+            ms_name = update.atlas_ms_dto.ms_name
+            if self.errors.get(ms_name):
+                self.errors[ms_name] -= 1
+                raise Exception("Atlas is unavailable")
+
+    def on_sent(self, update: AtlasUpdate):
+        self.sent.append((update.atlas_ms_dto.ms_name, update.ms_hash))
+        self.done.release()
+
+    def wait(self) -> bool:
+        return all(
+            self.done.acquire(timeout=WAIT_TIMEOUT)
+            for _ in range(self.expected)
+        )
+
+
+@pytest.fixture
+def create_buffer():
+    buffers = []
+
+    def create(recorder: Recorder, **kwargs) -> AtlasUpdateBuffer:
+        kwargs.setdefault("flush_interval", 0.01)
+        buffer = AtlasUpdateBuffer(
+            send=recorder.send,
+            on_sent=recorder.on_sent,
+            retry_delay=0,
+            **kwargs,
+        )
+        buffers.append(buffer)
+        return buffer
+
+    yield create
+    for buffer in buffers:
+        buffer.stop()
+
+
+@pytest.mark.unit
+class TestAtlasUpdateBuffer:
+    def test_updates_sent(self, create_buffer):
+        recorder = Recorder(expected=3)
+        buffer = create_buffer(recorder)
+        for ms_name in ("first", "second", "third"):
+            assert buffer.put(atlas_update(ms_name))
+        assert recorder.wait()
+        assert sorted(recorder.sent) == [
+            ("first", "1"),
+            ("second", "1"),
+            ("third", "1"),
+        ]
+
+    def test_superseded_update_dropped(self, create_buffer):
+        recorder = Recorder(expected=1)
+        buffer = create_buffer(recorder, flush_interval=0.2)
+        assert buffer.put(atlas_update("app", "1"))
+        assert not buffer.put(atlas_update("app", "1"))
+        assert buffer.put(atlas_update("app", "2"))
+        assert recorder.wait()
+        assert recorder.sent == [("app", "2")]
+        assert buffer.size == 0
+
+    def test_full_batch_flushed_without_interval(self, create_buffer):
+        recorder = Recorder(expected=2)
+        buffer = create_buffer(recorder, batch_size=2, flush_interval=60)
+        buffer.put(atlas_update("first"))
+        buffer.put(atlas_update("second"))
+        assert recorder.wait()
+
+    def test_failed_update_retried(self, create_buffer):
+        recorder = Recorder(expected=1, errors={"app": 2})
+        buffer = create_buffer(recorder, max_retries=2)
+        buffer.put(atlas_update("app"))
+        assert recorder.wait()
+        assert recorder.sent == [("app", "1")]
+
+    def test_failed_update_dropped_after_max_retries(self, create_buffer):
+        recorder = Recorder(expected=1, errors={"failed": 2})
+        buffer = create_buffer(recorder, max_retries=1)
+        buffer.put(atlas_update("failed"))
+        buffer.put(atlas_update("other"))
+        assert recorder.wait()
+        assert recorder.sent == [("other", "1")]
+
+    def test_pending_updates_flushed_on_stop(self, create_buffer):
+        recorder = Recorder(expected=2)
+        buffer = create_buffer(recorder, flush_interval=60)
+        buffer.put(atlas_update("first"))
+        buffer.put(atlas_update("second"))
+        assert buffer.stop(timeout=WAIT_TIMEOUT)
+        assert sorted(recorder.sent) == [("first", "1"), ("second", "1")]
+        assert buffer.size == 0
+
+    def test_failed_update_not_retried_after_stop(self, create_buffer):
+        recorder = Recorder(expected=0, errors={"failed": 1})
+        buffer = create_buffer(recorder, flush_interval=60, max_retries=2)
+        buffer.put(atlas_update("failed"))
+        assert buffer.stop(timeout=WAIT_TIMEOUT)
+        assert recorder.sent == []
+        assert buffer.size == 0
+
+    def test_update_not_buffered_after_stop(self, create_buffer):
+        buffer = create_buffer(Recorder(expected=0))
+        buffer.stop()
+        assert not buffer.put(atlas_update("app"))
+        assert buffer.size == 0
@@ -7,6 +7,7 @@ class KeycloakConnector:
     realm: str
     username: str
     password: str
+    resource_version: str | None = None
 
 
 @dataclass
@@ -60,6 +60,7 @@ class KeycloakConnectorFactory:
             realm=kk_connector_crd.spec.realm,
             username=kk_connector_crd.spec.username,
             password=kk_connector_crd.spec.password,
+            resource_version=kk_connector_crd.metadata.resource_version,
         )
 
 
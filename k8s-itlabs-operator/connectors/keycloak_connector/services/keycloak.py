@@ -4,6 +4,7 @@ from connectors.keycloak_connector.dto import (
     KeycloakConnectorMicroserviceDto,
     KeycloakMsSecretDto,
 )
+from utils.passgen import generate_password
 
 
 class KeycloakService:
@@ -17,8 +18,18 @@ class KeycloakService:
     def configure_kk(
         self, config: KeycloakConnectorMicroserviceDto
     ) -> KeycloakMsSecretDto:
-        data = ClientDto(client_id=config.client_id, name=config.client_id)
-        self._client.create_client(data)
+        data = ClientDto(
+            client_id=config.client_id,
+            name=config.client_id,
+            secret=generate_password(),
+        )
+        created_client = self._client.create_client(data)
+        if created_client.id is not None:
+            # Keycloak keeps secret of confidential client set on creation.
+            return KeycloakMsSecretDto(
+                client_id=created_client.client_id,
+                secret=created_client.secret,
+            )
 
         created_client = self._client.get_client(config.client_id)
         created_secret = self._client.generate_secret(created_client.id)
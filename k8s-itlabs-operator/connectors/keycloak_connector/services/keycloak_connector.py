@@ -2,7 +2,10 @@ import logging
 from itertools import chain
 
 from connectors.keycloak_connector import specifications
-from connectors.keycloak_connector.dto import KeycloakConnectorMicroserviceDto
+from connectors.keycloak_connector.dto import (
+    KeycloakConnector,
+    KeycloakConnectorMicroserviceDto,
+)
 from connectors.keycloak_connector.exceptions import (
     KeycloakConnectorCrdDoesNotExist,
     NonExistSecretForKeycloakConnector,
@@ -14,6 +17,7 @@ from connectors.keycloak_connector.services.kubernetes import KubernetesService
 from connectors.keycloak_connector.services.vault import VaultService
 from utils.concurrency import ConnectorSourceLock
 from utils.hashing import generate_hash
+from utils.provisioning import provisioned_cache
 
 
 class KeycloakConnectorService:
@@ -45,7 +49,18 @@ class KeycloakConnectorService:
                 f"Keycloak Custom Resource `{ms_kk_conn.keycloak_instance_name}`"
                 " does not exist"
             )
+        provisioned_cache.provision(
+            connector_type="keycloak_connector",
+            key=generate_hash(str(ms_kk_conn)),
+            resource_version=kk_connector.resource_version,
+            func=lambda: self._provision(ms_kk_conn, kk_connector),
+        )
 
+    def _provision(
+        self,
+        ms_kk_conn: KeycloakConnectorMicroserviceDto,
+        kk_connector: KeycloakConnector,
+    ):
         kk_api_cred = self.vault_service.unvault_keycloak_connector(
             kk_connector
         )
@@ -67,7 +82,7 @@ class KeycloakConnectorService:
             realm=kk_api_cred.realm,
             client_id=ms_kk_conn.client_id,
         )
-        with ConnectorSourceLock(source_hash):
+        with ConnectorSourceLock(source_hash) as source_lock:
             if kk_ms_cred and kk_service.is_kk_client_exist(
                 client_id=ms_kk_conn.client_id
             ):
@@ -75,6 +90,7 @@ class KeycloakConnectorService:
                 return
 
             kk_ms_cred = kk_service.configure_kk(ms_kk_conn)
+            source_lock.ensure_held()
             self.vault_service.create_kk_ms_secret(
                 ms_kk_conn.vault_path, kk_ms_cred
             )
@@ -1,8 +1,13 @@
 import pytest
+from clients.keycloak.client import KeycloakClient
+from clients.keycloak.tests.mocks import FakeKeycloakServer
+from clients.keycloak.token_cache import KeycloakTokenCache
 from clients.vault.tests.mocks import MockedVaultClient
+from connectors.keycloak_connector.dto import KeycloakConnectorMicroserviceDto
 from connectors.keycloak_connector.factories.dto_factory import (
     KeycloakConnectorMicroserviceDtoFactory,
 )
+from connectors.keycloak_connector.services.keycloak import KeycloakService
 from connectors.keycloak_connector.services.validation import (
     KeycloakConnectorApplicationError,
     KeycloakConnectorValidationService,
@@ -71,3 +76,47 @@ class TestKeycloakConnectorValidationService:
             )
             in errors
         )
+
+
+@pytest.fixture(params=[True, False], ids=["location", "no-location"])
+def keycloak(request, mocker):
+    mocker.patch.object(KeycloakTokenCache, "_tokens", {})
+    server = FakeKeycloakServer(send_location=request.param)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.unit
+class TestKeycloakService:
+    def test_configure_kk(self, keycloak):
+        service = KeycloakService(
+            KeycloakClient(keycloak.url, "test", "admin", "password")
+        )
+        config = KeycloakConnectorMicroserviceDto(
+            keycloak_instance_name="keycloak",
+            vault_path="vault:secret/data/app/keycloak-credentials",
+            client_id="app",
+        )
+        secret = service.configure_kk(config)
+
+        (client,) = keycloak.clients.values()
+        assert secret.client_id == client["clientId"] == "app"
+        assert secret.secret == client["secret"]
+        admin_requests = [
+            request for request in keycloak.requests if "/admin/" in request[1]
+        ]
+        if keycloak.send_location:
+            assert admin_requests == [
+                ("POST", "/admin/realms/test/clients"),
+            ]
+        else:
+            assert admin_requests == [
+                ("POST", "/admin/realms/test/clients"),
+                ("GET", "/admin/realms/test/clients?clientId=app"),
+                (
+                    "POST",
+                    f"/admin/realms/test/clients/{client['id']}/client-secret",
+                ),
+            ]
+        assert service.is_kk_client_exist("app")
@@ -1,8 +1,11 @@
+from clients.k8s.k8s_client import KubernetesClient
 from connectors.monitoring_connector.service import KubernetesService
-from kubernetes import client
 
 
 class KubernetesServiceFactory:
     @classmethod
     def create_kubernetes_service(cls) -> KubernetesService:
-        return KubernetesService(k8s_api_client=client.ApiClient())
+        return KubernetesService(
+            k8s_api_client=KubernetesClient.api_client(),
+            crd_client=KubernetesClient.dynamic_client(),
+        )
@@ -1,11 +1,17 @@
 import http
+import json
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from connectors.monitoring_connector import specifications
 from connectors.monitoring_connector.dto import (
     MonitoringConnectorMicroserviceDto,
 )
+from connectors.monitoring_connector.factories.dto_factory import (
+    MonitoringConnectorMicroserviceDtoFactory,
+)
 from connectors.monitoring_connector.specifications import (
     MONITORING_ENABLED_LABEL_NAME,
     MONITORING_ENABLED_VALUE,
@@ -15,13 +21,19 @@ from kubernetes.client import ApiException
 from kubernetes.dynamic import ResourceList
 from kubernetes.dynamic.exceptions import ResourceNotFoundError
 from utils.common import strtobool
+from utils.hashing import generate_hash
+from utils.watching import core_selectors, is_namespace_watched
 
 logger = logging.getLogger("servicemonitorconnector")
 
 
 class KubernetesService:
-    def __init__(self, k8s_api_client: client.ApiClient):
-        self.crd_client = dynamic.DynamicClient(k8s_api_client)
+    def __init__(
+        self,
+        k8s_api_client: client.ApiClient,
+        crd_client: Optional[dynamic.DynamicClient] = None,
+    ):
+        self.crd_client = crd_client or dynamic.DynamicClient(k8s_api_client)
         self._sm_resource = None
 
     @property
@@ -104,6 +116,55 @@ class KubernetesService:
             )
         return bool(self.service_monitor_api_resource)
 
+    def list_service_monitors(
+        self, label_selector: str, field_selector: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Returns ServiceMonitors of all namespaces selected by labels and
+        fields.
+        """
+        if not self.service_monitor_api_resource:
+            return []
+        service_monitors = self.crd_client.get(
+            resource=self.service_monitor_api_resource,
+            label_selector=label_selector,
+            field_selector=field_selector,
+        )
+        return [sm.to_dict() for sm in service_monitors.items]
+
+    def list_services(
+        self,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Returns Services of all namespaces selected by labels and fields.
+        """
+        resource = self.crd_client.resources.get(
+            api_version="v1", kind="Service"
+        )
+        services = self.crd_client.get(
+            resource,
+            label_selector=label_selector,
+            field_selector=field_selector,
+        )
+        return [svc.to_dict() for svc in services.items]
+
+    def apply_service_monitor(self, namespace: str, body: dict) -> bool:
+        """
+        Creates or updates ServiceMonitor by one server-side apply request.
+        """
+        if not self.service_monitor_api_resource:
+            return False
+        self.crd_client.server_side_apply(
+            resource=self.service_monitor_api_resource,
+            body=body,
+            namespace=namespace,
+            field_manager=specifications.SERVICE_MONITOR_FIELD_MANAGER,
+            force_conflicts=True,
+        )
+        return True
+
     def delete_service_monitor(self, namespace: str, name: str):
         if not self.service_monitor_api_resource:
             return
@@ -123,7 +184,43 @@ class KubernetesService:
                 )
 
 
+def owned_fields(value, template):
+    """
+    Returns part of value with only keys of template, items of list are
+    filtered by the first item of template list.
+    """
+    if isinstance(template, dict) and isinstance(value, dict):
+        return {
+            key: owned_fields(value[key], template[key])
+            for key in template
+            if key in value
+        }
+    if isinstance(template, list) and isinstance(value, list) and template:
+        return [owned_fields(item, template[0]) for item in value]
+    return value
+
+
+# Structure of ServiceMonitors set by operator, that is the same for all
+# Services.
+SERVICE_MONITOR_TEMPLATE = KubernetesService.get_servicemonitor_dict(
+    MonitoringConnectorMicroserviceDto(metric_path="", interval=""),
+    service_name="",
+    namespace="",
+)
+
+
 class MonitoringConnectorService:
+    # Index of ServiceMonitors owned by operator: hashes by namespace and
+    # name, so ServiceMonitor is applied only when it is changed. After
+    # index is synced, ServiceMonitors absent from index are known to be
+    # absent without requests to apiserver. Index is rebuilt by periodic
+    # resync, so ServiceMonitors changed by others are applied again.
+    _applied_hashes: Dict[Tuple[str, str], str] = {}
+    _applied_hashes_lock = threading.Lock()
+    _is_index_synced = False
+    _resync: Optional[threading.Thread] = None
+    _resync_stopped = threading.Event()
+
     def __init__(self, kubernetes_service: KubernetesService):
         self.kubernetes_service = kubernetes_service
 
@@ -138,21 +235,32 @@ class MonitoringConnectorService:
             service_name=service_name,
             namespace=namespace,
         )
+        key = (namespace, service_name)
+        sm_hash = self.service_monitor_hash(service_monitor_dict)
+        with self._applied_hashes_lock:
+            if self._applied_hashes.get(key) == sm_hash:
+                return True
 
-        sm = self.kubernetes_service.get_service_monitor(
-            namespace=namespace, name=service_name
-        )
-        if sm is not None:
-            self.kubernetes_service.delete_service_monitor(
-                namespace=namespace, name=service_name
-            )
-
-        return self.kubernetes_service.create_service_monitor(
+        applied = self.kubernetes_service.apply_service_monitor(
             namespace=namespace, body=service_monitor_dict
         )
+        if applied:
+            with self._applied_hashes_lock:
+                self._applied_hashes[key] = sm_hash
+        return applied
 
     def delete_service_monitor(self, namespace: str, service_name: str):
         """connector can delete only own servicemonitors"""
+        with self._applied_hashes_lock:
+            sm_hash = self._applied_hashes.pop((namespace, service_name), None)
+        if self._is_index_synced:
+            # All own ServiceMonitors are indexed.
+            if sm_hash is not None:
+                self.kubernetes_service.delete_service_monitor(
+                    namespace=namespace, name=service_name
+                )
+            return
+
         sm = self.kubernetes_service.get_service_monitor(
             namespace=namespace, name=service_name
         )
@@ -168,6 +276,134 @@ class MonitoringConnectorService:
                 namespace=namespace, name=service_name
             )
 
+    def sync_service_monitors(self, workers: int):
+        """
+        Builds index of own ServiceMonitors by one list request, then
+        applies missing or changed ServiceMonitors of annotated Services
+        and deletes own ServiceMonitors of other Services concurrently.
+        Only Services and ServiceMonitors of watched namespaces are synced.
+        """
+        if not self.kubernetes_service.service_monitor_api_resource:
+            return
+        selectors = core_selectors("services")
+        label_selector = selectors.get("labelSelector")
+        field_selector = selectors.get("fieldSelector")
+        service_monitors = self.kubernetes_service.list_service_monitors(
+            label_selector=(
+                f"{MONITORING_ENABLED_LABEL_NAME}={MONITORING_ENABLED_VALUE}"
+            ),
+            field_selector=field_selector,
+        )
+        index = {
+            (sm["metadata"]["namespace"], sm["metadata"]["name"]): (
+                self.service_monitor_hash(sm)
+            )
+            for sm in service_monitors
+            if is_namespace_watched(sm["metadata"]["namespace"])
+        }
+        with self._applied_hashes_lock:
+            MonitoringConnectorService._applied_hashes = dict(index)
+            MonitoringConnectorService._is_index_synced = True
+
+        listed = set()
+        annotated = {}
+        for svc in self.kubernetes_service.list_services(
+            label_selector=label_selector, field_selector=field_selector
+        ):
+            metadata = svc["metadata"]
+            if not is_namespace_watched(metadata["namespace"]):
+                continue
+            key = (metadata["namespace"], metadata["name"])
+            listed.add(key)
+            annotations = metadata.get("annotations") or {}
+            if self.is_monitoring_connector_used_by_object(annotations):
+                annotated[key] = (
+                    MonitoringConnectorMicroserviceDtoFactory.dto_from_annotations(
+                        annotations
+                    )
+                )
+
+        orphans = index.keys() - annotated.keys()
+        if label_selector:
+            # Services without selected labels are not listed, though
+            # they exist, so only ServiceMonitors of listed Services are
+            # known to be orphans.
+            orphans &= listed
+
+        # Unchanged ServiceMonitors are skipped by index without requests.
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="servicemonitors-sync"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.create_service_monitor,
+                    ms_monitoring_con,
+                    name,
+                    namespace,
+                )
+                for (namespace, name), ms_monitoring_con in annotated.items()
+            ] + [
+                executor.submit(self.delete_service_monitor, namespace, name)
+                for namespace, name in orphans
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("ServiceMonitor is not synced: %s", e)
+        logger.info(
+            "ServiceMonitors are synced: %d indexed, %d annotated services",
+            len(index),
+            len(annotated),
+        )
+
+    def start_resync(self, interval: float, workers: int):
+        """
+        Starts background thread, that syncs ServiceMonitors every interval
+        seconds.
+        """
+        cls = MonitoringConnectorService
+        with cls._applied_hashes_lock:
+            if cls._resync is not None or not interval:
+                return
+            cls._resync_stopped = threading.Event()
+            cls._resync = threading.Thread(
+                target=self._resync_service_monitors,
+                args=(cls._resync_stopped, interval, workers),
+                name="servicemonitors-resync",
+                daemon=True,
+            )
+            cls._resync.start()
+
+    def _resync_service_monitors(
+        self, stopped: threading.Event, interval: float, workers: int
+    ):
+        while not stopped.wait(interval):
+            try:
+                self.sync_service_monitors(workers)
+            except Exception:
+                logger.exception("ServiceMonitors are not synced")
+
+    @classmethod
+    def stop_resync(cls):
+        with cls._applied_hashes_lock:
+            cls._resync_stopped.set()
+            cls._resync = None
+
+    @staticmethod
+    def service_monitor_hash(service_monitor: dict) -> str:
+        """
+        Returns hash of ServiceMonitor fields set by operator, so desired
+        and existing ServiceMonitors are compared. Labels and fields set by
+        other field managers or defaulted by apiserver are not hashed.
+        """
+        return generate_hash(
+            json.dumps(
+                owned_fields(service_monitor, SERVICE_MONITOR_TEMPLATE),
+                sort_keys=True,
+            )
+        )
+
     @staticmethod
     def is_monitoring_connector_used_by_object(annotations: dict):
         enabled = False
@@ -8,3 +8,6 @@ MONITORING_INTERVAL_NAME_ANNOTATION = "monitoring.connector.itlabs.io/interval"
 
 MONITORING_ENABLED_LABEL_NAME = "by-itlabs-operator"
 MONITORING_ENABLED_VALUE = "yes"
+
+# Field manager of ServiceMonitors applied by server-side apply
+SERVICE_MONITOR_FIELD_MANAGER = "k8s-itlabs-operator"
@@ -1,6 +1,71 @@
+import threading
+from typing import Optional
+
 import pytest
 from connectors.monitoring_connector import specifications
-from connectors.monitoring_connector.service import MonitoringConnectorService
+from connectors.monitoring_connector.dto import (
+    MonitoringConnectorMicroserviceDto,
+)
+from connectors.monitoring_connector.service import (
+    KubernetesService,
+    MonitoringConnectorService,
+)
+
+
+@pytest.fixture
+def kubernetes_service(mocker):
+    mocker.patch.object(MonitoringConnectorService, "_applied_hashes", {})
+    mocker.patch.object(MonitoringConnectorService, "_is_index_synced", False)
+    mocker.patch.object(MonitoringConnectorService, "_resync", None)
+    kubernetes_service = mocker.Mock(spec=KubernetesService)
+    kubernetes_service.get_servicemonitor_dict = (
+        KubernetesService.get_servicemonitor_dict
+    )
+    kubernetes_service.apply_service_monitor.return_value = True
+    kubernetes_service.get_service_monitor.return_value = None
+    kubernetes_service.list_service_monitors.return_value = []
+    kubernetes_service.list_services.return_value = []
+    return kubernetes_service
+
+
+def service(
+    name: str,
+    annotations: Optional[dict] = None,
+    namespace: str = "default",
+) -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "annotations": annotations,
+        }
+    }
+
+
+def service_monitor(
+    name: str, interval: str = "15s", namespace: str = "default"
+) -> dict:
+    sm = KubernetesService.get_servicemonitor_dict(
+        MonitoringConnectorMicroserviceDto(
+            metric_path="/metrics", interval=interval
+        ),
+        service_name=name,
+        namespace=namespace,
+    )
+    sm["metadata"]["uid"] = f"{name}-uid"
+    return sm
+
+
+def create_service_monitor(
+    service: MonitoringConnectorService, interval: str = "15s"
+) -> bool:
+    return service.create_service_monitor(
+        MonitoringConnectorMicroserviceDto(
+            metric_path="/metrics", interval=interval
+        ),
+        service_name="app",
+        namespace="default",
+    )
 
 
 @pytest.mark.unit
@@ -34,3 +99,187 @@ class TestMonitoringConnectorService:
             )
         )
         assert is_used
+
+    def test_create_service_monitor_applied_once(self, kubernetes_service):
+        service = MonitoringConnectorService(kubernetes_service)
+        assert create_service_monitor(service)
+        assert create_service_monitor(service)
+        assert kubernetes_service.apply_service_monitor.call_count == 1
+        assert kubernetes_service.get_service_monitor.call_count == 0
+
+    def test_create_service_monitor_changed(self, kubernetes_service):
+        service = MonitoringConnectorService(kubernetes_service)
+        create_service_monitor(service, interval="15s")
+        create_service_monitor(service, interval="30s")
+        assert kubernetes_service.apply_service_monitor.call_count == 2
+        body = kubernetes_service.apply_service_monitor.call_args.kwargs["body"]
+        assert body["spec"]["endpoints"][0]["interval"] == "30s"
+
+    def test_create_service_monitor_without_crd(self, kubernetes_service):
+        kubernetes_service.apply_service_monitor.return_value = False
+        service = MonitoringConnectorService(kubernetes_service)
+        assert not create_service_monitor(service)
+        assert not create_service_monitor(service)
+        assert kubernetes_service.apply_service_monitor.call_count == 2
+
+    def test_applied_again_after_deletion(self, kubernetes_service):
+        service = MonitoringConnectorService(kubernetes_service)
+        create_service_monitor(service)
+        service.delete_service_monitor("default", "app")
+        create_service_monitor(service)
+        assert kubernetes_service.apply_service_monitor.call_count == 2
+
+
+@pytest.mark.unit
+class TestSyncServiceMonitors:
+    def test_synced(self, kubernetes_service):
+        enabled = {specifications.MONITORING_ENABLED_NAME_ANNOTATION: "true"}
+        kubernetes_service.list_service_monitors.return_value = [
+            service_monitor("unchanged"),
+            service_monitor("stale", interval="30s"),
+            service_monitor("orphan"),
+        ]
+        kubernetes_service.list_services.return_value = [
+            service("unchanged", enabled),
+            service("stale", enabled),
+            service("missing", enabled),
+            service("not-annotated"),
+        ]
+        MonitoringConnectorService(kubernetes_service).sync_service_monitors(
+            workers=2
+        )
+
+        applied = sorted(
+            call.kwargs["body"]["metadata"]["name"]
+            for call in kubernetes_service.apply_service_monitor.call_args_list
+        )
+        assert applied == ["missing", "stale"]
+        kubernetes_service.delete_service_monitor.assert_called_once_with(
+            namespace="default", name="orphan"
+        )
+        assert kubernetes_service.get_service_monitor.call_count == 0
+
+    def test_fields_of_others_not_applied_again(self, kubernetes_service):
+        sm = service_monitor("app")
+        sm["metadata"]["labels"]["argocd.argoproj.io/instance"] = "app"
+        sm["metadata"]["resourceVersion"] = "1"
+        sm["spec"]["endpoints"][0]["scheme"] = "http"
+        sm["spec"]["sampleLimit"] = 0
+        kubernetes_service.list_service_monitors.return_value = [sm]
+        kubernetes_service.list_services.return_value = [
+            service(
+                "app",
+                {specifications.MONITORING_ENABLED_NAME_ANNOTATION: "true"},
+            )
+        ]
+        MonitoringConnectorService(kubernetes_service).sync_service_monitors(
+            workers=1
+        )
+        assert kubernetes_service.apply_service_monitor.call_count == 0
+
+    def test_index_used_by_handlers(self, kubernetes_service):
+        kubernetes_service.list_service_monitors.return_value = [
+            service_monitor("app")
+        ]
+        kubernetes_service.list_services.return_value = [
+            service(
+                "app",
+                {specifications.MONITORING_ENABLED_NAME_ANNOTATION: "true"},
+            )
+        ]
+        connector_service = MonitoringConnectorService(kubernetes_service)
+        connector_service.sync_service_monitors(workers=1)
+
+        assert create_service_monitor(connector_service)
+        connector_service.delete_service_monitor("default", "other")
+        assert kubernetes_service.apply_service_monitor.call_count == 0
+        assert kubernetes_service.get_service_monitor.call_count == 0
+        assert kubernetes_service.delete_service_monitor.call_count == 0
+
+        connector_service.delete_service_monitor("default", "app")
+        kubernetes_service.delete_service_monitor.assert_called_once_with(
+            namespace="default", name="app"
+        )
+
+    def test_synced_watched_only(self, mocker, kubernetes_service):
+        mocker.patch("settings.WATCH_SERVICES_LABEL_SELECTOR", "app")
+        mocker.patch("settings.WATCH_EXCLUDED_NAMESPACES", ["kube-system"])
+        mocker.patch("settings.WATCH_NAMESPACES", "!other")
+        enabled = {specifications.MONITORING_ENABLED_NAME_ANNOTATION: "true"}
+        kubernetes_service.list_service_monitors.return_value = [
+            service_monitor("not-annotated"),
+            service_monitor("not-selected"),
+            service_monitor("app", namespace="other"),
+        ]
+        kubernetes_service.list_services.return_value = [
+            service("not-annotated"),
+            service("app", enabled, namespace="other"),
+        ]
+        MonitoringConnectorService(kubernetes_service).sync_service_monitors(
+            workers=1
+        )
+
+        kubernetes_service.list_services.assert_called_once_with(
+            label_selector="app",
+            field_selector="metadata.namespace!=kube-system",
+        )
+        list_kwargs = kubernetes_service.list_service_monitors.call_args.kwargs
+        assert (
+            list_kwargs["field_selector"] == "metadata.namespace!=kube-system"
+        )
+        assert kubernetes_service.apply_service_monitor.call_count == 0
+        kubernetes_service.delete_service_monitor.assert_called_once_with(
+            namespace="default", name="not-annotated"
+        )
+        assert MonitoringConnectorService._applied_hashes.keys() == {
+            ("default", "not-selected")
+        }
+
+    def test_resync_restores_changed_by_others(self, kubernetes_service):
+        kubernetes_service.list_service_monitors.return_value = [
+            service_monitor("deleted"),
+            service_monitor("changed"),
+        ]
+        enabled = {specifications.MONITORING_ENABLED_NAME_ANNOTATION: "true"}
+        kubernetes_service.list_services.return_value = [
+            service("deleted", enabled),
+            service("changed", enabled),
+        ]
+        connector_service = MonitoringConnectorService(kubernetes_service)
+        connector_service.sync_service_monitors(workers=1)
+        assert kubernetes_service.apply_service_monitor.call_count == 0
+
+        kubernetes_service.list_service_monitors.return_value = [
+            service_monitor("changed", interval="30s")
+        ]
+        connector_service.sync_service_monitors(workers=1)
+
+        applied = sorted(
+            call.kwargs["body"]["metadata"]["name"]
+            for call in kubernetes_service.apply_service_monitor.call_args_list
+        )
+        assert applied == ["changed", "deleted"]
+
+    def test_resync_started_once(self, kubernetes_service):
+        synced = threading.Event()
+        kubernetes_service.list_service_monitors.side_effect = (
+            lambda **_: synced.set() or []
+        )
+        connector_service = MonitoringConnectorService(kubernetes_service)
+        connector_service.start_resync(interval=0.01, workers=1)
+        resync = MonitoringConnectorService._resync
+        connector_service.start_resync(interval=0.01, workers=1)
+        try:
+            assert MonitoringConnectorService._resync is resync
+            assert synced.wait(1)
+        finally:
+            MonitoringConnectorService.stop_resync()
+        resync.join(1)
+        assert not resync.is_alive()
+        assert MonitoringConnectorService._resync is None
+
+    def test_resync_disabled(self, kubernetes_service):
+        MonitoringConnectorService(kubernetes_service).start_resync(
+            interval=0, workers=1
+        )
+        assert MonitoringConnectorService._resync is None
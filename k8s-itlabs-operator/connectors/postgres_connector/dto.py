@@ -9,6 +9,7 @@ class PgConnector:
     username: str
     password: str
     readonly_username: str | None = None
+    resource_version: str | None = None
 
 
 @dataclass
@@ -27,6 +27,7 @@ class PgConnectorFactory:
             username=pg_con_crd.spec.username,
             password=pg_con_crd.spec.password,
             readonly_username=pg_con_crd.spec.readonly_username,
+            resource_version=pg_con_crd.metadata.resource_version,
         )
 
 
@@ -1,7 +1,8 @@
 import logging
 from abc import ABCMeta, abstractmethod
+from typing import Optional
 
-from clients.postgres.dto import PgConnectorDbSecretDto
+from clients.postgres.dto import PgConnectorDbSecretDto, PgDatabaseState
 from clients.postgres.postgresclient import AbstractPostgresClient
 
 logger = logging.getLogger("pg_connector_postgres_service")
@@ -11,7 +12,17 @@ class AbstractPostgresService:
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def create_database(self, db_cred: PgConnectorDbSecretDto):
+    def get_database_state(
+        self, db_name: str, username: str, readonly_username: Optional[str]
+    ) -> PgDatabaseState:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_database(
+        self,
+        db_cred: PgConnectorDbSecretDto,
+        state: Optional[PgDatabaseState] = None,
+    ):
         raise NotImplementedError
 
     @abstractmethod
@@ -31,27 +42,52 @@ class PostgresService(AbstractPostgresService):
     def __init__(self, pg_client: AbstractPostgresClient):
         self.pg_client = pg_client
 
-    def create_database(self, db_cred: PgConnectorDbSecretDto):
-        if self.pg_client.is_user_exist(user=db_cred.user):
-            self.pg_client.alter_user_password(
-                user=db_cred.user, password=db_cred.password
-            )
-            logger.warning(
-                "User '%s' already exist, password set from credentials.",
-                db_cred.user,
-            )
-        else:
-            self.pg_client.create_user(
-                user=db_cred.user, password=db_cred.password
-            )
-
-        if self.pg_client.is_database_exist(db_name=db_cred.db_name):
-            logger.warning("Database '%s' already exist.", db_cred.db_name)
-        else:
-            self.pg_client.create_database(
-                db_name=db_cred.db_name, user=db_cred.user
-            )
-        self.pg_client.grant_user_to_admin(user=db_cred.user)
+    def get_database_state(
+        self,
+        db_name: str,
+        username: str,
+        readonly_username: Optional[str] = None,
+    ) -> PgDatabaseState:
+        return self.pg_client.get_database_state(
+            db_name, username, readonly_username
+        )
+
+    def create_database(
+        self,
+        db_cred: PgConnectorDbSecretDto,
+        state: Optional[PgDatabaseState] = None,
+    ):
+        """
+        Executes only statements that are missing for database and user
+        from given (or read) state. Password of existing user is set from
+        credentials, so it matches Vault after drift of password.
+        """
+        if state is None:
+            state = self.get_database_state(db_cred.db_name, db_cred.user)
+
+        with self.pg_client.session():
+            if not state.user_exists:
+                self.pg_client.create_user(
+                    user=db_cred.user, password=db_cred.password
+                )
+            else:
+                self.pg_client.alter_user_password(
+                    user=db_cred.user, password=db_cred.password
+                )
+                logger.warning(
+                    "User '%s' already exist, password set from credentials.",
+                    db_cred.user,
+                )
+
+            if state.database_exists:
+                logger.info("Database '%s' already exist.", db_cred.db_name)
+            else:
+                self.pg_client.create_database(
+                    db_name=db_cred.db_name, user=db_cred.user
+                )
+
+            if not state.user_granted_to_admin:
+                self.pg_client.grant_user_to_admin(user=db_cred.user)
 
     def is_user_exist(self, username: str) -> bool:
         return self.pg_client.is_user_exist(username)
@@ -60,4 +96,5 @@ class PostgresService(AbstractPostgresService):
         return self.pg_client.is_user_grantee(database, username)
 
     def grant_access_on_select(self, grantor_name: str, grantee_name: str):
-        self.pg_client.grant_access_on_select(grantor_name, grantee_name)
+        with self.pg_client.session():
+            self.pg_client.grant_access_on_select(grantor_name, grantee_name)
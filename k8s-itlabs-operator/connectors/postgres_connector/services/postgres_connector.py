@@ -4,6 +4,7 @@ from itertools import chain
 from clients.postgres.dto import PgConnectorDbSecretDto
 from connectors.postgres_connector import specifications
 from connectors.postgres_connector.dto import (
+    PgConnector,
     PgConnectorInstanceSecretDto,
     PgConnectorMicroserviceDto,
 )
@@ -25,6 +26,7 @@ from connectors.postgres_connector.services.kubernetes import KubernetesService
 from connectors.postgres_connector.services.vault import AbstractVaultService
 from utils.concurrency import ConnectorSourceLock
 from utils.hashing import generate_hash
+from utils.provisioning import provisioned_cache
 
 
 class PostgresConnectorService:
@@ -40,7 +42,16 @@ class PostgresConnectorService:
                 f"Postgres Custom Resource `{ms_pg_con.pg_instance_name}`"
                 " does not exist"
             )
+        provisioned_cache.provision(
+            connector_type="postgres_connector",
+            key=generate_hash(str(ms_pg_con)),
+            resource_version=pg_connector.resource_version,
+            func=lambda: self._provision(ms_pg_con, pg_connector),
+        )
 
+    def _provision(
+        self, ms_pg_con: PgConnectorMicroserviceDto, pg_connector: PgConnector
+    ):
         pg_instance_cred = self.vault_service.unvault_pg_connector(pg_connector)
         if not pg_instance_cred:
             raise UnknownVaultPathInPgConnector(
@@ -54,11 +65,17 @@ class PostgresConnectorService:
             database=ms_pg_con.db_name,
             username=ms_pg_con.db_username,
         )
-        with ConnectorSourceLock(source_hash):
+        with ConnectorSourceLock(source_hash) as source_lock:
             db_creds = self.get_or_create_db_credentials(
                 pg_instance_cred, ms_pg_con
             )
-            pg_service.create_database(db_creds)
+            db_state = pg_service.get_database_state(
+                db_creds.db_name,
+                db_creds.user,
+                pg_instance_cred.readonly_username,
+            )
+            source_lock.ensure_held()
+            pg_service.create_database(db_creds, state=db_state)
 
             if ms_pg_con.grant_access_for_readonly_user:
                 if not pg_instance_cred.readonly_username:
@@ -67,9 +84,7 @@ class PostgresConnectorService:
                         f"{ms_pg_con.pg_instance_name}"
                     )
 
-                if not pg_service.is_user_exist(
-                    pg_instance_cred.readonly_username
-                ):
+                if not db_state.readonly_user_exists:
                     raise PgConnectorReadonlyUsernameDoesNotExist(
                         f"{pg_instance_cred.readonly_username} does not exist "
                         f"in {ms_pg_con.pg_instance_name}"
@@ -88,6 +103,7 @@ class PostgresConnectorService:
                 ):
                     return
 
+                source_lock.ensure_held()
                 pg_access_service.grant_access_on_select(
                     db_creds.user, pg_instance_cred.readonly_username
                 )
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from clients.postgres.dto import PgConnectorDbSecretDto
+from clients.postgres.dto import PgConnectorDbSecretDto, PgDatabaseState
 from connectors.postgres_connector.dto import (
     PgConnector,
     PgConnectorInstanceSecretDto,
@@ -51,7 +51,24 @@ class MockedPostgresService(AbstractPostgresService):
     def __init__(self):
         self.create_database_call_count = 0
 
-    def create_database(self, db_cred: PgConnectorDbSecretDto):
+    def get_database_state(
+        self,
+        db_name: str,
+        username: str,
+        readonly_username: Optional[str] = None,
+    ) -> PgDatabaseState:
+        return PgDatabaseState(
+            user_exists=True,
+            database_exists=True,
+            user_granted_to_admin=True,
+            readonly_user_exists=self.is_user_exist(readonly_username),
+        )
+
+    def create_database(
+        self,
+        db_cred: PgConnectorDbSecretDto,
+        state: Optional[PgDatabaseState] = None,
+    ):
         self.create_database_call_count += 1
 
     def is_user_exist(self, username: str) -> bool:
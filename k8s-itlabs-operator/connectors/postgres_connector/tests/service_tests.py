@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 from clients.postgres.dto import PgConnectorDbSecretDto
 from clients.postgres.tests.factories import PgConnectorDbSecretDtoTestFactory
@@ -168,6 +170,53 @@ class TestPostgresConnectorService:
         assert mocked_vault_service.create_pg_ms_credentials_call_count == 0
         assert mocked_pg_service.create_database_call_count == 1
 
+    def test_on_create_deployment_recently_provisioned(self, mocker):
+        pg_instance_cred: PgConnectorInstanceSecretDto = (
+            PgConnectorInstanceSecretDtoTestFactory()
+        )
+        ms_pg_con: PgConnectorMicroserviceDto = (
+            PgConnectorMicroserviceDtoTestFactory(
+                db_name=pg_instance_cred.db_name,
+                db_username=pg_instance_cred.user,
+            )
+        )
+        pg_connector = PgConnector(
+            host=pg_instance_cred.host,
+            port=pg_instance_cred.port,
+            database=ms_pg_con.db_name,
+            username=ms_pg_con.vault_path,
+            password=ms_pg_con.vault_path,
+            resource_version="1",
+        )
+        ms_pg_cred = PgConnectorDbSecretDtoFactory.dto_from_ms_pg_con(
+            pg_instance_cred=pg_instance_cred, ms_pg_con=ms_pg_con
+        )
+        kube_mocker = KubernetesServiceMocker.mock_get_pg_connector(
+            mocker, pg_connector
+        )
+        mocked_pg_service = MockedPostgresService()
+        PostgresServiceFactoryMocker.mock_create_pg_service(
+            mocker, mocked_pg_service
+        )
+        mocked_vault_service = MockedVaultService(
+            pg_instance_cred=pg_instance_cred, ms_pg_cred=ms_pg_cred
+        )
+        pg_con_service = PostgresConnectorService(
+            vault_service=mocked_vault_service
+        )
+        pg_con_service.on_create_deployment(ms_pg_con=ms_pg_con)
+        pg_con_service.on_create_deployment(ms_pg_con=ms_pg_con)
+        assert kube_mocker.call_count == 2
+        assert mocked_vault_service.get_pg_ms_credentials_call_count == 1
+        assert mocked_pg_service.create_database_call_count == 1
+
+        # Changed custom resource invalidates provisioned microservice
+        kube_mocker.return_value = dataclasses.replace(
+            pg_connector, resource_version="2"
+        )
+        pg_con_service.on_create_deployment(ms_pg_con=ms_pg_con)
+        assert mocked_pg_service.create_database_call_count == 2
+
     def test_mutate_containers_variables_already_in_container(self):
         ms_pg_con: PgConnectorMicroserviceDto = (
             PgConnectorMicroserviceDtoTestFactory()
@@ -257,6 +306,30 @@ class TestPostgresService:
         assert pg_service.pg_client.user_alter_password_call_count == 0
         assert pg_service.pg_client.grant_user_to_admin_call_count == 1
 
+    def test_create_database_fully_provisioned(self):
+        pg_client = MockedPostgresClient(
+            db_exist=True, user_exist=True, user_granted_to_admin=True
+        )
+        pg_service = PostgresService(pg_client=pg_client)
+        db_cred = PgConnectorDbSecretDtoTestFactory()
+        pg_service.create_database(db_cred=db_cred)
+        assert pg_service.pg_client.get_database_state_call_count == 1
+        assert pg_service.pg_client.db_create_call_count == 0
+        assert pg_service.pg_client.user_create_call_count == 0
+        assert pg_service.pg_client.user_alter_password_call_count == 1
+        assert pg_service.pg_client.grant_user_to_admin_call_count == 0
+
+    def test_create_database_with_passed_state(self):
+        pg_client = MockedPostgresClient(db_exist=False, user_exist=True)
+        pg_service = PostgresService(pg_client=pg_client)
+        db_cred = PgConnectorDbSecretDtoTestFactory()
+        state = pg_service.get_database_state(db_cred.db_name, db_cred.user)
+        pg_service.create_database(db_cred=db_cred, state=state)
+        assert pg_service.pg_client.get_database_state_call_count == 1
+        assert pg_service.pg_client.session_count == 1
+        assert pg_service.pg_client.db_create_call_count == 1
+        assert pg_service.pg_client.user_alter_password_call_count == 1
+
 
 @pytest.mark.unit
 class TestVaultService:
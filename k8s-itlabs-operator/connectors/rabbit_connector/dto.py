@@ -35,3 +35,4 @@ class RabbitConnector:
     url: str
     username: str
     password: str
+    resource_version: str | None = None
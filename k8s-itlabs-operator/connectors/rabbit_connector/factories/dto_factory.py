@@ -127,4 +127,5 @@ class RabbitConnectorFactory:
             url=rabbit_con_crd.spec.url,
             username=rabbit_con_crd.spec.username,
             password=rabbit_con_crd.spec.password,
+            resource_version=rabbit_con_crd.metadata.resource_version,
         )
@@ -3,6 +3,7 @@ from itertools import chain
 from connectors.rabbit_connector import specifications
 from connectors.rabbit_connector.dto import (
     RabbitApiSecretDto,
+    RabbitConnector,
     RabbitConnectorMicroserviceDto,
     RabbitMsSecretDto,
 )
@@ -22,6 +23,7 @@ from connectors.rabbit_connector.services.kubernetes import KubernetesService
 from connectors.rabbit_connector.services.vault import AbstractVaultService
 from utils.concurrency import ConnectorSourceLock
 from utils.hashing import generate_hash
+from utils.provisioning import provisioned_cache
 
 
 class RabbitConnectorService:
@@ -39,7 +41,18 @@ class RabbitConnectorService:
                 f"Rabbit Custom Resource `{ms_rabbit_con.rabbit_instance_name}`"
                 " does not exist"
             )
+        provisioned_cache.provision(
+            connector_type="rabbit_connector",
+            key=generate_hash(str(ms_rabbit_con)),
+            resource_version=rabbit_connector.resource_version,
+            func=lambda: self._provision(ms_rabbit_con, rabbit_connector),
+        )
 
+    def _provision(
+        self,
+        ms_rabbit_con: RabbitConnectorMicroserviceDto,
+        rabbit_connector: RabbitConnector,
+    ):
         rabbit_instance_cred = self.vault_service.unvault_rabbit_connector(
             rabbit_connector
         )
@@ -58,10 +71,11 @@ class RabbitConnectorService:
             username=ms_rabbit_con.username,
             vhost=ms_rabbit_con.vhost,
         )
-        with ConnectorSourceLock(source_hash):
+        with ConnectorSourceLock(source_hash) as source_lock:
             rabbit_ms_creds = self.get_or_create_rabbit_credentials(
                 rabbit_instance_cred, ms_rabbit_con
             )
+            source_lock.ensure_held()
             rabbit_service.configure_rabbit(rabbit_ms_creds)
 
     @staticmethod
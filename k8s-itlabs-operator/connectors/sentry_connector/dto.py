@@ -19,6 +19,7 @@ class SentryConnector:
     url: str
     token: str
     organization: str
+    resource_version: str | None = None
 
 
 @dataclass
@@ -38,6 +38,7 @@ class SentryConnectorFactory:
             url=sentry_connector_crd.spec.url,
             token=sentry_connector_crd.spec.token,
             organization=sentry_connector_crd.spec.organization,
+            resource_version=sentry_connector_crd.metadata.resource_version,
         )
 
 
@@ -2,7 +2,10 @@ import logging
 from itertools import chain
 
 from connectors.sentry_connector import specifications
-from connectors.sentry_connector.dto import SentryConnectorMicroserviceDto
+from connectors.sentry_connector.dto import (
+    SentryConnector,
+    SentryConnectorMicroserviceDto,
+)
 from connectors.sentry_connector.exceptions import (
     NonExistSecretForSentryConnector,
     SentryConnectorCrdDoesNotExist,
@@ -14,6 +17,7 @@ from connectors.sentry_connector.services.kubernetes import KubernetesService
 from connectors.sentry_connector.services.vault import AbstractVaultService
 from utils.concurrency import ConnectorSourceLock
 from utils.hashing import generate_hash
+from utils.provisioning import provisioned_cache
 
 
 class SentryConnectorService:
@@ -57,7 +61,18 @@ class SentryConnectorService:
                 f"Sentry Custom Resource `{ms_sentry_conn.sentry_instance_name}`"
                 " does not exist"
             )
+        provisioned_cache.provision(
+            connector_type="sentry_connector",
+            key=generate_hash(str(ms_sentry_conn)),
+            resource_version=sentry_connector.resource_version,
+            func=lambda: self._provision(ms_sentry_conn, sentry_connector),
+        )
 
+    def _provision(
+        self,
+        ms_sentry_conn: SentryConnectorMicroserviceDto,
+        sentry_connector: SentryConnector,
+    ):
         sentry_api_cred = self.vault_service.unvault_sentry_connector(
             sentry_connector
         )
@@ -80,7 +95,7 @@ class SentryConnectorService:
             project=ms_sentry_conn.project,
             env=ms_sentry_conn.environment,
         )
-        with ConnectorSourceLock(source_hash):
+        with ConnectorSourceLock(source_hash) as source_lock:
             if sentry_ms_cred and sentry_service.is_sentry_dsn_exist(
                 project_slug=sentry_ms_cred.project_slug, dsn=sentry_ms_cred.dsn
             ):
@@ -88,6 +103,7 @@ class SentryConnectorService:
                 return
 
             sentry_ms_cred = sentry_service.configure_sentry(ms_sentry_conn)
+            source_lock.ensure_held()
             self.vault_service.create_ms_sentry_credentials(
                 ms_sentry_conn.vault_path, sentry_ms_cred
             )
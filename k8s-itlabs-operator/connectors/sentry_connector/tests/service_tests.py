@@ -3,7 +3,7 @@ from clients.sentry.dto import SentryProjectKey
 from clients.sentry.tests.mocks import MockedSentryClient
 from clients.vault.tests.mocks import MockedVaultClient
 from connectors.sentry_connector import specifications
-from connectors.sentry_connector.dto import SentryConnector
+from connectors.sentry_connector.dto import SentryApiSecretDto, SentryConnector
 from connectors.sentry_connector.exceptions import (
     NonExistSecretForSentryConnector,
     SentryConnectorCrdDoesNotExist,
@@ -29,6 +29,7 @@ from connectors.sentry_connector.tests.mocks import (
     MockedVaultService,
     MockKubernetesService,
 )
+from utils.concurrency import ConnectorSourceLock, ConnectorSourceLockLost
 
 
 @pytest.mark.unit
@@ -119,6 +120,42 @@ class TestSentryConnectorService:
         with pytest.raises(NonExistSecretForSentryConnector):
             sentry_conn_service.on_create_deployment(ms_sentry_conn)
 
+    def test_vault_not_written_after_lock_lost(self, mocker):
+        lock = mocker.Mock(is_lost=False)
+        lock.acquire.return_value = True
+        ConnectorSourceLock.use_distributed_locks(lambda source_hash: lock)
+        sentry_service = mocker.Mock()
+        sentry_service.configure_sentry.side_effect = lambda *_: setattr(
+            lock, "is_lost", True
+        )
+        mocker.patch(
+            "connectors.sentry_connector.services.sentry_connector."
+            "SentryServiceFactory.create_sentry_service",
+            return_value=sentry_service,
+        )
+        vault_service = MockedVaultService()
+        mocker.patch.object(
+            vault_service,
+            "unvault_sentry_connector",
+            return_value=SentryApiSecretDto(
+                api_token="token",
+                api_url="https://sentry.local",
+                api_organization="sentry",
+            ),
+        )
+        sentry_conn_service = SentryConnectorService(
+            vault_service=vault_service
+        )
+        try:
+            with pytest.raises(ConnectorSourceLockLost):
+                sentry_conn_service._provision(
+                    SentryConnectorMicroserviceDtoTestFactory(),
+                    MockKubernetesService.get_sentry_connector("sentry"),
+                )
+        finally:
+            ConnectorSourceLock.use_distributed_locks(None)
+        assert vault_service.create_ms_sentry_credentials_calls_total == 0
+
     def test_mutate_container_variables_already_in_container(self):
         sentry_conn_service = SentryConnectorService(
             vault_service=MockedVaultService()
@@ -3,7 +3,15 @@ import logging
 import kopf
 import sentry_sdk
 import settings as operator_settings
+from clients.http.session import HttpSessions
+from clients.k8s import settings as k8s_settings
 from clients.k8s.k8s_client import KubernetesClient
+from clients.k8s.lease import KubernetesLeaseLock
+from connectors.atlas_connector.services.atlas_connector import (
+    AtlasConnectorService,
+    atlas_update_buffer,
+)
+from connectors.monitoring_connector.service import MonitoringConnectorService
 from observability.metrics.metrics import app_up
 from observability.metrics.request_wrapper import wrap_request
 from operators import (  # pylint: disable=unused-import
@@ -11,13 +19,17 @@ from operators import (  # pylint: disable=unused-import
     healthz,
     keycloak,
     monitoringconnector,
+    pods,
     postgresconnector,
     rabbitconnector,
     sentry,
 )
+from operators.provisioning import provisioning_queue
 from prometheus_client import start_http_server
 from sentry_sdk.integrations.aiohttp import AioHttpIntegration
 from utils import logger
+from utils.concurrency import ConnectorSourceLock
+from utils.watching import wrap_watching
 
 if operator_settings.SENTRY_DSN:
     sentry_sdk.init(
@@ -32,6 +44,13 @@ if operator_settings.SENTRY_DSN:
         traces_sample_rate=1.0,
     )
 
+CONNECTOR_CRD_PLURALS = (
+    "postgresconnectors",
+    "rabbitconnectors",
+    "sentryconnectors",
+    "keycloakconnectors",
+)
+
 
 @kopf.on.startup()
 def configure(settings: kopf.OperatorSettings, **_):
@@ -49,8 +68,51 @@ def configure(settings: kopf.OperatorSettings, **_):
     except ValueError:
         settings.posting.level = logging.INFO
 
+    # Connector custom resources are required on every pod admission,
+    # so they are kept in memory instead of requesting apiserver.
+    for plural in CONNECTOR_CRD_PLURALS:
+        KubernetesClient.watch_cluster_custom_objects(
+            group="itlabs.io", version="v1", plural=plural
+        )
+    # Operator configuration (e.g. Atlas connector configmap) is read on
+    # pod events, so configmaps of operator namespace are kept in memory.
+    KubernetesClient.add_configmap_handler(
+        operator_settings.OPERATOR_NAMESPACE,
+        AtlasConnectorService.on_configmap_change,
+    )
+    if not KubernetesClient.wait_informers_ready(
+        k8s_settings.K8S_CACHE_READY_TIMEOUT
+    ):
+        logging.warning(
+            "Watched objects are not listed, they are requested from "
+            "apiserver until listed"
+        )
+
+    if operator_settings.WEBHOOK_MANAGED:
+        KubernetesClient.apply_mutating_webhook_configuration(
+            pods.webhook_configuration()
+        )
+
+    if k8s_settings.K8S_LEASE_LOCKS:
+        ConnectorSourceLock.use_distributed_locks(
+            KubernetesLeaseLock.for_source
+        )
+
+
+@kopf.on.cleanup()
+def cleanup(**_):
+    KubernetesClient.stop_watching()
+    MonitoringConnectorService.stop_resync()
+    # Queued jobs and updates are done before sessions they use are closed.
+    if not provisioning_queue.stop(operator_settings.SHUTDOWN_DRAIN_TIMEOUT):
+        logging.warning("Provisioning queue is not drained on shutdown")
+    if not atlas_update_buffer.stop(operator_settings.SHUTDOWN_DRAIN_TIMEOUT):
+        logging.warning("Atlas updates are not flushed on shutdown")
+    HttpSessions.close_all()
+
 
 wrap_request()
+wrap_watching()
 app_up.labels(application="k8s-itlabs-operator").set(1)
 start_http_server(8080)
 KubernetesClient.configure_kubernetes()
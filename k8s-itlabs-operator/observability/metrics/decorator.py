@@ -68,23 +68,29 @@ def monitoring(connector_type: str):
                 raise e
             finally:
                 process_time = default_timer() - start_time
-                label_values = {
-                    "connector_type": connector_type,
-                    "enabled": status.label_is_enabled,
-                    "used": status.label_is_used,
-                    "exception": status.label_exception,
-                }
-                app_http_request_operator_latency_seconds.labels(
-                    **label_values
-                ).observe(process_time)
-                connector_type_key = label_values.pop("connector_type")
-                return {connector_type_key: label_values}
+                return observe_connector(connector_type, status, process_time)
 
         return wrapped
 
     return wrap
 
 
+def observe_connector(
+    connector_type: str, status: ConnectorStatus, process_time: float
+) -> dict:
+    label_values = {
+        "connector_type": connector_type,
+        "enabled": status.label_is_enabled,
+        "used": status.label_is_used,
+        "exception": status.label_exception,
+    }
+    app_http_request_operator_latency_seconds.labels(**label_values).observe(
+        process_time
+    )
+    connector_type_key = label_values.pop("connector_type")
+    return {connector_type_key: label_values}
+
+
 def mutation_hook_monitoring(connector_type: str):
     def wrap(func: Callable):
         def wrapped(*args, **kwargs):
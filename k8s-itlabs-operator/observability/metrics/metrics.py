@@ -1,4 +1,4 @@
-from prometheus_client import Gauge, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 from prometheus_client.utils import INF
 
 app_http_request_operator_latency_seconds = Histogram(
@@ -76,3 +76,174 @@ app_mutation_admission_hook_latency_seconds = Histogram(
         INF,
     ),
 )
+
+app_vault_logins_total = Counter(
+    name="app_vault_logins_total",
+    documentation="Данная метрика содержит количество попыток авторизации оператора в Vault "
+    "(Kubernetes auth). Метка status ДОЛЖНА содержать результат авторизации (success, failure).",
+    labelnames=("status",),
+)
+
+app_vault_token_renewals_total = Counter(
+    name="app_vault_token_renewals_total",
+    documentation="Данная метрика содержит количество продлений токена Vault. "
+    "Метка status ДОЛЖНА содержать результат продления (success, failure, exhausted), "
+    "где exhausted означает, что достигнут максимальный срок жизни токена и "
+    "требуется повторная авторизация.",
+    labelnames=("status",),
+)
+
+app_vault_cache_hits_total = Counter(
+    name="app_vault_cache_hits_total",
+    documentation="Данная метрика содержит количество чтений секретов Vault, "
+    "которые были получены из кеша оператора без запроса в Vault.",
+)
+
+app_vault_cache_misses_total = Counter(
+    name="app_vault_cache_misses_total",
+    documentation="Данная метрика содержит количество чтений секретов Vault, "
+    "для которых секрет отсутствовал в кеше оператора.",
+)
+
+app_vault_cache_evictions_total = Counter(
+    name="app_vault_cache_evictions_total",
+    documentation="Данная метрика содержит количество секретов Vault, удаленных из кеша оператора. "
+    "Метка reason ДОЛЖНА содержать причину удаления (expired, size, deleted).",
+    labelnames=("reason",),
+)
+
+app_postgres_pool_connections = Gauge(
+    name="app_postgres_pool_connections",
+    documentation="Данная метрика содержит количество открытых соединений в пулах соединений к Postgres. "
+    "Метки host, port, user и database ДОЛЖНЫ содержать адрес и порт инстанса Postgres, "
+    "пользователя и название базы данных пула, метка state ДОЛЖНА содержать состояние соединений (idle, used).",
+    labelnames=("host", "port", "user", "database", "state"),
+)
+
+app_postgres_pool_wait_seconds = Histogram(
+    name="app_postgres_pool_wait_seconds",
+    documentation="Данная метрика содержит время ожидания свободного места в пуле соединений к Postgres. "
+    "Метки host, port, user и database ДОЛЖНЫ содержать адрес и порт инстанса Postgres, "
+    "пользователя и название базы данных пула.",
+    labelnames=("host", "port", "user", "database"),
+)
+
+app_postgres_pool_checkout_latency_seconds = Histogram(
+    name="app_postgres_pool_checkout_latency_seconds",
+    documentation="Данная метрика содержит время получения соединения из пула соединений к Postgres, "
+    "включая ожидание, проверку соединения и открытие нового соединения. "
+    "Метки host, port, user и database ДОЛЖНЫ содержать адрес и порт инстанса Postgres, "
+    "пользователя и название базы данных пула.",
+    labelnames=("host", "port", "user", "database"),
+)
+
+app_pod_connectors_in_progress = Gauge(
+    name="app_pod_connectors_in_progress",
+    documentation="Данная метрика содержит количество коннекторов, обрабатываемых или ожидающих "
+    "обработки при создании подов, включая коннекторы, не обработанные за отведенное время. "
+    "Значение больше количества потоков обработки коннекторов означает, что новые поды ожидают "
+    "освобождения потоков.",
+)
+
+app_provisioning_queue_depth = Gauge(
+    name="app_provisioning_queue_depth",
+    documentation="Данная метрика содержит количество заданий асинхронного создания инфраструктуры "
+    "коннекторов, ожидающих выполнения (включая повторные попытки).",
+)
+
+app_provisioning_jobs_total = Counter(
+    name="app_provisioning_jobs_total",
+    documentation="Данная метрика содержит количество заданий асинхронного создания инфраструктуры "
+    "коннекторов. Метка connector_type ДОЛЖНА содержать тип коннектора (postgres_connector, rabbit_connector, sentry_connector, keycloak_connector), "
+    "метка status ДОЛЖНА содержать результат обработки задания (success, failure, retry, deduplicated), "
+    "где deduplicated означает, что такое же задание уже ожидает выполнения или выполняется.",
+    labelnames=("connector_type", "status"),
+)
+
+app_provisioning_job_latency_seconds = Histogram(
+    name="app_provisioning_job_latency_seconds",
+    documentation="Данная метрика содержит время от постановки задания асинхронного создания "
+    "инфраструктуры коннектора в очередь до его завершения, включая повторные попытки. "
+    "Метка connector_type ДОЛЖНА содержать тип коннектора (postgres_connector, rabbit_connector, sentry_connector, keycloak_connector), "
+    "метка status ДОЛЖНА содержать результат выполнения задания (success, failure).",
+    labelnames=("connector_type", "status"),
+    buckets=(
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+        120.0,
+        300.0,
+        INF,
+    ),
+)
+
+app_provisioning_cache_hits_total = Counter(
+    name="app_provisioning_cache_hits_total",
+    documentation="Данная метрика содержит количество обработанных подов, для которых создание "
+    "инфраструктуры коннектора пропущено, так как микросервис недавно уже был обработан "
+    "с той же версией ресурса коннектора. Метка connector_type ДОЛЖНА содержать тип коннектора "
+    "(postgres_connector, rabbit_connector, sentry_connector, keycloak_connector).",
+    labelnames=("connector_type",),
+)
+
+app_provisioning_cache_misses_total = Counter(
+    name="app_provisioning_cache_misses_total",
+    documentation="Данная метрика содержит количество обработанных подов, для которых выполнено "
+    "создание инфраструктуры коннектора. Вместе с app_provisioning_cache_hits_total "
+    "позволяет вычислить долю попаданий в кэш. Метка connector_type ДОЛЖНА содержать тип "
+    "коннектора (postgres_connector, rabbit_connector, sentry_connector, keycloak_connector).",
+    labelnames=("connector_type",),
+)
+
+app_connector_source_lock_wait_seconds = Histogram(
+    name="app_connector_source_lock_wait_seconds",
+    documentation="Данная метрика содержит время ожидания блокировки источника коннектора "
+    "(например, базы данных микросервиса) перед созданием его инфраструктуры.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, INF),
+)
+
+app_connector_source_lock_hold_seconds = Histogram(
+    name="app_connector_source_lock_hold_seconds",
+    documentation="Данная метрика содержит время удержания блокировки источника коннектора "
+    "(например, базы данных микросервиса) при создании его инфраструктуры.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, INF),
+)
+
+app_provisioning_coalesced_total = Counter(
+    name="app_provisioning_coalesced_total",
+    documentation="Данная метрика содержит количество обработанных подов, которые не выполняли "
+    "создание инфраструктуры коннектора, а дождались результата одновременного создания той же "
+    "инфраструктуры для другого пода. Метка connector_type ДОЛЖНА содержать тип коннектора "
+    "(postgres_connector, rabbit_connector, sentry_connector, keycloak_connector).",
+    labelnames=("connector_type",),
+)
+
+app_atlas_buffer_size = Gauge(
+    name="app_atlas_buffer_size",
+    documentation="Данная метрика содержит количество обновлений микросервисов в Atlas, "
+    "ожидающих отправки (включая повторные попытки).",
+)
+
+app_atlas_updates_total = Counter(
+    name="app_atlas_updates_total",
+    documentation="Данная метрика содержит количество обновлений микросервисов в Atlas. "
+    "Метка status ДОЛЖНА содержать результат обработки обновления (success, failure, retry, superseded), "
+    "где superseded означает, что обновление заменено более новым обновлением того же микросервиса "
+    "до отправки.",
+    labelnames=("status",),
+)
+
+app_http_client_connections_total = Counter(
+    name="app_http_client_connections_total",
+    documentation="Данная метрика содержит количество соединений, открытых оператором к внешним "
+    "сервисам (Rabbit, Sentry, Keycloak, Atlas). Соединения переиспользуются между запросами, "
+    "поэтому рост метрики быстрее количества запросов означает, что соединения не сохраняются. "
+    "Метка host ДОЛЖНА содержать адрес сервиса.",
+    labelnames=("host",),
+)
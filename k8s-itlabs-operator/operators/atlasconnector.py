@@ -1,6 +1,8 @@
 import logging
+from typing import Optional
 
 import kopf
+from connectors.atlas_connector import specifications
 from connectors.atlas_connector.factories.dto_factory import (
     AtlasConnectorAnnotationsFactory,
 )
@@ -10,13 +12,33 @@ from connectors.atlas_connector.services.atlas_connector import (
 from observability.metrics.decorator import monitoring
 
 
+def atlas_annotations(pod: Optional[dict]) -> dict:
+    annotations = ((pod or {}).get("metadata") or {}).get("annotations") or {}
+    return {
+        key: value
+        for key, value in annotations.items()
+        if key.startswith(specifications.ATLAS_ANNOTATION_PREFIXES)
+    }
+
+
+def is_atlas_annotations_changed(old, new, **_) -> bool:
+    return atlas_annotations(old) != atlas_annotations(new)
+
+
 @kopf.on.create("pods.v1")
-@kopf.on.update("pods.v1")
+@kopf.on.update(
+    "pods.v1",
+    field="metadata.annotations",
+    when=is_atlas_annotations_changed,
+)
 @monitoring(connector_type="atlas_connector")
 def create_pods(annotations, namespace, **kwargs):
     """
     Atlas connector will be working only if configmap `atlas_connector.specifications.CONFIGMAP_NAME`
     will be created in k8s-itlabs-operator namespace.
+
+    Pod updates are handled only when annotations sent to Atlas are
+    changed, status and other annotations changes do not call handler.
     """
     logging.info("Atlas connector handler is called on pod creating/updating")
     atlas_annotations = AtlasConnectorAnnotationsFactory.annotations_from_dict(
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
 
 
 class EnabledLabelValues(str, Enum):
@@ -65,6 +65,14 @@ class ConnectorStatus:
         return exception_str
 
 
+@dataclass
+class ConnectorMutation:
+    status: ConnectorStatus
+    # Adds environment variables of connector to container, returns
+    # whether container was changed.
+    mutate_container: Optional[Callable[[dict], bool]] = None
+
+
 @dataclass
 class MutationHookStatus:
     is_used: Optional[bool] = None
@@ -19,19 +19,21 @@ from connectors.keycloak_connector.services.keycloak_connector import (
     KeycloakConnectorService,
 )
 from exceptions import InfrastructureServiceProblem
-from observability.metrics.decorator import monitoring, mutation_hook_monitoring
-from operators.dto import ConnectorStatus, MutationHookStatus
-from utils.common import OwnerReferenceDto, get_owner_reference
-
+from observability.metrics.decorator import mutation_hook_monitoring
+from operators.dto import (
+    ConnectorMutation,
+    ConnectorStatus,
+    MutationHookStatus,
+)
+from operators.labels import (
+    is_connectors_enabled,
+    report_missing_enabled_label,
+)
+from operators.provisioning import provision
+from utils.common import get_owner_reference
 
-@kopf.on.mutate("pods.v1", id="kk-con-on-createpods")
-@monitoring(connector_type="keycloak_connector")
-def create_pods(body, patch, spec, annotations, **_):
-    # At the time of the creation of Pod, the name and uid were not yet
-    # set in the manifest, so in the logs we refer to its owner.
-    owner_ref: OwnerReferenceDto = get_owner_reference(body)
-    owner_fmt = f"{owner_ref.kind}: {owner_ref.name}" if owner_ref else ""
 
+def mutate_pod(body, annotations, labels, owner_fmt) -> ConnectorMutation:
     logging.info(
         "[%s] Keycloak mutate handler is called on pod creating", owner_fmt
     )
@@ -45,7 +47,7 @@ def create_pods(body, patch, spec, annotations, **_):
             owner_fmt,
             e.message,
         )
-        return status
+        return ConnectorMutation(status)
     except KeycloakConnectorAnnotationEmptyValueError as e:
         logging.error(
             "[%s] Problem with Keycloak connector: %s",
@@ -55,12 +57,18 @@ def create_pods(body, patch, spec, annotations, **_):
         )
         status.is_used = True
         status.exception = e
-        return status
+        return ConnectorMutation(status)
     status.is_used = True
     kk_conn_service = KeycloakConnectorServiceFactory.create()
     logging.info("[%s] Keycloak connector service is created", owner_fmt)
     try:
-        kk_conn_service.on_create_deployment(ms_keycloak_conn)
+        provision(
+            connector_type="keycloak_connector",
+            reason="KeycloakConnector",
+            body=body,
+            on_create_deployment=kk_conn_service.on_create_deployment,
+            ms_dto=ms_keycloak_conn,
+        )
         logging.info(
             "[%s] Keycloak connector service was processed in infrastructure",
             owner_fmt,
@@ -81,20 +89,18 @@ def create_pods(body, patch, spec, annotations, **_):
         status.exception = e
     else:
         status.is_enabled = True
-        if kk_conn_service.mutate_containers(spec, ms_keycloak_conn):
-            patch.spec["containers"] = spec.get("containers", [])
-            patch.spec["initContainers"] = spec.get("initContainers", [])
-            logging.info(
-                "[%s] Keycloak connector service patched containers, patch.spec: %s",
-                owner_fmt,
-                patch.spec,
-            )
-    return status
+        return ConnectorMutation(
+            status,
+            mutate_container=lambda container: kk_conn_service.mutate_container(
+                container, False, ms_keycloak_conn.vault_path
+            ),
+        )
+    return ConnectorMutation(status)
 
 
 @kopf.on.create("pods.v1", id="keycloak-connector-on-check-creation")
 @mutation_hook_monitoring(connector_type="keycloak_connector")
-def check_creation(annotations, name, body, **_):
+def check_creation(annotations, name, labels, body, **_):
     status = MutationHookStatus()
     try:
         ms_keycloak_conn = DtoFactory.dto_from_metadata(annotations)
@@ -117,6 +123,11 @@ def check_creation(annotations, name, body, **_):
     owner = get_owner_reference(body)
     status.owner = f"{owner.kind}: {owner.name}" if owner else ""
 
+    if not is_connectors_enabled(labels):
+        status.is_success = False
+        report_missing_enabled_label(body, "Keycloak")
+        return status
+
     spec = body.get("spec", {})
     if not KeycloakConnectorService.any_containers_contain_required_envs(spec):
         status.is_success = False
@@ -0,0 +1,44 @@
+from typing import Optional
+
+import kopf
+import settings as operator_settings
+
+# Pods without opt-in label are not sent to webhook by apiserver, empty
+# label selects all pods.
+OPT_IN_LABELS = (
+    {operator_settings.CONNECTORS_ENABLED_LABEL: "true"}
+    if operator_settings.CONNECTORS_ENABLED_LABEL
+    else {}
+)
+# Handler filter skips pods without opt-in label, if webhook is called
+# anyway. Opt-in label is required only with webhook configuration
+# managed by operator, so pods of unmanaged webhook configurations are
+# mutated without it.
+ENABLED_LABELS = (
+    (OPT_IN_LABELS or None) if operator_settings.WEBHOOK_MANAGED else None
+)
+
+
+def is_connectors_enabled(labels: Optional[dict]) -> bool:
+    """Checks that pod is opted in to be mutated by connectors webhook."""
+    if not ENABLED_LABELS:
+        return True
+    labels = labels or {}
+    return all(labels.get(k) == v for k, v in ENABLED_LABELS.items())
+
+
+def report_missing_enabled_label(body: dict, connector: str):
+    """
+    Emits event that connector was not applied to pod, because pod has
+    no opt-in label and was not sent to connectors webhook.
+    """
+    label = ", ".join(f"{k}={v}" for k, v in ENABLED_LABELS.items())
+    kopf.event(
+        body,
+        type="Error",
+        reason=f"{connector}Connector",
+        message=(
+            f"{connector} Connector not applied: pod has no label {label}, "
+            "so it is not sent to connectors webhook."
+        ),
+    )
@@ -1,6 +1,7 @@
 import logging
 
 import kopf
+import settings as operator_settings
 from connectors.monitoring_connector.factories.dto_factory import (
     MonitoringConnectorMicroserviceDtoFactory,
 )
@@ -11,6 +12,29 @@ from observability.metrics.decorator import monitoring
 from operators.dto import ConnectorStatus
 
 
+@kopf.on.startup()
+def sync_service_monitors(**_):
+    """
+    ServiceMonitors are synced with Services by list requests before
+    Services are watched, so handlers of Services do not request them.
+    Then they are synced periodically to restore ServiceMonitors deleted
+    or changed by others.
+    """
+    monitoring_connector_service = (
+        MonitoringConnectorServiceFactory.create_monitoring_connector_service()
+    )
+    try:
+        monitoring_connector_service.sync_service_monitors(
+            workers=operator_settings.MONITORING_SYNC_WORKERS
+        )
+    except Exception as e:
+        logging.error("ServiceMonitors are not synced", exc_info=e)
+    monitoring_connector_service.start_resync(
+        interval=operator_settings.MONITORING_RESYNC_INTERVAL,
+        workers=operator_settings.MONITORING_SYNC_WORKERS,
+    )
+
+
 @kopf.on.create("services")
 @kopf.on.update("services")
 @monitoring(connector_type="monitoring_connector")
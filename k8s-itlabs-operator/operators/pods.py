@@ -0,0 +1,232 @@
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from timeit import default_timer
+from typing import Callable, Tuple
+
+import kopf
+import settings as operator_settings
+from observability.metrics.decorator import observe_connector
+from observability.metrics.metrics import app_pod_connectors_in_progress
+from operators import keycloak, postgresconnector, rabbitconnector, sentry
+from operators.dto import ConnectorMutation, ConnectorStatus
+from operators.labels import ENABLED_LABELS, OPT_IN_LABELS
+from utils.common import OwnerReferenceDto, get_owner_reference
+
+MutatePod = Callable[[dict, dict, dict, str], ConnectorMutation]
+
+POD_CONNECTORS: Tuple[Tuple[str, MutatePod, float], ...] = (
+    (
+        "postgres_connector",
+        postgresconnector.mutate_pod,
+        operator_settings.POSTGRES_CONNECTOR_TIMEOUT,
+    ),
+    (
+        "rabbit_connector",
+        rabbitconnector.mutate_pod,
+        operator_settings.RABBIT_CONNECTOR_TIMEOUT,
+    ),
+    (
+        "sentry_connector",
+        sentry.mutate_pod,
+        operator_settings.SENTRY_CONNECTOR_TIMEOUT,
+    ),
+    (
+        "keycloak_connector",
+        keycloak.mutate_pod,
+        operator_settings.KEYCLOAK_CONNECTOR_TIMEOUT,
+    ),
+)
+
+EXECUTOR_WORKERS = (
+    len(POD_CONNECTORS) * operator_settings.CONNECTORS_CONCURRENT_ADMISSIONS
+)
+executor = ThreadPoolExecutor(
+    max_workers=EXECUTOR_WORKERS, thread_name_prefix="pod-connectors"
+)
+_in_progress = 0
+_in_progress_lock = threading.Lock()
+
+HANDLER_ID = "connectors-on-createpods"
+
+
+def webhook_configuration() -> dict:
+    """
+    Returns mutating webhook configuration of pods handler, that selects
+    pods with opt-in label outside of excluded namespaces.
+    """
+    excluded_namespaces = [
+        operator_settings.OPERATOR_NAMESPACE,
+        *filter(None, operator_settings.WEBHOOK_EXCLUDED_NAMESPACES),
+    ]
+    return {
+        "apiVersion": "admissionregistration.k8s.io/v1",
+        "kind": "MutatingWebhookConfiguration",
+        "metadata": {
+            "name": operator_settings.WEBHOOK_CONFIGURATION_NAME,
+            "annotations": {
+                "cert-manager.io/inject-ca-from": (
+                    f"{operator_settings.OPERATOR_NAMESPACE}/"
+                    f"{operator_settings.WEBHOOK_SERVICE_NAME}"
+                ),
+            },
+        },
+        "webhooks": [
+            {
+                "name": "create-pods.connectors.itlabs.io",
+                "admissionReviewVersions": ["v1", "v1beta1"],
+                "clientConfig": {
+                    "service": {
+                        "namespace": operator_settings.OPERATOR_NAMESPACE,
+                        "name": operator_settings.WEBHOOK_SERVICE_NAME,
+                        "path": f"/{HANDLER_ID}",
+                        "port": 443,
+                    },
+                },
+                "failurePolicy": "Ignore",
+                "matchPolicy": "Equivalent",
+                "namespaceSelector": {
+                    "matchExpressions": [
+                        {
+                            "key": "kubernetes.io/metadata.name",
+                            "operator": "NotIn",
+                            "values": excluded_namespaces,
+                        },
+                    ],
+                },
+                "objectSelector": {"matchLabels": OPT_IN_LABELS},
+                "reinvocationPolicy": "Never",
+                "rules": [
+                    {
+                        "apiGroups": [""],
+                        "apiVersions": ["v1"],
+                        "operations": ["CREATE"],
+                        "resources": ["pods"],
+                        "scope": "*",
+                    },
+                ],
+                "sideEffects": "None",
+                "timeoutSeconds": operator_settings.WEBHOOK_TIMEOUT,
+            },
+        ],
+    }
+
+
+def _track_in_progress(delta: int):
+    global _in_progress
+    with _in_progress_lock:
+        _in_progress += delta
+        in_progress = _in_progress
+    app_pod_connectors_in_progress.set(in_progress)
+    if delta > 0 and in_progress > EXECUTOR_WORKERS:
+        logging.warning(
+            "All %s pod connectors threads are busy, %s connectors wait",
+            EXECUTOR_WORKERS,
+            in_progress - EXECUTOR_WORKERS,
+        )
+
+
+async def run_connector(
+    connector_type: str,
+    mutate_pod: MutatePod,
+    timeout: float,
+    body: dict,
+    annotations: dict,
+    labels: dict,
+    owner_fmt: str,
+) -> Tuple[ConnectorMutation, dict]:
+    """
+    Returns mutation of connector and metric labels of connector for
+    handler result. Connector that is not processed in time does not
+    mutate pod, its provisioning keeps running in background. Connector
+    that failed does not mutate pod either, its exception is kept in status
+    and other connectors are applied.
+    """
+    start_time = default_timer()
+    mutation = ConnectorMutation(ConnectorStatus())
+    # Connector runs in copy of handler context, so kopf events can be
+    # posted from executor thread.
+    context = contextvars.copy_context()
+    # Connector stays in progress after timeout until its thread is done or
+    # it is cancelled before start.
+    _track_in_progress(1)
+    future = executor.submit(
+        context.run, mutate_pod, body, annotations, labels, owner_fmt
+    )
+    future.add_done_callback(lambda _: _track_in_progress(-1))
+    try:
+        mutation = await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=timeout
+        )
+    except asyncio.TimeoutError as e:
+        logging.error(
+            "[%s] Connector %s is not processed in %s seconds",
+            owner_fmt,
+            connector_type,
+            timeout,
+        )
+        mutation.status.exception = e
+    except Exception as e:
+        logging.exception(
+            "[%s] Connector %s is not applied", owner_fmt, connector_type
+        )
+        mutation.status.exception = e
+    finally:
+        result = observe_connector(
+            connector_type, mutation.status, default_timer() - start_time
+        )
+    return mutation, result
+
+
+@kopf.on.mutate("pods.v1", id=HANDLER_ID, labels=ENABLED_LABELS)
+async def create_pods(body, patch, spec, annotations, labels, **_):
+    """
+    Applies all connectors to pod at once: connectors are processed
+    concurrently, each within its own timeout, and their environment
+    variables are added to containers in one pass.
+    """
+    # At the time of the creation of Pod, the name and uid were not yet
+    # set in the manifest, so in the logs we refer to its owner.
+    owner_ref: OwnerReferenceDto = get_owner_reference(body)
+    owner_fmt = f"{owner_ref.kind}: {owner_ref.name}" if owner_ref else ""
+
+    connector_results = await asyncio.gather(
+        *(
+            run_connector(
+                connector_type,
+                mutate_pod,
+                timeout,
+                body,
+                annotations,
+                labels,
+                owner_fmt,
+            )
+            for connector_type, mutate_pod, timeout in POD_CONNECTORS
+        ),
+    )
+
+    result = {}
+    mutations = []
+    for mutation, labels_result in connector_results:
+        result.update(labels_result)
+        if mutation.mutate_container:
+            mutations.append(mutation.mutate_container)
+
+    mutated = False
+    for container in chain(
+        spec.get("containers", []), spec.get("initContainers", [])
+    ):
+        for mutate_container in mutations:
+            mutated = mutate_container(container) or mutated
+    if mutated:
+        patch.spec["containers"] = spec.get("containers", [])
+        patch.spec["initContainers"] = spec.get("initContainers", [])
+        logging.info(
+            "[%s] Connectors patched containers, patch.spec: %s",
+            owner_fmt,
+            patch.spec,
+        )
+    return result
@@ -20,9 +20,18 @@ from connectors.postgres_connector.services.postgres_connector import (
     PostgresConnectorService,
 )
 from exceptions import InfrastructureServiceProblem
-from observability.metrics.decorator import monitoring, mutation_hook_monitoring
-from operators.dto import ConnectorStatus, MutationHookStatus
-from utils.common import OwnerReferenceDto, get_owner_reference
+from observability.metrics.decorator import mutation_hook_monitoring
+from operators.dto import (
+    ConnectorMutation,
+    ConnectorStatus,
+    MutationHookStatus,
+)
+from operators.labels import (
+    is_connectors_enabled,
+    report_missing_enabled_label,
+)
+from operators.provisioning import provision
+from utils.common import get_owner_reference
 
 
 @kopf.on.create("postgresconnectors")
@@ -30,14 +39,7 @@ def create_fn(body, **_):
     logging.info(f"A handler is called with body: {body}")
 
 
-@kopf.on.mutate("pods.v1", id="pg-con-on-createpods")
-@monitoring(connector_type="postgres_connector")
-def create_pods(body, patch, spec, annotations, labels, **_):
-    # At the time of the creation of Pod, the name and uid were not yet
-    # set in the manifest, so in the logs we refer to its owner.
-    owner_ref: OwnerReferenceDto = get_owner_reference(body)
-    owner_fmt = f"{owner_ref.kind}: {owner_ref.name}" if owner_ref else ""
-
+def mutate_pod(body, annotations, labels, owner_fmt) -> ConnectorMutation:
     logging.info(
         "[%s] A postgres mutate handler is called on pod creating", owner_fmt
     )
@@ -53,7 +55,7 @@ def create_pods(body, patch, spec, annotations, labels, **_):
             owner_fmt,
             e.message,
         )
-        return status
+        return ConnectorMutation(status)
     except PgConnectorAnnotationEmptyValueError as e:
         logging.error(
             "[%s] Problem with Rabbit connector: %s",
@@ -63,14 +65,20 @@ def create_pods(body, patch, spec, annotations, labels, **_):
         )
         status.is_enabled = False
         status.is_used = False
-        return status
+        return ConnectorMutation(status)
 
     pg_con_service = (
         PostgresConnectorServiceFactory.create_postgres_connector_service()
     )
     logging.info("[%s] Postgres connector service is created", owner_fmt)
     try:
-        pg_con_service.on_create_deployment(ms_pg_con)
+        provision(
+            connector_type="postgres_connector",
+            reason="PostgresConnector",
+            body=body,
+            on_create_deployment=pg_con_service.on_create_deployment,
+            ms_dto=ms_pg_con,
+        )
         logging.info(
             "[%s] Postgres connector service was processed in infrastructure",
             owner_fmt,
@@ -91,15 +99,13 @@ def create_pods(body, patch, spec, annotations, labels, **_):
         status.exception = e
     else:
         status.is_enabled = True
-        if pg_con_service.mutate_containers(spec, ms_pg_con):
-            patch.spec["containers"] = spec.get("containers", [])
-            patch.spec["initContainers"] = spec.get("initContainers", [])
-            logging.info(
-                "[%s] Postgres connector service patched containers, patch.spec: %s",
-                owner_fmt,
-                patch.spec,
-            )
-    return status
+        return ConnectorMutation(
+            status,
+            mutate_container=lambda container: pg_con_service.mutate_container(
+                container, False, ms_pg_con.vault_path
+            ),
+        )
+    return ConnectorMutation(status)
 
 
 @kopf.on.create("pods.v1", id="postgres-connector-on-check-creation")
@@ -131,6 +137,11 @@ def check_creation(annotations, name, labels, body, **_):
     owner = get_owner_reference(body)
     status.owner = f"{owner.kind}: {owner.name}" if owner else ""
 
+    if not is_connectors_enabled(labels):
+        status.is_success = False
+        report_missing_enabled_label(body, "Postgres")
+        return status
+
     is_contain_required_envs = (
         PostgresConnectorService.any_containers_contain_required_envs(spec)
     )
@@ -0,0 +1,69 @@
+import logging
+from typing import Any, Callable, TypeVar
+
+import kopf
+import settings as operator_settings
+from utils.common import get_owner_object
+from utils.hashing import generate_hash
+from utils.provisioning import ProvisioningJob, ProvisioningQueue
+
+MicroserviceDto = TypeVar("MicroserviceDto")
+
+provisioning_queue = ProvisioningQueue(
+    workers=operator_settings.PROVISIONING_WORKERS,
+    max_retries=operator_settings.PROVISIONING_MAX_RETRIES,
+    retry_delay=operator_settings.PROVISIONING_RETRY_DELAY,
+    max_retry_delay=operator_settings.PROVISIONING_MAX_RETRY_DELAY,
+)
+
+
+def provision(
+    connector_type: str,
+    reason: str,
+    body: dict,
+    on_create_deployment: Callable[[MicroserviceDto], Any],
+    ms_dto: MicroserviceDto,
+):
+    """
+    Provisions connector infrastructure for microservice. When
+    asynchronous provisioning is enabled, provisioning is put into queue
+    and its result is reported by event of pod's owner.
+    """
+    if not operator_settings.ASYNC_PROVISIONING:
+        on_create_deployment(ms_dto)
+        return
+
+    owner = get_owner_object(body)
+
+    def on_success():
+        if owner:
+            kopf.event(
+                owner,
+                type="Normal",
+                reason=reason,
+                message=f"{reason} infrastructure is provisioned",
+            )
+
+    def on_failure(e: Exception):
+        if owner:
+            kopf.event(
+                owner,
+                type="Error",
+                reason=reason,
+                message=f"{reason} infrastructure is not provisioned: {e}",
+            )
+
+    is_enqueued = provisioning_queue.enqueue(
+        ProvisioningJob(
+            key=generate_hash(connector_type, str(ms_dto)),
+            connector_type=connector_type,
+            func=lambda: on_create_deployment(ms_dto),
+            on_success=on_success,
+            on_failure=on_failure,
+        )
+    )
+    logging.info(
+        "%s provisioning is %s",
+        reason,
+        "queued" if is_enqueued else "already queued",
+    )
@@ -18,23 +18,25 @@ from connectors.rabbit_connector.services.rabbit_connector import (
     RabbitConnectorService,
 )
 from exceptions import InfrastructureServiceProblem
-from observability.metrics.decorator import monitoring, mutation_hook_monitoring
-from operators.dto import ConnectorStatus, MutationHookStatus
-from utils.common import OwnerReferenceDto, get_owner_reference
+from observability.metrics.decorator import mutation_hook_monitoring
+from operators.dto import (
+    ConnectorMutation,
+    ConnectorStatus,
+    MutationHookStatus,
+)
+from operators.labels import (
+    is_connectors_enabled,
+    report_missing_enabled_label,
+)
+from operators.provisioning import provision
+from utils.common import get_owner_reference
 from validation.exceptions import (
     AnnotationValidatorEmptyValueException,
     AnnotationValidatorMissedRequiredException,
 )
 
 
-@kopf.on.mutate("pods.v1", id="rabbit-connector-on-createpods")
-@monitoring(connector_type="rabbit_connector")
-def create_pods(body, patch, spec, annotations, labels, **_):
-    # At the time of the creation of Pod, the name and uid were not yet
-    # set in the manifest, so in the logs we refer to its owner.
-    owner_ref: OwnerReferenceDto = get_owner_reference(body)
-    owner_fmt = f"{owner_ref.kind}: {owner_ref.name}" if owner_ref else ""
-
+def mutate_pod(body, annotations, labels, owner_fmt) -> ConnectorMutation:
     logging.info(
         "[%s] A rabbit mutate handler is called on pod creating", owner_fmt
     )
@@ -53,7 +55,7 @@ def create_pods(body, patch, spec, annotations, labels, **_):
             owner_fmt,
             e.message,
         )
-        return status
+        return ConnectorMutation(status)
     except AnnotationValidatorEmptyValueException as e:
         logging.error(
             "[%s] Problem with Rabbit connector: %s",
@@ -63,14 +65,20 @@ def create_pods(body, patch, spec, annotations, labels, **_):
         )
         status.is_used = True
         status.exception = e
-        return status
+        return ConnectorMutation(status)
 
     rabbit_con_service = (
         RabbitConnectorServiceFactory.create_rabbit_connector_service()
     )
     logging.info("[%s] Rabbit connector service is created", owner_fmt)
     try:
-        rabbit_con_service.on_create_deployment(ms_rabbit_con)
+        provision(
+            connector_type="rabbit_connector",
+            reason="RabbitConnector",
+            body=body,
+            on_create_deployment=rabbit_con_service.on_create_deployment,
+            ms_dto=ms_rabbit_con,
+        )
         logging.info(
             "[%s] Rabbit connector service was processed in infrastructure",
             owner_fmt,
@@ -94,15 +102,13 @@ def create_pods(body, patch, spec, annotations, labels, **_):
         status.exception = e
     else:
         status.is_enabled = True
-        if rabbit_con_service.mutate_containers(spec, ms_rabbit_con):
-            patch.spec["containers"] = spec.get("containers", [])
-            patch.spec["initContainers"] = spec.get("initContainers", [])
-            logging.info(
-                "[%s] Rabbit connector service patched containers, patch.spec: %s",
-                owner_fmt,
-                patch.spec,
-            )
-    return status
+        return ConnectorMutation(
+            status,
+            mutate_container=lambda container: rabbit_con_service.mutate_container(
+                container, False, ms_rabbit_con.vault_path
+            ),
+        )
+    return ConnectorMutation(status)
 
 
 @kopf.on.create("pods.v1", id="rabbit-connector-on-check-creation")
@@ -138,6 +144,11 @@ def check_creation(annotations, name, labels, body, **_):
     owner = get_owner_reference(body)
     status.owner = f"{owner.kind}: {owner.name}" if owner else ""
 
+    if not is_connectors_enabled(labels):
+        status.is_success = False
+        report_missing_enabled_label(body, "Rabbit")
+        return status
+
     spec = body.get("spec", {})
     if not RabbitConnectorService.any_containers_contain_required_envs(spec):
         status.is_success = False
@@ -15,23 +15,25 @@ from connectors.sentry_connector.services.sentry_connector import (
     SentryConnectorService,
 )
 from exceptions import InfrastructureServiceProblem
-from observability.metrics.decorator import monitoring, mutation_hook_monitoring
-from operators.dto import ConnectorStatus, MutationHookStatus
-from utils.common import OwnerReferenceDto, get_owner_reference
+from observability.metrics.decorator import mutation_hook_monitoring
+from operators.dto import (
+    ConnectorMutation,
+    ConnectorStatus,
+    MutationHookStatus,
+)
+from operators.labels import (
+    is_connectors_enabled,
+    report_missing_enabled_label,
+)
+from operators.provisioning import provision
+from utils.common import get_owner_reference
 from validation.exceptions import (
     AnnotationValidatorEmptyValueException,
     AnnotationValidatorMissedRequiredException,
 )
 
 
-@kopf.on.mutate("pods.v1", id="sentry-connector-on-createpods")
-@monitoring(connector_type="sentry_connector")
-def create_pods(body, patch, spec, labels, annotations, **_):
-    # At the time of the creation of Pod, the name and uid were not yet
-    # set in the manifest, so in the logs we refer to its owner.
-    owner_ref: OwnerReferenceDto = get_owner_reference(body)
-    owner_fmt = f"{owner_ref.kind}: {owner_ref.name}" if owner_ref else ""
-
+def mutate_pod(body, annotations, labels, owner_fmt) -> ConnectorMutation:
     logging.info(
         "[%s] Sentry mutate handler is called on pod creating", owner_fmt
     )
@@ -49,7 +51,7 @@ def create_pods(body, patch, spec, labels, annotations, **_):
             owner_fmt,
             e.message,
         )
-        return status
+        return ConnectorMutation(status)
     except AnnotationValidatorEmptyValueException as e:
         logging.error(
             "[%s] Problem with Sentry connector: %s",
@@ -59,14 +61,20 @@ def create_pods(body, patch, spec, labels, annotations, **_):
         )
         status.is_used = True
         status.exception = e
-        return status
+        return ConnectorMutation(status)
 
     sentry_conn_service = (
         SentryConnectorServiceFactory.create_sentry_connector_service()
     )
     logging.info("[%s] Sentry connector service is created", owner_fmt)
     try:
-        sentry_conn_service.on_create_deployment(ms_sentry_conn)
+        provision(
+            connector_type="sentry_connector",
+            reason="SentryConnector",
+            body=body,
+            on_create_deployment=sentry_conn_service.on_create_deployment,
+            ms_dto=ms_sentry_conn,
+        )
         logging.info(
             "[%s] Sentry connector service was processed in infrastructure",
             owner_fmt,
@@ -87,15 +95,13 @@ def create_pods(body, patch, spec, labels, annotations, **_):
         status.exception = e
     else:
         status.is_enabled = True
-        if sentry_conn_service.mutate_containers(spec, ms_sentry_conn):
-            patch.spec["containers"] = spec.get("containers", [])
-            patch.spec["initContainers"] = spec.get("initContainers", [])
-            logging.info(
-                "[%s] Sentry connector service patched containers, patch.spec: %s",
-                owner_fmt,
-                patch.spec,
-            )
-    return status
+        return ConnectorMutation(
+            status,
+            mutate_container=lambda container: sentry_conn_service.mutate_container(
+                container, False, ms_sentry_conn.vault_path
+            ),
+        )
+    return ConnectorMutation(status)
 
 
 @kopf.on.create("pods.v1", id="sentry-connector-on-check-creation")
@@ -131,6 +137,11 @@ def check_creation(annotations, name, labels, body, **_):
     owner = get_owner_reference(body)
     status.owner = f"{owner.kind}: {owner.name}" if owner else ""
 
+    if not is_connectors_enabled(labels):
+        status.is_success = False
+        report_missing_enabled_label(body, "Sentry")
+        return status
+
     spec = body.get("spec", {})
     if not SentryConnectorService.any_containers_contain_required_envs(spec):
         status.is_success = False
@@ -0,0 +1,34 @@
+import pytest
+from operators.atlasconnector import is_atlas_annotations_changed
+
+
+def pod(**annotations) -> dict:
+    return {"metadata": {"annotations": annotations}}
+
+
+@pytest.mark.unit
+class TestAtlasAnnotationsChanged:
+    @pytest.mark.parametrize(
+        "old,new,changed",
+        [
+            (pod(), pod(**{"ci.itlabs.io/commit-ref": "a"}), True),
+            (
+                pod(**{"ci.itlabs.io/commit-ref": "a"}),
+                pod(**{"ci.itlabs.io/commit-ref": "b"}),
+                True,
+            ),
+            (
+                pod(**{"atlas.connector.itlabs.io/business-name": "a"}),
+                pod(**{"atlas.connector.itlabs.io/business-name": "b"}),
+                True,
+            ),
+            (
+                pod(**{"ci.itlabs.io/commit-ref": "a"}),
+                pod(**{"ci.itlabs.io/commit-ref": "a", "other": "b"}),
+                False,
+            ),
+            ({"metadata": {}}, pod(other="a"), False),
+        ],
+    )
+    def test_changed(self, old, new, changed):
+        assert is_atlas_annotations_changed(old=old, new=new) == changed
@@ -18,6 +18,7 @@ from kubernetes.client import (
     V1Pod,
 )
 from kubernetes.dynamic import DynamicClient
+from settings import CONNECTORS_ENABLED_LABEL
 
 KEYCLOAK_HOST = getenv("KEYCLOAK_HOST")
 KEYCLOAK_API_URL = f"http://{KEYCLOAK_HOST}:8080"
@@ -257,6 +258,7 @@ def app_manifests(app_name) -> List[dict]:
                     "metadata": {
                         "labels": {
                             "app": app_name,
+                            CONNECTORS_ENABLED_LABEL: "true",
                         },
                         "annotations": {
                             "keycloak.connector.itlabs.io/instance-name": get_keycloak_instance_name(),
@@ -0,0 +1,51 @@
+import pytest
+from connectors.postgres_connector import specifications
+from operators import labels, postgresconnector
+from operators.dto import SuccessLabelValues
+from settings import CONNECTORS_ENABLED_LABEL
+
+
+@pytest.fixture
+def webhook_managed(mocker):
+    mocker.patch.object(labels, "ENABLED_LABELS", labels.OPT_IN_LABELS)
+
+
+@pytest.mark.unit
+class TestConnectorsEnabled:
+    def test_enabled_with_opt_in_label(self):
+        assert labels.is_connectors_enabled({CONNECTORS_ENABLED_LABEL: "true"})
+
+    @pytest.mark.parametrize(
+        "pod_labels", [None, {}, {CONNECTORS_ENABLED_LABEL: "false"}]
+    )
+    def test_disabled_without_opt_in_label(self, webhook_managed, pod_labels):
+        assert not labels.is_connectors_enabled(pod_labels)
+
+    def test_enabled_when_webhook_not_managed(self):
+        assert labels.ENABLED_LABELS is None
+        assert labels.is_connectors_enabled({})
+
+
+@pytest.mark.unit
+class TestCheckCreation:
+    annotations = {
+        specifications.PG_INSTANCE_NAME_ANNOTATION: "postgres",
+        specifications.VAULTPATH_NAME_ANNOTATION: "vault:secret/data/app",
+        specifications.DB_NAME_ANNOTATION: "app",
+        specifications.USER_NAME_ANNOTATION: "app",
+    }
+
+    def test_missing_opt_in_label_reported(self, mocker, webhook_managed):
+        event = mocker.patch("kopf.event")
+        body = {"metadata": {"name": "app"}, "spec": {"containers": []}}
+
+        result = postgresconnector.check_creation(
+            annotations=self.annotations, name="app", labels={}, body=body
+        )
+
+        status = result["postgres_connector"]
+        assert status["success"] == str(SuccessLabelValues.failure)
+        event.assert_called_once()
+        assert event.call_args.kwargs["reason"] == "PostgresConnector"
+        assert CONNECTORS_ENABLED_LABEL in event.call_args.kwargs["message"]
+        assert "unknown reasons" not in event.call_args.kwargs["message"]
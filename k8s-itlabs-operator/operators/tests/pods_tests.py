@@ -0,0 +1,244 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from observability.metrics.metrics import app_pod_connectors_in_progress
+from operators import pods
+from operators.dto import ConnectorMutation, ConnectorStatus
+
+
+def env_connector(env_name: str):
+    def mutate_container(container: dict) -> bool:
+        envs = container.setdefault("env", [])
+        if env_name in {env["name"] for env in envs}:
+            return False
+        envs.append({"name": env_name, "value": "vault:secret#KEY"})
+        return True
+
+    def mutate_pod(body, annotations, labels, owner_fmt):
+        return ConnectorMutation(
+            ConnectorStatus(is_enabled=True, is_used=True),
+            mutate_container=mutate_container,
+        )
+
+    return mutate_pod
+
+
+def unused_connector(body, annotations, labels, owner_fmt):
+    return ConnectorMutation(ConnectorStatus(is_used=False))
+
+
+async def create_pods(spec: dict):
+    patch = SimpleNamespace(spec={})
+    result = await pods.create_pods(
+        body={"metadata": {}, "spec": spec},
+        patch=patch,
+        spec=spec,
+        annotations={},
+        labels={},
+    )
+    return patch, result
+
+
+@pytest.mark.unit
+class TestCreatePods:
+    @pytest.mark.asyncio
+    async def test_envs_of_all_connectors_added_once(self, mocker):
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("first_connector", env_connector("FIRST"), 1),
+                ("second_connector", env_connector("SECOND"), 1),
+                ("unused_connector", unused_connector, 1),
+            ),
+        )
+        spec = {
+            "containers": [{"name": "app"}],
+            "initContainers": [{"name": "init", "env": [{"name": "FIRST"}]}],
+        }
+        patch, result = await create_pods(spec)
+
+        assert [env["name"] for env in patch.spec["containers"][0]["env"]] == [
+            "FIRST",
+            "SECOND",
+        ]
+        assert [
+            env["name"] for env in patch.spec["initContainers"][0]["env"]
+        ] == ["FIRST", "SECOND"]
+        assert result == {
+            "first_connector": {
+                "enabled": "enabled",
+                "used": "used",
+                "exception": "",
+            },
+            "second_connector": {
+                "enabled": "enabled",
+                "used": "used",
+                "exception": "",
+            },
+            "unused_connector": {
+                "enabled": "undefined",
+                "used": "unused",
+                "exception": "",
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_not_patched_without_changes(self, mocker):
+        mocker.patch.object(
+            pods, "POD_CONNECTORS", (("unused_connector", unused_connector, 1),)
+        )
+        patch, _ = await create_pods({"containers": [{"name": "app"}]})
+        assert patch.spec == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_connector_does_not_stop_others(self, mocker):
+        calls = []
+
+        def failed_connector(body, annotations, labels, owner_fmt):
+            raise Exception("Unexpected problem")
+
+        def other_connector(*args):
+            calls.append(1)
+            return unused_connector(*args)
+
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("failed_connector", failed_connector, 1),
+                ("other_connector", other_connector, 1),
+            ),
+        )
+        patch, result = await create_pods({"containers": [{"name": "app"}]})
+        assert calls == [1]
+        assert result["failed_connector"]["exception"] == "Exception"
+        assert result["other_connector"]["exception"] == ""
+
+    @pytest.mark.asyncio
+    async def test_failed_connector_does_not_drop_other_mutations(self, mocker):
+        def failed_connector(body, annotations, labels, owner_fmt):
+            raise Exception("Unexpected problem")
+
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("failed_connector", failed_connector, 1),
+                ("postgres_connector", env_connector("DATABASE_HOST"), 1),
+            ),
+        )
+        patch, _ = await create_pods({"containers": [{"name": "app"}]})
+        assert patch.spec["containers"][0]["env"] == [
+            {"name": "DATABASE_HOST", "value": "vault:secret#KEY"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_connectors_processed_concurrently(self, mocker):
+        barrier = threading.Barrier(2, timeout=1)
+
+        def concurrent_connector(env_name: str):
+            mutate_pod = env_connector(env_name)
+
+            def wait_other_connector(*args):
+                # Fails if connectors are processed one after another.
+                barrier.wait()
+                return mutate_pod(*args)
+
+            return wait_other_connector
+
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("first_connector", concurrent_connector("FIRST"), 2),
+                ("second_connector", concurrent_connector("SECOND"), 2),
+            ),
+        )
+        patch, _ = await create_pods({"containers": [{"name": "app"}]})
+        assert len(patch.spec["containers"][0]["env"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_connector_timed_out(self, mocker):
+        release = threading.Event()
+
+        def slow_connector(*args):
+            release.wait(1)
+            return env_connector("SLOW")(*args)
+
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("slow_connector", slow_connector, 0.05),
+                ("fast_connector", env_connector("FAST"), 1),
+            ),
+        )
+        patch, result = await create_pods({"containers": [{"name": "app"}]})
+        release.set()
+        assert patch.spec["containers"][0]["env"] == [
+            {"name": "FAST", "value": "vault:secret#KEY"}
+        ]
+        assert result["slow_connector"]["exception"] == "TimeoutError"
+
+
+@pytest.mark.unit
+class TestWebhookConfiguration:
+    def test_opt_in_label_selected(self):
+        webhook = pods.webhook_configuration()["webhooks"][0]
+        assert webhook["clientConfig"]["service"]["path"] == (
+            "/connectors-on-createpods"
+        )
+        assert webhook["objectSelector"] == {
+            "matchLabels": {"connectors.itlabs.io/enabled": "true"}
+        }
+        assert webhook["failurePolicy"] == "Ignore"
+
+    def test_namespaces_excluded(self, mocker):
+        mocker.patch(
+            "settings.WEBHOOK_EXCLUDED_NAMESPACES", ["kube-system", ""]
+        )
+        webhook = pods.webhook_configuration()["webhooks"][0]
+        assert webhook["namespaceSelector"]["matchExpressions"] == [
+            {
+                "key": "kubernetes.io/metadata.name",
+                "operator": "NotIn",
+                "values": ["k8s-itlabs-operator", "kube-system"],
+            }
+        ]
+
+
+@pytest.mark.unit
+class TestConnectorsExecutor:
+    def test_executor_sized_for_concurrent_admissions(self):
+        assert pods.executor._max_workers == len(pods.POD_CONNECTORS) * (
+            pods.operator_settings.CONNECTORS_CONCURRENT_ADMISSIONS
+        )
+
+    @pytest.mark.asyncio
+    async def test_timed_out_connectors_kept_in_progress(self, mocker):
+        release = threading.Event()
+        mocker.patch.object(pods, "executor", ThreadPoolExecutor(1))
+        mocker.patch.object(pods, "EXECUTOR_WORKERS", 1)
+
+        def slow_connector(*args):
+            release.wait(1)
+            return unused_connector(*args)
+
+        mocker.patch.object(
+            pods,
+            "POD_CONNECTORS",
+            (
+                ("slow_connector", slow_connector, 0.05),
+                ("queued_connector", unused_connector, 0.05),
+            ),
+        )
+        _, result = await create_pods({"containers": [{"name": "app"}]})
+        assert result["queued_connector"]["exception"] == "TimeoutError"
+        assert app_pod_connectors_in_progress._value.get() == 1
+
+        release.set()
+        pods.executor.shutdown(wait=True)
+        assert app_pod_connectors_in_progress._value.get() == 0
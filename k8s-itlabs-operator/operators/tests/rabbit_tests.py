@@ -16,6 +16,7 @@ from kubernetes.client import (
     V1PodList,
 )
 from kubernetes.dynamic import DynamicClient
+from settings import CONNECTORS_ENABLED_LABEL
 
 APP_REPLICAS = 2
 APP_DEPLOYMENT_NAMESPACE = "default"
@@ -73,6 +74,7 @@ def app_manifests(app_name) -> List[dict]:
                     "metadata": {
                         "labels": {
                             "app": app_name,
+                            CONNECTORS_ENABLED_LABEL: "true",
                         },
                         "annotations": {
                             "rabbit.connector.itlabs.io/instance-name": get_rabbit_instance_name(),
@@ -15,6 +15,7 @@ from kubernetes.client import (
     V1Pod,
 )
 from kubernetes.dynamic import DynamicClient
+from settings import CONNECTORS_ENABLED_LABEL
 
 SENTRY_HOST = getenv("REAL_IP")
 SENTRY_URL = f"http://{SENTRY_HOST}:9000"
@@ -64,6 +65,7 @@ def app_manifests(app_name) -> List[dict]:
                     "metadata": {
                         "labels": {
                             "app": app_name,
+                            CONNECTORS_ENABLED_LABEL: "true",
                         },
                         "annotations": {
                             "sentry.connector.itlabs.io/instance-name": get_sentry_instance_name(),
@@ -17,3 +17,90 @@ CLUSTER_NAME = getenv("CLUSTER_NAME", "unknown")
 SENTRY_DSN = getenv("SENTRY_DSN")
 
 LOG_LEVEL = getenv("LOG_LEVEL", "DEBUG")
+
+# Asynchronous provisioning: pods are mutated immediately and connectors
+# infrastructure is provisioned in background workers
+ASYNC_PROVISIONING = getenv("ASYNC_PROVISIONING", "false").lower() == "true"
+PROVISIONING_WORKERS = int(getenv("PROVISIONING_WORKERS", "4"))
+PROVISIONING_MAX_RETRIES = int(getenv("PROVISIONING_MAX_RETRIES", "5"))
+PROVISIONING_RETRY_DELAY = int(getenv("PROVISIONING_RETRY_DELAY", "2"))
+PROVISIONING_MAX_RETRY_DELAY = int(getenv("PROVISIONING_MAX_RETRY_DELAY", "60"))
+# Microservices provisioned for less than TTL seconds ago are not
+# provisioned again while connector custom resource is unchanged, 0 disables
+PROVISIONING_CACHE_TTL = int(getenv("PROVISIONING_CACHE_TTL", "300"))
+# Seconds for processing of every connector on pod admission, should be
+# less than timeout of admission webhook
+CONNECTOR_TIMEOUT = int(getenv("CONNECTOR_TIMEOUT", "20"))
+POSTGRES_CONNECTOR_TIMEOUT = int(
+    getenv("POSTGRES_CONNECTOR_TIMEOUT", str(CONNECTOR_TIMEOUT))
+)
+RABBIT_CONNECTOR_TIMEOUT = int(
+    getenv("RABBIT_CONNECTOR_TIMEOUT", str(CONNECTOR_TIMEOUT))
+)
+SENTRY_CONNECTOR_TIMEOUT = int(
+    getenv("SENTRY_CONNECTOR_TIMEOUT", str(CONNECTOR_TIMEOUT))
+)
+KEYCLOAK_CONNECTOR_TIMEOUT = int(
+    getenv("KEYCLOAK_CONNECTOR_TIMEOUT", str(CONNECTOR_TIMEOUT))
+)
+# Seconds admissions of other pods of the same microservice wait for its
+# provisioning started by concurrent admission
+PROVISIONING_WAIT_TIMEOUT = int(
+    getenv("PROVISIONING_WAIT_TIMEOUT", str(CONNECTOR_TIMEOUT))
+)
+# Seconds operator waits on shutdown for queued provisioning jobs and
+# buffered Atlas updates, each of them, before they are dropped
+SHUTDOWN_DRAIN_TIMEOUT = float(getenv("SHUTDOWN_DRAIN_TIMEOUT", "10"))
+# Pod admissions processed at once, every admission runs all connectors in
+# threads and connectors that timed out keep their threads until done
+CONNECTORS_CONCURRENT_ADMISSIONS = int(
+    getenv("CONNECTORS_CONCURRENT_ADMISSIONS", "8")
+)
+
+# Microservices updates are sent to Atlas in background by batches of
+# ATLAS_BATCH_SIZE or every ATLAS_FLUSH_INTERVAL seconds, each update of
+# batch is sent by one of ATLAS_WORKERS threads
+ATLAS_BATCH_SIZE = int(getenv("ATLAS_BATCH_SIZE", "20"))
+ATLAS_FLUSH_INTERVAL = float(getenv("ATLAS_FLUSH_INTERVAL", "1"))
+ATLAS_WORKERS = int(getenv("ATLAS_WORKERS", "4"))
+ATLAS_MAX_RETRIES = int(getenv("ATLAS_MAX_RETRIES", "5"))
+ATLAS_RETRY_DELAY = int(getenv("ATLAS_RETRY_DELAY", "2"))
+ATLAS_MAX_RETRY_DELAY = int(getenv("ATLAS_MAX_RETRY_DELAY", "60"))
+# Number of microservices, hashes of which are kept to skip sending of
+# unchanged microservices to Atlas, least recently used are dropped
+ATLAS_SENT_HASHES_MAX_SIZE = int(getenv("ATLAS_SENT_HASHES_MAX_SIZE", "10000"))
+
+# Number of ServiceMonitors applied or deleted concurrently on sync
+MONITORING_SYNC_WORKERS = int(getenv("MONITORING_SYNC_WORKERS", "8"))
+# ServiceMonitors are synced again every MONITORING_RESYNC_INTERVAL seconds
+# after startup, so ServiceMonitors deleted or changed by others are
+# restored (0 disables resync)
+MONITORING_RESYNC_INTERVAL = float(getenv("MONITORING_RESYNC_INTERVAL", "300"))
+
+# Mutating webhook configuration is managed by operator: apiserver calls
+# admission webhook only for pods labeled with opt-in label, so other pods
+# are neither delayed nor blocked by operator. Empty label selects all pods
+WEBHOOK_MANAGED = getenv("WEBHOOK_MANAGED", "false").lower() == "true"
+WEBHOOK_CONFIGURATION_NAME = getenv(
+    "WEBHOOK_CONFIGURATION_NAME", "k8s-itlabs-operator-connectors"
+)
+WEBHOOK_SERVICE_NAME = getenv("WEBHOOK_SERVICE_NAME", "k8s-itlabs-operator")
+WEBHOOK_TIMEOUT = int(getenv("WEBHOOK_TIMEOUT", "30"))
+CONNECTORS_ENABLED_LABEL = getenv(
+    "CONNECTORS_ENABLED_LABEL", "connectors.itlabs.io/enabled"
+)
+# Comma separated namespaces, pods of which are never sent to webhook
+WEBHOOK_EXCLUDED_NAMESPACES = getenv(
+    "WEBHOOK_EXCLUDED_NAMESPACES", "kube-system,vswh"
+).split(",")
+
+# Pods and services are listed and watched by operator only with these
+# selectors, so objects of other namespaces or without labels are not kept
+# in memory and do not wake handlers. Empty selector selects all objects
+WATCH_PODS_LABEL_SELECTOR = getenv("WATCH_PODS_LABEL_SELECTOR", "")
+WATCH_SERVICES_LABEL_SELECTOR = getenv("WATCH_SERVICES_LABEL_SELECTOR", "")
+# Comma separated namespaces, pods and services of which are not watched
+WATCH_EXCLUDED_NAMESPACES = getenv("WATCH_EXCLUDED_NAMESPACES", "").split(",")
+# Pattern of watched namespaces, e.g. "app-*,!app-test", that is read by
+# `kopf run` as --namespace option. Empty pattern selects all namespaces
+WATCH_NAMESPACES = getenv("KOPF_RUN_NAMESPACE", "")
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 import ujson
-from kubernetes import client as kube_client
+from clients.k8s.k8s_client import KubernetesClient
 
 
 class WrappedObj:
@@ -12,7 +12,7 @@ class WrappedObj:
 
 
 def deserialize_dict_to_kubeobj(d: dict, kubeobjclass):
-    kube_api = kube_client.ApiClient()
+    kube_api = KubernetesClient.api_client()
     wrapped_obj = WrappedObj(data=ujson.dumps(d))
     return kube_api.deserialize(wrapped_obj, kubeobjclass)
 
@@ -63,3 +63,24 @@ def strtobool(val):
     if val in ("n", "no", "f", "false", "off", "0"):
         return 0
     raise ValueError(f"invalid truth value {val}")
+
+
+def get_owner_object(body: dict) -> Optional[dict]:
+    """
+    Returns owner of object in form suitable for kopf events, pod does
+    not have a name yet at the time of admission, so events are posted
+    to its owner.
+    """
+    try:
+        owner = body.get("metadata", {}).get("ownerReferences", [])[0]
+    except IndexError:
+        return None
+    return {
+        "apiVersion": owner.get("apiVersion"),
+        "kind": owner.get("kind"),
+        "metadata": {
+            "name": owner.get("name"),
+            "uid": owner.get("uid"),
+            "namespace": body.get("metadata", {}).get("namespace"),
+        },
+    }
@@ -1,23 +1,247 @@
-from threading import Condition
-from typing import List
+import copy
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from observability.metrics.metrics import (
+    app_connector_source_lock_hold_seconds,
+    app_connector_source_lock_wait_seconds,
+)
+
+
+class ConnectorSourceLockTimeout(Exception):
+    pass
+
+
+class ConnectorSourceLockLost(Exception):
+    pass
+
+
+class SharedCallTimeout(Exception):
+    pass
+
+
+class SharedCallFailed(Exception):
+    pass
+
+
+class AbstractDistributedLock:
+    """
+    Lock shared by several operator replicas.
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self):
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def is_lost(self) -> bool:
+        """
+        Whether lock stopped being held before release, e.g. it was taken
+        by other replica.
+        """
+        raise NotImplementedError
+
+
+class _SourceLock:
+    __slots__ = ("lock", "references")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Number of threads holding or waiting for the lock, lock is
+        # removed from registry when nobody uses it.
+        self.references = 0
 
 
 class ConnectorSourceLock:
-    _lock = Condition()
-    _lock_sources: List[str] = []
+    """
+    Lock of connector source identified by hash, every source has its own
+    lock, so sources are locked independently.
 
-    def __init__(self, source_hash: str):
+    When distributed locks are used, source is locked in process first,
+    so only one thread of replica competes with other replicas.
+    """
+
+    _registry_lock = threading.Lock()
+    _locks: Dict[str, _SourceLock] = {}
+    _distributed_lock_factory: Optional[
+        Callable[[str], AbstractDistributedLock]
+    ] = None
+
+    @classmethod
+    def use_distributed_locks(
+        cls, factory: Optional[Callable[[str], AbstractDistributedLock]]
+    ):
+        cls._distributed_lock_factory = factory
+
+    def __init__(self, source_hash: str, timeout: Optional[float] = None):
         self.source_hash = source_hash
+        self.timeout = timeout
+        self._source_lock: Optional[_SourceLock] = None
+        self._distributed_lock: Optional[AbstractDistributedLock] = None
+        self._acquired_at = 0.0
 
     def __enter__(self):
-        with self._lock:
-            self._lock.wait_for(self.is_source_unlocked)
-            self._lock_sources.append(self.source_hash)
+        with self._registry_lock:
+            source_lock = self._locks.get(self.source_hash)
+            if source_lock is None:
+                source_lock = _SourceLock()
+                self._locks[self.source_hash] = source_lock
+            source_lock.references += 1
+
+        started_at = time.monotonic()
+        acquired = source_lock.lock.acquire(
+            timeout=-1 if self.timeout is None else self.timeout
+        )
+        if acquired:
+            try:
+                acquired = self._acquire_distributed(started_at)
+            except BaseException:
+                source_lock.lock.release()
+                self._dereference(source_lock)
+                raise
+            if not acquired:
+                source_lock.lock.release()
+        self._acquired_at = time.monotonic()
+        app_connector_source_lock_wait_seconds.observe(
+            self._acquired_at - started_at
+        )
+        if not acquired:
+            self._dereference(source_lock)
+            raise ConnectorSourceLockTimeout(
+                f"Source {self.source_hash} is not unlocked in "
+                f"{self.timeout} seconds"
+            )
+        self._source_lock = source_lock
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        source_lock, self._source_lock = self._source_lock, None
+        app_connector_source_lock_hold_seconds.observe(
+            time.monotonic() - self._acquired_at
+        )
+        is_lost = False
+        try:
+            if self._distributed_lock:
+                is_lost = self._distributed_lock.is_lost
+                self._distributed_lock.release()
+                self._distributed_lock = None
+        finally:
+            source_lock.lock.release()
+            self._dereference(source_lock)
+        if is_lost and exc_type is None:
+            # Other replica could process the same source meanwhile, so
+            # result of critical section is not trusted.
+            raise ConnectorSourceLockLost(
+                f"Lock of source {self.source_hash} is lost before release"
+            )
+
+    def ensure_held(self):
+        """
+        Raises if distributed lock is lost, so critical section can be
+        aborted before its next change of source.
+        """
+        if self._distributed_lock and self._distributed_lock.is_lost:
+            raise ConnectorSourceLockLost(
+                f"Lock of source {self.source_hash} is lost"
+            )
+
+    def _acquire_distributed(self, started_at: float) -> bool:
+        factory = ConnectorSourceLock._distributed_lock_factory
+        if factory is None:
+            return True
+        timeout = None
+        if self.timeout is not None:
+            timeout = max(self.timeout - (time.monotonic() - started_at), 0)
+        distributed_lock = factory(self.source_hash)
+        if not distributed_lock.acquire(timeout):
+            return False
+        self._distributed_lock = distributed_lock
+        return True
+
+    def _dereference(self, source_lock: _SourceLock):
+        with self._registry_lock:
+            source_lock.references -= 1
+            if source_lock.references == 0:
+                del self._locks[self.source_hash]
+
+    @classmethod
+    def locked_sources_count(cls) -> int:
+        with cls._registry_lock:
+            return len(cls._locks)
+
+
+class _Call:
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Executes function once for concurrent calls with the same key, other
+    callers wait for it and get its result or exception.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        # Seconds concurrent callers wait for the first one, None waits
+        # until it is done.
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns result of function and whether it was shared with
+        concurrent call.
+        """
         with self._lock:
-            self._lock_sources.remove(self.source_hash)
-            self._lock.notify()
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            if not call.done.wait(self.timeout):
+                raise SharedCallTimeout(
+                    f"Call {key} is not done in {self.timeout} seconds"
+                )
+            if call.exception is not None:
+                raise self._shared_exception(
+                    key, call.exception
+                ) from call.exception
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
 
-    def is_source_unlocked(self):
-        return self.source_hash not in self._lock_sources
+    @staticmethod
+    def _shared_exception(key: str, exception: BaseException) -> BaseException:
+        """
+        Returns new exception of the same type for every caller, so
+        concurrent callers do not share and extend one traceback.
+        """
+        try:
+            return copy.copy(exception)
+        except Exception:
+            return SharedCallFailed(f"Call {key} failed: {exception!r}")
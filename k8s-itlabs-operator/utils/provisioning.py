@@ -0,0 +1,305 @@
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+import settings as operator_settings
+from observability.metrics.metrics import (
+    app_provisioning_cache_hits_total,
+    app_provisioning_cache_misses_total,
+    app_provisioning_coalesced_total,
+    app_provisioning_job_latency_seconds,
+    app_provisioning_jobs_total,
+    app_provisioning_queue_depth,
+)
+from utils.concurrency import SingleFlight
+
+logger = logging.getLogger("provisioning")
+
+
+@dataclass
+class ProvisioningJob:
+    key: str
+    connector_type: str
+    func: Callable[[], Any]
+    on_success: Optional[Callable[[], None]] = None
+    on_failure: Optional[Callable[[Exception], None]] = None
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Context of caller (e.g. kopf handler) is kept to post kopf events
+    # from worker threads.
+    context: contextvars.Context = field(
+        default_factory=contextvars.copy_context
+    )
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    ready_at: float
+    sequence: int
+    job: ProvisioningJob = field(compare=False)
+
+
+class ProvisioningQueue:
+    """
+    In-process queue of provisioning jobs executed by pool of worker
+    threads.
+
+    Job is skipped if job with the same key is already waiting or running.
+    Failed job is retried with exponential backoff until max retries.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_retries: int,
+        retry_delay: float,
+        max_retry_delay: float,
+    ):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._jobs: List[ScheduledJob] = []
+        self._keys: Set[str] = set()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._jobs)
+
+    def enqueue(self, job: ProvisioningJob) -> bool:
+        with self._condition:
+            if self._stopped:
+                logger.warning(
+                    "[%s] Provisioning is not queued, queue is stopped",
+                    job.key,
+                )
+                return False
+            if job.key in self._keys:
+                app_provisioning_jobs_total.labels(
+                    connector_type=job.connector_type, status="deduplicated"
+                ).inc()
+                return False
+            self._keys.add(job.key)
+            self._schedule(job, time.monotonic())
+            self._start()
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops queue after jobs ready to run are done, jobs waiting for
+        retry are dropped. Returns whether workers are stopped in timeout.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(
+                None
+                if deadline is None
+                else max(deadline - time.monotonic(), 0)
+            )
+        with self._condition:
+            is_stopped = not any(thread.is_alive() for thread in self._threads)
+            if is_stopped and self._jobs:
+                logger.warning(
+                    "Provisioning queue is stopped, %d jobs waiting for "
+                    "retry are dropped",
+                    len(self._jobs),
+                )
+        return is_stopped
+
+    def _start(self):
+        if self._threads:
+            return
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"provisioning-{number}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _schedule(self, job: ProvisioningJob, ready_at: float):
+        heapq.heappush(
+            self._jobs, ScheduledJob(ready_at, next(self._sequence), job)
+        )
+        app_provisioning_queue_depth.set(len(self._jobs))
+        self._condition.notify()
+
+    def _next_job(self) -> Optional[ProvisioningJob]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._jobs and self._jobs[0].ready_at <= now:
+                    job = heapq.heappop(self._jobs).job
+                    app_provisioning_queue_depth.set(len(self._jobs))
+                    return job
+                if self._stopped:
+                    return None
+                timeout = self._jobs[0].ready_at - now if self._jobs else None
+                self._condition.wait(timeout)
+
+    def _work(self):
+        while (job := self._next_job()) is not None:
+            job.context.run(self._process, job)
+
+    def _process(self, job: ProvisioningJob):
+        job.attempts += 1
+        try:
+            job.func()
+        except Exception as e:
+            if job.attempts <= self.max_retries and not self._stopped:
+                delay = min(
+                    self.retry_delay * 2 ** (job.attempts - 1),
+                    self.max_retry_delay,
+                )
+                logger.warning(
+                    "[%s] Provisioning attempt %d failed, retry in %s seconds: %s",
+                    job.key,
+                    job.attempts,
+                    delay,
+                    e,
+                )
+                app_provisioning_jobs_total.labels(
+                    connector_type=job.connector_type, status="retry"
+                ).inc()
+                with self._condition:
+                    self._schedule(job, time.monotonic() + delay)
+                return
+            logger.error("[%s] Provisioning failed", job.key, exc_info=e)
+            self._finish(job, "failure")
+            self._callback(job.on_failure, e)
+        else:
+            self._finish(job, "success")
+            self._callback(job.on_success)
+
+    def _finish(self, job: ProvisioningJob, status: str):
+        with self._condition:
+            self._keys.discard(job.key)
+        app_provisioning_jobs_total.labels(
+            connector_type=job.connector_type, status=status
+        ).inc()
+        app_provisioning_job_latency_seconds.labels(
+            connector_type=job.connector_type, status=status
+        ).observe(time.monotonic() - job.enqueued_at)
+
+    @staticmethod
+    def _callback(callback: Optional[Callable], *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Provisioning callback failed")
+
+
+class ProvisionedCache:
+    """
+    Remembers recently provisioned microservices, so admissions of other
+    pods of the same deployment skip provisioning.
+
+    Entry is valid until TTL is expired and while connector custom
+    resource has the same resource version.
+    """
+
+    def __init__(self, ttl: float, wait_timeout: Optional[float] = None):
+        self.ttl = ttl
+        # Entries with the same TTL are ordered by expiration time.
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight(timeout=wait_timeout)
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def is_provisioned(
+        self, connector_type: str, key: str, resource_version: str
+    ) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            is_provisioned = (
+                entry is not None
+                and entry[0] == resource_version
+                and entry[1] > time.monotonic()
+            )
+            if entry is not None and not is_provisioned:
+                del self._entries[key]
+        if is_provisioned:
+            app_provisioning_cache_hits_total.labels(
+                connector_type=connector_type
+            ).inc()
+        else:
+            app_provisioning_cache_misses_total.labels(
+                connector_type=connector_type
+            ).inc()
+        return is_provisioned
+
+    def add(self, key: str, resource_version: str):
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (resource_version, now + self.ttl)
+            while self._entries:
+                oldest_key, (_, expires_at) = next(iter(self._entries.items()))
+                if expires_at > now:
+                    break
+                del self._entries[oldest_key]
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def provision(
+        self,
+        connector_type: str,
+        key: str,
+        resource_version: Optional[str],
+        func: Callable[[], Any],
+    ):
+        """
+        Calls provisioning function if microservice was not provisioned
+        with the same version of connector custom resource recently.
+        Concurrent calls for the same microservice wait for the first one
+        and share its result.
+        """
+        is_cached = self.ttl > 0 and bool(resource_version)
+        if is_cached and self.is_provisioned(
+            connector_type, key, resource_version
+        ):
+            return
+
+        def provision():
+            try:
+                func()
+            except Exception:
+                self.invalidate(key)
+                raise
+            if is_cached:
+                self.add(key, resource_version)
+
+        _, is_shared = self._flight.do(f"{key}:{resource_version}", provision)
+        if is_shared:
+            app_provisioning_coalesced_total.labels(
+                connector_type=connector_type
+            ).inc()
+
+
+provisioned_cache = ProvisionedCache(
+    ttl=operator_settings.PROVISIONING_CACHE_TTL,
+    wait_timeout=operator_settings.PROVISIONING_WAIT_TIMEOUT,
+)
@@ -1,8 +1,17 @@
 import asyncio
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
-from utils.concurrency import ConnectorSourceLock
+from utils.concurrency import (
+    ConnectorSourceLock,
+    ConnectorSourceLockTimeout,
+    SharedCallFailed,
+    SharedCallTimeout,
+    SingleFlight,
+)
 
 
 @pytest.mark.unit
@@ -65,3 +74,152 @@ class TestConnectorSourceLock:
         await asyncio.sleep(self.thread_sleep_time)
         assert thread_1_task.done() is True
         assert thread_2_task.done() is True
+
+    def test_lock_timeout(self):
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with ConnectorSourceLock("timeout-resource"):
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+        with pytest.raises(ConnectorSourceLockTimeout):
+            with ConnectorSourceLock("timeout-resource", timeout=0.01):
+                pass
+        release.set()
+        thread.join()
+        with ConnectorSourceLock("timeout-resource", timeout=0.01):
+            pass
+        assert ConnectorSourceLock.locked_sources_count() == 0
+
+    def test_lock_stress(self):
+        threads_count = 300
+        keys_count = 10
+        barrier = threading.Barrier(threads_count)
+        holders = defaultdict(int)
+        counters = defaultdict(int)
+        violations = []
+
+        def run(number: int):
+            key = f"resource-{number % keys_count}"
+            barrier.wait()
+            for _ in range(20):
+                with ConnectorSourceLock(key):
+                    holders[key] += 1
+                    if holders[key] != 1:
+                        violations.append(key)
+                    # Not atomic read-modify-write, broken without lock.
+                    value = counters[key]
+                    time.sleep(0)
+                    counters[key] = value + 1
+                    holders[key] -= 1
+
+        with ThreadPoolExecutor(max_workers=threads_count) as executor:
+            list(executor.map(run, range(threads_count)))
+
+        assert not violations
+        assert sum(counters.values()) == threads_count * 20
+        assert all(
+            value == threads_count // keys_count * 20
+            for value in counters.values()
+        )
+        assert ConnectorSourceLock.locked_sources_count() == 0
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    threads_count = 30
+
+    def run_concurrently(self, flight: SingleFlight, func):
+        barrier = threading.Barrier(self.threads_count)
+
+        def call():
+            barrier.wait()
+            try:
+                return flight.do("key", func)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.threads_count) as executor:
+            futures = [executor.submit(call) for _ in range(self.threads_count)]
+        return [future.result() for future in futures]
+
+    def test_result_shared(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        results = self.run_concurrently(SingleFlight(), func)
+        assert len(calls) == 1
+        assert {result for result, _ in results} == {"result"}
+        assert sum(not is_shared for _, is_shared in results) == 1
+
+    def test_exception_shared(self):
+        calls = []
+        error = Exception("Problem")
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            raise error
+
+        results = self.run_concurrently(SingleFlight(), func)
+        assert len(calls) == 1
+        assert sum(result is error for result in results) == 1
+        shared = [result for result in results if result is not error]
+        assert len({id(result) for result in shared}) == len(shared)
+        assert all(
+            type(result) is Exception
+            and result.args == error.args
+            and result.__cause__ is error
+            for result in shared
+        )
+
+    def test_exception_not_copied_shared(self):
+        class ProblemError(Exception):
+            def __init__(self, message: str, code: int):
+                super().__init__(message)
+                self.code = code
+
+        def func():
+            time.sleep(0.1)
+            raise ProblemError("Problem", 500)
+
+        results = self.run_concurrently(SingleFlight(), func)
+        leaders = [r for r in results if isinstance(r, ProblemError)]
+        followers = [r for r in results if isinstance(r, SharedCallFailed)]
+        assert len(leaders) == 1
+        assert len(followers) == self.threads_count - 1
+        assert all(r.__cause__ is leaders[0] for r in followers)
+
+    def test_wait_timeout(self):
+        flight = SingleFlight(timeout=0.1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def func():
+            started.set()
+            release.wait()
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(flight.do, "key", func)
+            started.wait()
+            try:
+                with pytest.raises(SharedCallTimeout):
+                    flight.do("key", func)
+            finally:
+                release.set()
+            assert leader.result() == ("result", False)
+
+    def test_sequential_calls_not_shared(self):
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == (1, False)
+        assert flight.do("key", lambda: 2) == (2, False)
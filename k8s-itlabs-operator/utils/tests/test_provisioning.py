@@ -0,0 +1,253 @@
+import contextvars
+import threading
+
+import pytest
+from utils.common import get_owner_object
+from utils.provisioning import (
+    ProvisionedCache,
+    ProvisioningJob,
+    ProvisioningQueue,
+)
+
+WAIT_TIMEOUT = 5
+
+
+@pytest.fixture
+def queue():
+    queue = ProvisioningQueue(
+        workers=2, max_retries=2, retry_delay=0, max_retry_delay=0
+    )
+    yield queue
+    queue.stop()
+
+
+def create_job(func, **kwargs) -> ProvisioningJob:
+    done = threading.Event()
+    result = {}
+
+    def on_success():
+        result["success"] = True
+        done.set()
+
+    def on_failure(e):
+        result["failure"] = e
+        done.set()
+
+    job = ProvisioningJob(
+        key=kwargs.pop("key", "key"),
+        connector_type="test_connector",
+        func=func,
+        on_success=on_success,
+        on_failure=on_failure,
+        **kwargs,
+    )
+    job.done = done
+    job.result = result
+    return job
+
+
+@pytest.mark.unit
+class TestProvisioningQueue:
+    def test_job_done(self, queue):
+        job = create_job(lambda: None)
+        assert queue.enqueue(job)
+        assert job.done.wait(WAIT_TIMEOUT)
+        assert job.result == {"success": True}
+        assert job.attempts == 1
+
+    def test_same_job_deduplicated(self, queue):
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(WAIT_TIMEOUT)
+
+        job = create_job(func)
+        assert queue.enqueue(job)
+        assert not queue.enqueue(create_job(func))
+        release.set()
+        assert job.done.wait(WAIT_TIMEOUT)
+        assert len(calls) == 1
+
+        # Job with the same key is accepted again when previous is done.
+        assert queue.enqueue(create_job(lambda: None))
+
+    def test_job_retried(self, queue):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) < 2:
+                raise Exception("Temporary problem")
+
+        job = create_job(func)
+        queue.enqueue(job)
+        assert job.done.wait(WAIT_TIMEOUT)
+        assert job.result == {"success": True}
+        assert job.attempts == 2
+
+    def test_job_failed_after_max_retries(self, queue):
+        error = Exception("Permanent problem")
+
+        def func():
+            raise error
+
+        job = create_job(func)
+        queue.enqueue(job)
+        assert job.done.wait(WAIT_TIMEOUT)
+        assert job.result == {"failure": error}
+        assert job.attempts == queue.max_retries + 1
+        assert queue.enqueue(create_job(lambda: None))
+
+    def test_job_run_in_caller_context(self, queue):
+        var = contextvars.ContextVar("var")
+        var.set("handler")
+        values = []
+        job = create_job(lambda: values.append(var.get(None)))
+        queue.enqueue(job)
+        assert job.done.wait(WAIT_TIMEOUT)
+        assert values == ["handler"]
+
+    def test_ready_jobs_done_on_stop(self, queue):
+        release = threading.Event()
+        running = create_job(lambda: release.wait(WAIT_TIMEOUT), key="running")
+        waiting = create_job(lambda: None, key="waiting")
+        queue.workers = 1
+        queue.enqueue(running)
+        queue.enqueue(waiting)
+        assert not queue.stop(timeout=0.1)
+        release.set()
+        assert queue.stop(timeout=WAIT_TIMEOUT)
+        assert running.result == {"success": True}
+        assert waiting.result == {"success": True}
+
+    def test_job_not_retried_after_stop(self):
+        queue = ProvisioningQueue(
+            workers=1, max_retries=2, retry_delay=60, max_retry_delay=60
+        )
+        attempted = threading.Event()
+
+        def func():
+            attempted.set()
+            raise Exception("Temporary problem")
+
+        job = create_job(func)
+        queue.enqueue(job)
+        assert attempted.wait(WAIT_TIMEOUT)
+        assert queue.stop(timeout=WAIT_TIMEOUT)
+        assert job.attempts == 1
+
+    def test_job_not_queued_after_stop(self, queue):
+        queue.stop()
+        assert not queue.enqueue(create_job(lambda: None))
+
+
+@pytest.mark.unit
+class TestProvisionedCache:
+    def test_provisioned_once(self, mocker):
+        cache = ProvisionedCache(ttl=60)
+        func = mocker.Mock()
+        cache.provision("test_connector", "key", "1", func)
+        cache.provision("test_connector", "key", "1", func)
+        assert func.call_count == 1
+
+    def test_changed_resource_version(self, mocker):
+        cache = ProvisionedCache(ttl=60)
+        func = mocker.Mock()
+        cache.provision("test_connector", "key", "1", func)
+        cache.provision("test_connector", "key", "2", func)
+        cache.provision("test_connector", "key", "2", func)
+        assert func.call_count == 2
+
+    def test_expired(self, mocker):
+        cache = ProvisionedCache(ttl=60)
+        func = mocker.Mock()
+        monotonic = mocker.patch(
+            "utils.provisioning.time.monotonic", return_value=0
+        )
+        cache.provision("test_connector", "key", "1", func)
+        monotonic.return_value = 60
+        cache.provision("test_connector", "key", "1", func)
+        assert func.call_count == 2
+
+    def test_expired_entries_removed(self, mocker):
+        cache = ProvisionedCache(ttl=60)
+        monotonic = mocker.patch(
+            "utils.provisioning.time.monotonic", return_value=0
+        )
+        cache.add("first", "1")
+        cache.add("second", "1")
+        monotonic.return_value = 30
+        cache.add("third", "1")
+        monotonic.return_value = 60
+        cache.add("fourth", "1")
+        assert cache.size == 2
+
+    def test_failure_not_cached(self, mocker):
+        cache = ProvisionedCache(ttl=60)
+        func = mocker.Mock(side_effect=[Exception("Problem"), None])
+        with pytest.raises(Exception):
+            cache.provision("test_connector", "key", "1", func)
+        cache.provision("test_connector", "key", "1", func)
+        assert func.call_count == 2
+
+    def test_concurrent_provisioning_coalesced(self):
+        cache = ProvisionedCache(ttl=0)
+        threads_count = 10
+        barrier = threading.Barrier(threads_count)
+        calls = []
+
+        def func():
+            calls.append(1)
+            threading.Event().wait(0.1)
+
+        def provision():
+            barrier.wait()
+            cache.provision("test_connector", "key", "1", func)
+
+        threads = [
+            threading.Thread(target=provision) for _ in range(threads_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+
+    def test_disabled(self, mocker):
+        func = mocker.Mock()
+        for cache, resource_version in (
+            (ProvisionedCache(ttl=0), "1"),
+            (ProvisionedCache(ttl=60), None),
+        ):
+            cache.provision("test_connector", "key", resource_version, func)
+            cache.provision("test_connector", "key", resource_version, func)
+        assert func.call_count == 4
+
+
+@pytest.mark.unit
+def test_get_owner_object():
+    body = {
+        "metadata": {
+            "namespace": "default",
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "kind": "ReplicaSet",
+                    "name": "app-5d8f",
+                    "uid": "e4d1",
+                }
+            ],
+        }
+    }
+    assert get_owner_object(body) == {
+        "apiVersion": "apps/v1",
+        "kind": "ReplicaSet",
+        "metadata": {
+            "name": "app-5d8f",
+            "uid": "e4d1",
+            "namespace": "default",
+        },
+    }
+    assert get_owner_object({"metadata": {}}) is None
@@ -0,0 +1,83 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from kopf._cogs.structs.references import Resource
+from utils.watching import (
+    core_selectors,
+    is_namespace_watched,
+    watch_selectors,
+    wrapper,
+)
+
+PODS = Resource(group="", version="v1", plural="pods", namespaced=True)
+SERVICES = Resource(group="", version="v1", plural="services", namespaced=True)
+CONNECTORS = Resource(
+    group="itlabs.io", version="v1", plural="postgresconnectors"
+)
+
+
+@pytest.fixture
+def selectors(mocker):
+    mocker.patch(
+        "settings.WATCH_PODS_LABEL_SELECTOR", "connectors.itlabs.io/enabled"
+    )
+    mocker.patch("settings.WATCH_SERVICES_LABEL_SELECTOR", "")
+    mocker.patch(
+        "settings.WATCH_EXCLUDED_NAMESPACES", ["kube-system", " vswh", ""]
+    )
+
+
+def get_url(resource: Resource, **kwargs) -> dict:
+    url = wrapper(resource.get_url, resource, (), kwargs)
+    return parse_qs(urlparse(url).query)
+
+
+@pytest.mark.unit
+class TestWatchSelectors:
+    def test_selectors(self, selectors):
+        assert watch_selectors(PODS) == {
+            "labelSelector": "connectors.itlabs.io/enabled",
+            "fieldSelector": (
+                "metadata.namespace!=kube-system,metadata.namespace!=vswh"
+            ),
+        }
+        assert watch_selectors(SERVICES) == {
+            "fieldSelector": (
+                "metadata.namespace!=kube-system,metadata.namespace!=vswh"
+            ),
+        }
+        assert watch_selectors(CONNECTORS) == {}
+
+    def test_not_selected_by_default(self):
+        assert watch_selectors(PODS) == {}
+
+    def test_watch_url(self, selectors):
+        assert get_url(PODS, params={"watch": "true"}) == {
+            "watch": ["true"],
+            "labelSelector": ["connectors.itlabs.io/enabled"],
+            "fieldSelector": [
+                "metadata.namespace!=kube-system,metadata.namespace!=vswh"
+            ],
+        }
+
+    def test_object_url_not_changed(self, selectors):
+        assert get_url(PODS, namespace="default", name="app") == {}
+
+    def test_core_selectors(self, selectors):
+        assert core_selectors("services") == watch_selectors(SERVICES)
+
+    @pytest.mark.parametrize(
+        "namespace,watched",
+        [
+            ("app-live", True),
+            ("app-test", False),
+            ("other", False),
+            ("vswh", False),
+        ],
+    )
+    def test_namespace_watched(self, mocker, selectors, namespace, watched):
+        mocker.patch("settings.WATCH_NAMESPACES", "app-*,!app-test,vswh")
+        assert is_namespace_watched(namespace) == watched
+
+    def test_all_namespaces_watched_by_default(self):
+        assert is_namespace_watched("default")
@@ -0,0 +1,75 @@
+from typing import Dict
+
+import settings as operator_settings
+import wrapt
+from kopf._cogs.structs import references
+
+
+def watch_selectors(resource: references.Resource) -> Dict[str, str]:
+    """
+    Returns query parameters for list and watch requests of resource, that
+    make apiserver send only selected objects.
+    """
+    if resource.group != "" or resource.version != "v1":
+        return {}
+    label_selector = {
+        "pods": operator_settings.WATCH_PODS_LABEL_SELECTOR,
+        "services": operator_settings.WATCH_SERVICES_LABEL_SELECTOR,
+    }.get(resource.plural)
+    if label_selector is None:
+        return {}
+
+    params = {}
+    if label_selector:
+        params["labelSelector"] = label_selector
+    field_selector = ",".join(
+        f"metadata.namespace!={namespace.strip()}"
+        for namespace in operator_settings.WATCH_EXCLUDED_NAMESPACES
+        if namespace.strip()
+    )
+    if field_selector:
+        params["fieldSelector"] = field_selector
+    return params
+
+
+def core_selectors(plural: str) -> Dict[str, str]:
+    """
+    Returns query parameters of list requests of core resource, made by
+    operator itself, e.g. "services".
+    """
+    return watch_selectors(
+        references.Resource(
+            group="", version="v1", plural=plural, namespaced=True
+        )
+    )
+
+
+def is_namespace_watched(namespace: str) -> bool:
+    """
+    Checks that pods and services of namespace are watched, objects listed
+    by operator itself are filtered by it.
+    """
+    excluded = {
+        excluded.strip()
+        for excluded in operator_settings.WATCH_EXCLUDED_NAMESPACES
+    }
+    if namespace in excluded:
+        return False
+    if not operator_settings.WATCH_NAMESPACES:
+        return True
+    return references.match_namespace(
+        references.NamespaceName(namespace), operator_settings.WATCH_NAMESPACES
+    )
+
+
+def wrapper(wrapped, instance, args, kwargs):
+    # URL without object name is used by kopf only for list and watch.
+    if kwargs.get("name") is None:
+        selectors = watch_selectors(instance)
+        if selectors:
+            kwargs["params"] = {**selectors, **(kwargs.get("params") or {})}
+    return wrapped(*args, **kwargs)
+
+
+def wrap_watching():
+    wrapt.wrap_function_wrapper(references, "Resource.get_url", wrapper)